@@ -0,0 +1,108 @@
+"""Kontrola czasu importu pakietu na podstawie ``python -X importtime``.
+
+Przykłady::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --max-ms 15 --repeat 5
+
+Dla każdego sprawdzanego modułu mierzony jest skumulowany czas importu
+(mediana z ``--repeat`` uruchomień w osobnych procesach) oraz lista
+załadowanych modułów. Skrypt kończy się kodem 1, gdy czas przekroczy
+limit albo gdy moduł pociągnie za sobą zabroniony import (np. tkinter).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Moduł -> importy, których nie może ładować.
+CHECKS: dict[str, tuple[str, ...]] = {
+    "kalkulator": ("tkinter", "kalkulator.ui", "kalkulator.printing", "hashlib", "subprocess"),
+    "kalkulator.calculations": ("tkinter", "typing", "kalkulator.printing", "numpy"),
+    "kalkulator.config": ("tkinter", "hashlib", "hmac", "kalkulator.printing"),
+    "kalkulator.ui": ("kalkulator.printing", "hashlib", "subprocess", "zlib"),
+}
+# Limity dotyczą tylko rdzenia bez GUI; pozostałe moduły są sprawdzane
+# wyłącznie pod kątem zabronionych importów.
+DEFAULT_LIMITS_MS = {
+    "kalkulator": 10.0,
+    "kalkulator.calculations": 15.0,
+}
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Zwraca skumulowany czas importu ``module`` (ms) i nazwy załadowanych modułów."""
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=env,
+        check=True,
+    )
+    total_us = 0
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue
+        loaded.add(name)
+        if name == module:
+            total_us = int(cumulative)
+    return total_us / 1000.0, loaded
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Kontrola czasu importu pakietu kalkulator.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="Wspólny limit czasu importu (domyślnie osobne limity dla modułów).",
+    )
+    parser.add_argument("--output", help="Plik JSON z wynikami ('-' = stdout).")
+    args = parser.parse_args(argv)
+
+    failures = []
+    results = {}
+    for module, forbidden in CHECKS.items():
+        timings = []
+        loaded: set[str] = set()
+        for _ in range(args.repeat):
+            elapsed, loaded = measure(module)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        unwanted = sorted(name for name in forbidden if name in loaded)
+        limit = args.max_ms if args.max_ms is not None else DEFAULT_LIMITS_MS.get(module)
+        results[module] = {"median_ms": median, "limit_ms": limit, "forbidden": unwanted}
+        print(f"{module:<28} {median:>8.2f} ms", file=sys.stderr)
+        if unwanted:
+            failures.append(f"{module} importuje: {', '.join(unwanted)}")
+        if limit is not None and median > limit:
+            failures.append(f"{module}: {median:.2f} ms > {limit:.2f} ms")
+
+    if args.output == "-":
+        print(json.dumps(results, indent=2))
+    elif args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    for failure in failures:
+        print(f"Regresja: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
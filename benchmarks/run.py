@@ -0,0 +1,532 @@
+"""Powtarzalne pomiary wydajności obliczeń, wydruków i konfiguracji.
+
+Przykłady::
+
+    python benchmarks/run.py --output wyniki.json
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+Przy ``--baseline`` skrypt kończy się kodem 1, jeśli mediana (a dla
+pomiarów opóźnień także 95. percentyl) któregoś pomiaru jest gorsza od
+zapisanej o więcej niż ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from kalkulator.calculations import excel_fixed, oblicz_fala_b  # noqa: E402
+from kalkulator.config import DEFAULT_MARGIN_RULES, ConfigManager  # noqa: E402
+from kalkulator.pallets import plan_quantities  # noqa: E402
+from kalkulator.pricing import price_ladder, price_quote  # noqa: E402
+from kalkulator.solver import Constraints, largest_box, max_dimension  # noqa: E402
+from kalkulator.printing import (  # noqa: E402
+    DEFAULT_PDF_COMPRESSION_LEVEL,
+    _SummaryPDFBuilder,
+    build_summary_csv,
+    build_summary_sections,
+    write_quote_book,
+)
+
+SEED = 20241017
+Case = tuple[str, Callable[[], Callable[[], Any]], int]
+# Pomiary opóźnień: pojedyncze wywołania, z których liczony jest 95. percentyl.
+LATENCY_SAMPLES = 1000
+
+
+def quote_inputs(count: int, seed: int = SEED) -> list[tuple[float, ...]]:
+    """Stały korpus wejść ``oblicz_fala_b`` (dl, sz, wys, ..., dystans)."""
+    rng = random.Random(seed)
+    return [
+        (
+            rng.randint(100, 1200) + rng.choice((0.0, 0.5)),
+            float(rng.randint(80, 800)),
+            float(rng.randint(40, 600)),
+            rng.choice((390.0, 450.0, 520.0, 610.0)),
+            round(rng.uniform(1.2, 4.5), 4),
+            rng.choice((0.0, 50.0, 120.0)),
+            round(rng.uniform(2.0, 6.0), 2),
+            float(rng.randint(0, 600)),
+        )
+        for _ in range(count)
+    ]
+
+
+def last_results_fixture() -> Dict[str, Any]:
+    """Stały rekord ``last_results`` taki, jak tworzy go ``CalculatorTab``."""
+    dl, sz, wys, gram, cena, dodatkowe, stawka, dystans = quote_inputs(1)[0]
+    return {
+        "client": {
+            "nazwa": "Rekruso Sp. z o.o.",
+            "adres": "ul. Przykładowa 1, 00-001 Warszawa",
+            "nip": "1234567890",
+            "email": "biuro@example.com",
+        },
+        "inputs": {
+            "fala": "FALA B",
+            "dl": dl,
+            "sz": sz,
+            "wys": wys,
+            "gramatura": gram,
+            "cena_m2": cena,
+            "dodatkowe_koszty": dodatkowe,
+            "stawka_transport": stawka,
+            "dystans": dystans,
+            "powrot": True,
+        },
+        "wyniki": oblicz_fala_b(dl, sz, wys, gram, cena, dodatkowe, stawka, dystans, True),
+        "margin_rules": [
+            {"max_quantity": 300, "margin_percent": 100.0},
+            {"max_quantity": 500, "margin_percent": 70.0},
+            {"max_quantity": 1000, "margin_percent": 25.0},
+        ],
+    }
+
+
+def _pdf_builder(
+    pages: int,
+    compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+    object_streams: bool = False,
+) -> _SummaryPDFBuilder:
+    sections = build_summary_sections(last_results_fixture())
+    pdf = _SummaryPDFBuilder(compression_level=compression_level, object_streams=object_streams)
+    pdf.add_title("Kalkulator Rekruso — podsumowanie")
+    while len(pdf.pages) <= pages:
+        for section_name, rows in sections:
+            pdf.add_section(section_name, rows)
+            if len(pdf.pages) > pages:
+                break
+    # Ostatnia strona jest niepełna – odrzucamy ją, by liczba stron była stała.
+    pdf.pages = pdf.pages[:pages]
+    return pdf
+
+
+class _NullSink:
+    """Plik binarny odrzucający dane – mierzy samo generowanie PDF."""
+
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+
+def _config_env() -> Iterator[Path]:
+    with tempfile.TemporaryDirectory() as directory:
+        previous = os.environ.get("LOCALAPPDATA")
+        os.environ["LOCALAPPDATA"] = directory
+        try:
+            manager = ConfigManager()
+            manager.set_password("benchmark")
+            manager.flush()
+            yield Path(directory)
+        finally:
+            if previous is None:
+                os.environ.pop("LOCALAPPDATA", None)
+            else:
+                os.environ["LOCALAPPDATA"] = previous
+
+
+_JOURNALS: Dict[int, Any] = {}
+
+
+def _populated_journal(rows: int) -> Any:
+    """Dziennik z ``rows`` deterministycznymi wycenami (tworzony raz na przebieg).
+
+    Plik powstaje w tymczasowym ``LOCALAPPDATA`` z :func:`_config_env`.
+    """
+    from kalkulator.journal import QuoteJournal
+
+    if rows not in _JOURNALS:
+        rng = random.Random(SEED)
+        record = last_results_fixture()
+        journal = QuoteJournal(
+            Path(os.environ["LOCALAPPDATA"]) / f"journal_{rows}.sqlite3"
+        )
+        for index in range(rows):
+            nip = "5260250274" if index % 1000 == 0 else str(rng.randrange(10**9, 10**10))
+            journal.record(
+                {
+                    **record,
+                    "client": {"nazwa": f"Firma {index % 5000}", "nip": nip},
+                    "inputs": {
+                        **record["inputs"],
+                        "dl": float(rng.randrange(100, 800)),
+                        "sz": float(rng.randrange(100, 600)),
+                        "wys": float(rng.randrange(50, 400)),
+                    },
+                }
+            )
+        journal.flush()
+        _JOURNALS[rows] = journal
+    return _JOURNALS[rows]
+
+
+def build_cases(quick: bool) -> list[Case]:
+    """Zwraca listę (nazwa, fabryka funkcji, liczba wywołań w serii).
+
+    Liczba wywołań 0 oznacza pomiar opóźnień: ``LATENCY_SAMPLES`` pojedynczych
+    wywołań z medianą i 95. percentylem.
+    """
+
+    journal_rows = 20_000 if quick else 200_000
+
+    def single_quote() -> Callable[[], Any]:
+        args = quote_inputs(1)[0]
+        return lambda: oblicz_fala_b(*args)
+
+    def fixed() -> Callable[[], Any]:
+        values = [row[0] * row[1] / 1_000_000.0 for row in quote_inputs(1000)]
+        return lambda: [excel_fixed(value, 3) for value in values]
+
+    def scalar_loop(count: int) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            rows = quote_inputs(count)
+            return lambda: [oblicz_fala_b(*row) for row in rows]
+
+        return factory
+
+    def batch(count: int) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            from kalkulator.batch import oblicz_fala_b_batch
+
+            columns = list(zip(*quote_inputs(count)))
+            return lambda: oblicz_fala_b_batch(*columns)
+
+        return factory
+
+    def sections() -> Callable[[], Any]:
+        record = last_results_fixture()
+        return lambda: build_summary_sections(record)
+
+    def csv_summary() -> Callable[[], Any]:
+        record = last_results_fixture()
+        return lambda: build_summary_csv(record)
+
+    def pdf(
+        pages: int, level: int = DEFAULT_PDF_COMPRESSION_LEVEL, objstm: bool = False
+    ) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            builder = _pdf_builder(pages, level, objstm)
+            return builder.render
+
+        return factory
+
+    def quote_book(count: int) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            records = [last_results_fixture()] * count
+            return lambda: write_quote_book(records, _NullSink())
+
+        return factory
+
+    def quote_price() -> Callable[[], Any]:
+        wyniki = oblicz_fala_b(*quote_inputs(1)[0])
+        quantities = list(range(100, 10_100, 10))
+        return lambda: [price_quote(wyniki, q, DEFAULT_MARGIN_RULES) for q in quantities]
+
+    def ladder() -> Callable[[], Any]:
+        wyniki = oblicz_fala_b(*quote_inputs(1)[0])
+        quantities = list(range(100, 10_100, 10))
+        return lambda: price_ladder(wyniki, quantities, DEFAULT_MARGIN_RULES)
+
+    def journal_record(count: int) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            from kalkulator.journal import QuoteJournal
+
+            record = last_results_fixture()
+            journal = QuoteJournal(Path(os.environ["LOCALAPPDATA"]) / "record.sqlite3")
+
+            def run() -> None:
+                for _ in range(count):
+                    journal.record(record)
+                journal.flush()
+
+            return run
+
+        return factory
+
+    def journal_search(rows: int, **criteria: Any) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            journal = _populated_journal(rows)
+            return lambda: journal.search(**criteria, limit=50)
+
+        return factory
+
+    def similar_points(count: int) -> tuple[Any, Any, Any]:
+        import numpy as np
+
+        rng = np.random.default_rng(SEED)
+        dims = np.column_stack(
+            [
+                rng.integers(100, 800, count),
+                rng.integers(100, 600, count),
+                rng.integers(50, 400, count),
+            ]
+        ).astype(np.float64)
+        return np.arange(1, count + 1), rng.integers(0, 8, count), dims
+
+    def similar_build(count: int) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            from kalkulator.similar import SimilarBoxIndex
+
+            points = similar_points(count)
+            return lambda: SimilarBoxIndex(*points)
+
+        return factory
+
+    def similar_latency(count: int, wave: str | None) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            import itertools
+
+            import numpy as np
+
+            from kalkulator.similar import SimilarBoxIndex
+
+            index = SimilarBoxIndex(*similar_points(count))
+            rng = np.random.default_rng(SEED + 1)
+            points = np.column_stack(
+                [rng.uniform(50, 900, 500), rng.uniform(50, 700, 500), rng.uniform(20, 450, 500)]
+            ).tolist()
+            queries = itertools.cycle(points)
+            return lambda: index.query(*next(queries), wave=wave, k=10)
+
+        return factory
+
+    def similar_query(count: int) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            from kalkulator.similar import SimilarBoxIndex
+
+            index = SimilarBoxIndex(*similar_points(count))
+            return lambda: index.query(402.0, 298.0, 150.0, wave="FALA B", k=10)
+
+        return factory
+
+    solver_constraints = Constraints(
+        max_zuzycie_m2=0.6, max_pallet_length=1200.0, max_pallet_width=500.0
+    )
+
+    def solver_dimension() -> Callable[[], Any]:
+        return lambda: max_dimension("FALA B", "sz", solver_constraints, dl=400.0, wys=150.0)
+
+    def solver_box() -> Callable[[], Any]:
+        return lambda: largest_box("FALA B", solver_constraints)
+
+    def pallet_ladder() -> Callable[[], Any]:
+        wyniki = oblicz_fala_b(400.0, 300.0, 150.0, 450.0, 2.4, 100.0, 3.0, 200.0)
+        return lambda: plan_quantities(wyniki, (100, 1000, 10_000, 100_000), "FALA B")
+
+    def pallet_batch(count: int) -> Callable[[], Callable[[], Any]]:
+        def factory() -> Callable[[], Any]:
+            import numpy as np
+
+            from kalkulator.pallets import plan_pallets_batch
+            from kalkulator.parallel import oblicz_fale_parallel, sample_columns
+
+            columns = sample_columns(count, seed=SEED)
+            results = oblicz_fale_parallel(columns, workers=1)
+            quantity = np.random.default_rng(SEED).integers(100, 200_000, count)
+            return lambda: plan_pallets_batch(
+                columns["fala"],
+                results["paletyzacja.dlugosc"],
+                results["paletyzacja.szerokosc"],
+                results["waga_kg_na_szt"],
+                quantity,
+                results["transport.koszt_calkowity"],
+            )
+
+        return factory
+
+    def config_cold() -> Callable[[], Any]:
+        return ConfigManager
+
+    def config_warm() -> Callable[[], Any]:
+        return ConfigManager().load
+
+    def config_save() -> Callable[[], Any]:
+        manager = ConfigManager(save_delay=0)
+        return manager.save
+
+    def config_save_burst() -> Callable[[], Any]:
+        manager = ConfigManager()
+
+        def run() -> None:
+            for _ in range(50):
+                manager.save()
+            manager.flush()
+
+        return run
+
+    cases: list[Case] = [
+        ("oblicz_fala_b/single", single_quote, 2000),
+        ("excel_fixed/1k", fixed, 20),
+        ("oblicz_fala_b/loop_10k", scalar_loop(10_000), 1),
+        ("summary/sections", sections, 500),
+        ("summary/csv", csv_summary, 500),
+        ("pdf/render_1_page", pdf(1), 200),
+        ("pdf/render_500_pages", pdf(500), 1),
+        ("pdf/render_500_pages_uncompressed", pdf(500, 0), 1),
+        ("pdf/render_500_pages_objstm", pdf(500, DEFAULT_PDF_COMPRESSION_LEVEL, True), 1),
+        ("pdf/quote_book_1000", quote_book(1000), 1),
+        ("pricing/quote_1k", quote_price, 20),
+        ("solver/max_dimension", solver_dimension, 2000),
+        ("pallets/plan_ladder", pallet_ladder, 2000),
+        ("journal/record_10k", journal_record(10_000), 1),
+        ("journal/search_nip", journal_search(journal_rows, nip="5260250274"), 50),
+        ("journal/search_company", journal_search(journal_rows, company="firma 12"), 50),
+        (
+            "journal/search_dims",
+            journal_search(journal_rows, dl=400, sz=300, wys=150, tolerance=5),
+            50,
+        ),
+        ("config/load_cold", config_cold, 50),
+        ("config/load_warm", config_warm, 200),
+        ("config/save", config_save, 50),
+        ("config/save_burst_50", config_save_burst, 20),
+    ]
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        cases.append(("batch/10k", batch(10_000), 5))
+        cases.append(("pricing/ladder_1k", ladder, 200))
+        cases.append(("solver/largest_box", solver_box, 50))
+        cases.append(("pallets/batch_100k", pallet_batch(100_000), 20))
+        cases.append(("similar/build_500k", similar_build(500_000), 1))
+        cases.append(("similar/query_500k", similar_query(500_000), 200))
+        # Zapytania w losowych punktach – 1 wywołanie na próbkę (patrz LATENCY_SAMPLES).
+        cases.append(("similar/latency_500k_wave", similar_latency(500_000, "FALA B"), 0))
+        cases.append(("similar/latency_500k_all_waves", similar_latency(500_000, None), 0))
+        if not quick:
+            cases.append(("batch/1M", batch(1_000_000), 1))
+    return cases
+
+
+def pdf_sizes(pages: int = 500) -> Dict[str, int]:
+    """Rozmiary (w bajtach) dokumentu o ``pages`` stronach dla różnych ustawień."""
+    sizes = {}
+    for level in (0, 1, DEFAULT_PDF_COMPRESSION_LEVEL, 9):
+        for object_streams in (False, True):
+            name = f"pdf/{pages}_pages_level{level}" + ("_objstm" if object_streams else "")
+            sizes[name] = len(_pdf_builder(pages, level, object_streams).render())
+    return sizes
+
+
+def run_case(factory: Callable[[], Callable[[], Any]], number: int, repeat: int) -> Dict[str, float]:
+    func = factory()
+    func()  # rozgrzewka
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "p95": statistics.quantiles(timings, n=20)[-1] if repeat > 1 else timings[0],
+        "max": max(timings),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> list[str]:
+    """Zwraca opisy pomiarów gorszych od wzorca o więcej niż ``tolerance``."""
+    regressions = []
+    for name, size in results.get("sizes", {}).items():
+        reference_size = baseline.get("sizes", {}).get(name)
+        if reference_size and size > reference_size * (1.0 + tolerance):
+            regressions.append(f"{name}: {size} B > {reference_size} B (+{tolerance:.0%})")
+    for name, current in results["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference:
+            continue
+        # 95. percentyl porównywany jest tylko dla pomiarów opóźnień.
+        stats = ("median", "p95") if current.get("number") == 1 else ("median",)
+        for stat in stats:
+            if stat not in reference:
+                continue
+            limit = reference[stat] * (1.0 + tolerance)
+            if current[stat] > limit:
+                regressions.append(
+                    f"{name} ({stat}): {current[stat] * 1e3:.3f} ms > "
+                    f"{reference[stat] * 1e3:.3f} ms (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarki Kalkulatora Rekruso.")
+    parser.add_argument("--output", help="Plik JSON z wynikami ('-' = stdout).")
+    parser.add_argument("--baseline", help="Plik wzorcowy do porównania.")
+    parser.add_argument("--save-baseline", help="Zapisz wyniki jako nowy wzorzec.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Pomiń największe korpusy.")
+    parser.add_argument("--only", help="Uruchom tylko pomiary zawierające ten tekst.")
+    args = parser.parse_args(argv)
+
+    config_env = _config_env()
+    next(config_env)
+    try:
+        results: Dict[str, Any] = {}
+        for name, factory, number in build_cases(args.quick):
+            if args.only and args.only not in name:
+                continue
+            if number:
+                results[name] = run_case(factory, number, args.repeat)
+                print(f"{name:<36} {results[name]['median'] * 1e3:>12.4f} ms", file=sys.stderr)
+            else:
+                results[name] = run_case(factory, 1, LATENCY_SAMPLES)
+                print(
+                    f"{name:<36} {results[name]['median'] * 1e3:>12.4f} ms"
+                    f"  (p95 {results[name]['p95'] * 1e3:.4f} ms)",
+                    file=sys.stderr,
+                )
+    finally:
+        config_env.close()
+    sizes = pdf_sizes() if not args.only or "pdf" in args.only else {}
+    for name, size in sizes.items():
+        print(f"{name:<36} {size:>12} B", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+        },
+        "results": results,
+        "sizes": sizes,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    elif args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"Regresja: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,23 @@
-"""Pakiet logiki aplikacji Kalkulator Rekruso."""
+"""Pakiet logiki aplikacji Kalkulator Rekruso.
+
+Interfejs graficzny (``FalaBApp``, ``main``) jest importowany dopiero przy
+pierwszym użyciu, więc ``import kalkulator`` i moduł obliczeń nie ładują
+tkintera ani modułów wydruku.
+"""
+
+from __future__ import annotations
+
+from .startup import startup_timer  # noqa: F401 – punkt startowy pomiaru czasu
+
+_LAZY_UI = ("FalaBApp", "main")
+
+
+def __getattr__(name: str) -> object:
+    if name in _LAZY_UI:
+        from . import ui
+
+        return getattr(ui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .ui import FalaBApp, main
 
 __all__ = ["FalaBApp", "main"]
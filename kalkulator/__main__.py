@@ -0,0 +1,10 @@
+"""Punkt wejścia ``python -m kalkulator``."""
+
+from __future__ import annotations
+
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Wsadowe (wektorowe) obliczenia dla fali B na tablicach NumPy."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import numpy as np
+
+from .calculations import (
+    WAVE_KERNELS,
+    WAVE_NAMES,
+    WaveKernel,
+    _EXACT_LIMIT,
+    _TIE_TOLERANCE,
+    _excel_fixed_exact,
+    get_wave_kernel,
+)
+
+ArrayLike = Any
+
+
+def excel_fixed_array(
+    values: ArrayLike, digits: int, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Wektorowa wersja :func:`excel_fixed` dająca identyczne wyniki.
+
+    Zaokrąglenie liczone jest arytmetyką float64 bez tworzenia obiektów
+    ``Decimal``; elementy leżące zbyt blisko połówki (gdzie błąd reprezentacji
+    mógłby zmienić decyzję) są przeliczane dokładną ścieżką skalarną. Parametr
+    ``out`` pozwala zapisać wynik do istniejącej tablicy float64.
+    """
+
+    if digits < 0:
+        raise ValueError("Liczba miejsc po przecinku nie może być ujemna.")
+    array = np.asarray(values, dtype=np.float64)
+    if out is None:
+        out = np.empty_like(array)
+    scale = 10.0**digits
+
+    # out = część ułamkowa, whole = część całkowita przeskalowanej wartości.
+    with np.errstate(over="ignore", invalid="ignore"):
+        np.abs(array, out=out)
+        out *= scale
+        whole = np.floor(out)
+        out -= whole
+        ambiguous = np.abs(out - 0.5) <= (whole + 1.0) * _TIE_TOLERANCE
+        ambiguous |= ~(whole < _EXACT_LIMIT)
+        whole += out > 0.5
+    np.divide(whole, scale, out=out)
+    np.copysign(out, array, out=out)
+
+    if digits > 22 or ambiguous.any():
+        flat = out.reshape(-1)
+        source = array.reshape(-1)
+        indices = range(flat.size) if digits > 22 else np.flatnonzero(ambiguous)
+        for index in indices:
+            flat[index] = _excel_fixed_exact(float(source[index]), digits)
+    return out
+
+
+# Macierz współczynników: wiersz = indeks fali w ``WAVE_NAMES``.
+_KERNEL_MATRIX = np.array([WAVE_KERNELS[name] for name in WAVE_NAMES], dtype=np.float64)
+_WAVE_CODES = {name: code for code, name in enumerate(WAVE_NAMES)}
+
+
+def wave_codes(fala: ArrayLike) -> np.ndarray:
+    """Zamienia nazwy fal (lub gotowe kody) na indeksy w ``WAVE_NAMES``."""
+    array = np.asarray(fala)
+    if array.dtype.kind in "iuf":
+        codes = array.astype(np.intp)
+        if codes.size and (codes.min() < 0 or codes.max() >= len(WAVE_NAMES)):
+            raise ValueError("Nieznany kod rodzaju fali.")
+        return codes
+    names, inverse = np.unique(array, return_inverse=True)
+    try:
+        lookup = np.array([_WAVE_CODES[str(name)] for name in names], dtype=np.intp)
+    except KeyError as exc:
+        raise ValueError(f"Nieznany rodzaj fali: {exc.args[0]}") from None
+    return lookup[inverse].reshape(array.shape)
+
+
+def _kernel_columns(fala: ArrayLike) -> WaveKernel:
+    """Zwraca współczynniki jako skalary (jedna fala) lub kolumny (mieszany wsad)."""
+    if isinstance(fala, str):
+        return get_wave_kernel(fala)
+    return WaveKernel(*_KERNEL_MATRIX[wave_codes(fala)].T)
+
+
+def oblicz_fale_batch(
+    fala: ArrayLike,
+    dl: ArrayLike,
+    sz: ArrayLike,
+    wys: ArrayLike,
+    gramatura: ArrayLike,
+    cena_m2: ArrayLike,
+    dodatkowe_koszty: ArrayLike,
+    stawka_transport_km: ArrayLike,
+    dystans_km: ArrayLike,
+    transport_powrot: ArrayLike = True,
+) -> Dict[str, Any]:
+    """Wektorowy odpowiednik :func:`oblicz_fale` dla kolumn danych.
+
+    ``fala`` to nazwa jednej fali albo kolumna nazw (lub kodów) – wtedy każdy
+    wiersz korzysta ze współczynników swojej fali w tej samej ścieżce obliczeń.
+    Argumenty liczbowe mogą być tablicami lub skalarami (są rozgłaszane do
+    wspólnego kształtu). Zwracany słownik ma tę samą strukturę co wynik
+    :func:`oblicz_fale`, ale w liściach znajdują się tablice NumPy.
+    """
+
+    k = _kernel_columns(fala)
+    (
+        dl,
+        sz,
+        wys,
+        gramatura,
+        cena_m2,
+        dodatkowe_koszty,
+        stawka_transport_km,
+        dystans_km,
+        _,
+    ) = np.broadcast_arrays(
+        *(
+            np.asarray(value, dtype=np.float64)
+            for value in (
+                dl,
+                sz,
+                wys,
+                gramatura,
+                cena_m2,
+                dodatkowe_koszty,
+                stawka_transport_km,
+                dystans_km,
+                k.zakladka,
+            )
+        )
+    )
+    shape = dl.shape
+    powrot = np.broadcast_to(np.asarray(transport_powrot, dtype=bool), shape)
+
+    # --- BIGI I BIGOWE (wiersze 8–9) ---
+    c8 = ((sz / 2.0) + k.bigi_naddatek) * k.bigi_mnoznik
+    d8 = wys + k.wys_naddatek
+    e8 = c8 * k.druga_klapa
+    f8 = sz + k.bigowe_sz_naddatek
+    g8 = dl + k.bigowe_dl_naddatek
+    h8 = sz + k.bigowe_sz2_naddatek
+    i8 = dl + k.bigowe_dl2_naddatek
+    j8 = np.broadcast_to(k.zakladka, shape) + 0.0
+
+    c9 = c8
+    d9 = c8 + d8
+    e9 = c8 + d8 + e8
+    f9 = f8
+    g9 = f8 + g8
+    h9 = f8 + g8 + h8
+    i9 = f8 + g8 + h8 + i8
+    j9 = f8 + g8 + h8 + i8 + j8
+
+    # --- FORMATKA I WYMIAR ZEWNĘTRZNY ---
+    formatka_c11 = (
+        ((dl + sz) * 2.0) + k.formatka_zakladka + k.formatka_naddatek
+    ) - k.formatka_odjecie
+    wymiar_zewnetrzny_e11 = c8 + d8 + e8
+
+    # --- ZUŻYCIE M2 ORAZ WAGA ---
+    zuzycie_m2 = excel_fixed_array((formatka_c11 * wymiar_zewnetrzny_e11) / 1_000_000.0, 3)
+    waga_kg = np.where(gramatura != 0.0, (gramatura * zuzycie_m2) / 1000.0, 0.0)
+
+    # --- PODSTAWOWE KOSZTY ---
+    koszt_mat_na_szt = zuzycie_m2 * cena_m2
+
+    # --- MINIMUM PRODUKCYJNE I WERYFIKACJA ---
+    with np.errstate(divide="ignore", invalid="ignore"):
+        min_aq = np.where(formatka_c11 != 0.0, 500.0 / formatka_c11 * 1000.0, 0.0)
+        min_con = np.where(zuzycie_m2 != 0.0, 300.0 / zuzycie_m2, 0.0)
+        min_pg = np.where(zuzycie_m2 != 0.0, 500.0 / zuzycie_m2, 0.0)
+
+    weryfikacja_dl = i8 + k.weryfikacja_dl
+    weryfikacja_sz = h8 + k.weryfikacja_sz
+    weryfikacja_wys = d8 + k.weryfikacja_wys
+
+    paletyzacja_dlugosc = f8 + g8
+    paletyzacja_szerokosc = wymiar_zewnetrzny_e11
+
+    # --- TRANSPORT ---
+    stawka_pelna = stawka_transport_km * np.where(powrot, 2.0, 1.0)
+    koszt_transport_calk = stawka_pelna * np.where(dystans_km < 0.0, 0.0, dystans_km)
+
+    return {
+        "bigi": {"c8": c8, "d8": d8, "e8": e8},
+        "bigowe": {"f8": f8, "g8": g8, "h8": h8, "i8": i8, "j8": j8},
+        "sumy_bigowe": {"c9": c9, "d9": d9, "e9": e9, "f9": f9, "g9": g9, "h9": h9, "i9": i9, "j9": j9},
+        "formatka_mm": formatka_c11,
+        "wymiar_zewnetrzny_mm": wymiar_zewnetrzny_e11,
+        "zuzycie_m2_na_szt": zuzycie_m2,
+        "waga_kg_na_szt": waga_kg,
+        "koszt_mat_na_szt": koszt_mat_na_szt,
+        "koszty_dodatkowe": dodatkowe_koszty,
+        "minimum_produkcji": {"aq": min_aq, "con": min_con, "pg": min_pg},
+        "weryfikacja_zewnetrzna": {"dl": weryfikacja_dl, "sz": weryfikacja_sz, "wys": weryfikacja_wys},
+        "paletyzacja": {"dlugosc": paletyzacja_dlugosc, "szerokosc": paletyzacja_szerokosc},
+        "transport": {
+            "stawka_pelna": stawka_pelna,
+            "koszt_calkowity": koszt_transport_calk,
+            "dystans": dystans_km,
+            "powrot": powrot,
+        },
+    }
+
+
+def oblicz_fala_b_batch(
+    dl: ArrayLike,
+    sz: ArrayLike,
+    wys: ArrayLike,
+    gramatura: ArrayLike,
+    cena_m2: ArrayLike,
+    dodatkowe_koszty: ArrayLike,
+    stawka_transport_km: ArrayLike,
+    dystans_km: ArrayLike,
+    transport_powrot: ArrayLike = True,
+) -> Dict[str, Any]:
+    """Wektorowy odpowiednik :func:`oblicz_fala_b` dla kolumn danych."""
+
+    return oblicz_fale_batch(
+        "FALA B",
+        dl,
+        sz,
+        wys,
+        gramatura,
+        cena_m2,
+        dodatkowe_koszty,
+        stawka_transport_km,
+        dystans_km,
+        transport_powrot,
+    )
+
+
+def batch_row(wyniki: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Wyciąga pojedynczy wiersz z wyniku wsadowego w formacie ``oblicz_fala_b``."""
+
+    def take(node: Any) -> Any:
+        if isinstance(node, dict):
+            return {key: take(value) for key, value in node.items()}
+        return node[index].item()
+
+    return take(wyniki)
+
+
+__all__ = [
+    "batch_row",
+    "excel_fixed_array",
+    "oblicz_fala_b_batch",
+    "oblicz_fale_batch",
+    "wave_codes",
+]
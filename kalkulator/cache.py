@@ -0,0 +1,116 @@
+"""Pamięć podręczna wyników dla powtarzanych wycen tych samych kartonów."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+from .calculations import oblicz_geometrie, uzupelnij_koszty
+
+DEFAULT_MAXSIZE = 1024
+
+
+class QuoteCache:
+    """Ograniczona pamięć LRU/TTL dla geometrii kartonów.
+
+    Kluczem jest ``(fala, dl, sz, wys)``; w pamięci trzymana jest tylko część
+    wyniku zależna od wymiarów (bigi, bigowe, formatka, zużycie m²). Cena
+    surowca, koszty dodatkowe i transport są doliczane przy każdym wywołaniu,
+    więc zmiana ``cena_m2`` lub ``dystans_km`` korzysta z zapisanej geometrii.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("Rozmiar pamięci podręcznej musi być dodatni.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def geometria(self, fala: str, dl: float, sz: float, wys: float) -> Dict[str, Any]:
+        """Zwraca (z pamięci lub świeżo policzoną) geometrię kartonu.
+
+        Zwrócony słownik jest współdzielony z pamięcią – nie należy go
+        modyfikować; :func:`uzupelnij_koszty` tworzy z niego kopię.
+        """
+
+        key = (fala, float(dl), float(sz), float(wys))
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, geometria = entry
+                if self.ttl is None or now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return geometria
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        geometria = oblicz_geometrie(fala, dl, sz, wys)
+        with self._lock:
+            self._entries[key] = (now, geometria)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return geometria
+
+    def oblicz(
+        self,
+        fala: str,
+        dl: float,
+        sz: float,
+        wys: float,
+        gramatura: float,
+        cena_m2: float,
+        dodatkowe_koszty: float,
+        stawka_transport_km: float,
+        dystans_km: float,
+        transport_powrot: bool = True,
+    ) -> Dict[str, Any]:
+        """Odpowiednik :func:`oblicz_fale` korzystający z pamięci geometrii."""
+
+        return uzupelnij_koszty(
+            self.geometria(fala, dl, sz, wys),
+            gramatura,
+            cena_m2,
+            dodatkowe_koszty,
+            stawka_transport_km,
+            dystans_km,
+            transport_powrot,
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["DEFAULT_MAXSIZE", "QuoteCache"]
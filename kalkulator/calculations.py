@@ -2,40 +2,136 @@
 
 from __future__ import annotations
 
-from decimal import ROUND_HALF_UP, Decimal
-from typing import Any, Dict
+import math
+from collections import namedtuple
+from collections.abc import Iterator
+
+# Moduł nie importuje ``typing`` (kosztowny import przy starcie). Adnotacje nie
+# są wyliczane (``from __future__ import annotations``), więc ``Any`` występuje
+# w nich wyłącznie jako nazwa w napisie dla narzędzi sprawdzających typy.
+
+# Potęgi dziesięciu dokładnie reprezentowalne w float64 (10**22 to ostatnia).
+_POW10 = tuple(10.0**exponent for exponent in range(23))
+# Od 2**52 wartość przeskalowana nie ma już bitów części ułamkowej.
+_EXACT_LIMIT = 2.0**52
+# Względny margines na błąd reprezentacji wartości i mnożenia przez 10**digits.
+_TIE_TOLERANCE = 2.0**-50
 
 
 def excel_fixed(value: float, digits: int) -> float:
-    """Replikacja działania funkcji FIXED z Excela."""
+    """Replikacja działania funkcji FIXED z Excela.
+
+    Wynik jest identyczny z ``float(Decimal(str(value)).quantize(...,
+    ROUND_HALF_UP))``, ale w typowym przypadku liczony jest arytmetyką
+    zmiennoprzecinkową. Tylko wartości leżące tuż przy połówce trafiają do
+    dokładnej ścieżki opartej na zapisie dziesiętnym ``repr(value)``.
+    Skalary NumPy są najpierw zamieniane na ``float``.
+    """
+    value = float(value)
     if digits < 0:
         raise ValueError("Liczba miejsc po przecinku nie może być ujemna.")
-    quant = Decimal("1").scaleb(-digits)
-    return float(Decimal(str(value)).quantize(quant, rounding=ROUND_HALF_UP))
+    if digits < len(_POW10):
+        scale = _POW10[digits]
+        scaled = abs(value) * scale
+        if scaled < _EXACT_LIMIT:
+            fraction = scaled % 1.0
+            if abs(fraction - 0.5) > scaled * _TIE_TOLERANCE:
+                whole = scaled - fraction
+                if fraction > 0.5:
+                    whole += 1.0
+                return math.copysign(whole / scale, value)
+    return _excel_fixed_exact(value, digits)
 
 
-def oblicz_fala_b(
-    dl: float,
-    sz: float,
-    wys: float,
-    gramatura: float,
-    cena_m2: float,
-    dodatkowe_koszty: float,
-    stawka_transport_km: float,
-    dystans_km: float,
-    transport_powrot: bool = True,
-) -> Dict[str, Any]:
-    """Przelicza wszystkie zależności z arkusza "FALA B"."""
+def _excel_fixed_exact(value: float, digits: int) -> float:
+    """Zaokrągla ROUND_HALF_UP na cyfrach najkrótszego zapisu ``repr(value)``."""
+    # repr(np.float64) to "np.float64(...)" – potrzebny jest zapis zwykłego float.
+    value = float(value)
+    if math.isnan(value):
+        return value
+    if math.isinf(value):
+        raise ValueError("Nie można zaokrąglić wartości nieskończonej.")
+
+    mantissa, _, exponent = repr(abs(value)).partition("e")
+    int_part, _, frac_part = mantissa.partition(".")
+    digits_text = int_part + frac_part
+    keep = len(int_part) + int(exponent or 0) + digits
+    if keep >= len(digits_text):
+        return value
+    rounded = int(digits_text[:keep]) if keep > 0 else 0
+    if keep >= 0 and digits_text[keep] >= "5":
+        rounded += 1
+    return math.copysign(rounded / 10**digits, value)
+
+
+class WaveKernel(
+    namedtuple(
+        "WaveKernel",
+        (
+            "bigi_naddatek",
+            "bigi_mnoznik",
+            "wys_naddatek",
+            "druga_klapa",
+            "bigowe_sz_naddatek",
+            "bigowe_dl_naddatek",
+            "bigowe_sz2_naddatek",
+            "bigowe_dl2_naddatek",
+            "zakladka",
+            "formatka_zakladka",
+            "formatka_naddatek",
+            "formatka_odjecie",
+            "weryfikacja_dl",
+            "weryfikacja_sz",
+            "weryfikacja_wys",
+        ),
+    )
+):
+    """Współczynniki arkusza danej fali (naddatki w mm z wierszy 8, 11 i 12).
+
+    Zwykła ``collections.namedtuple`` zamiast ``typing.NamedTuple``, żeby
+    import modułu obliczeń nie ładował ``typing``.
+    """
+
+    __slots__ = ()
+
+
+# Współczynniki przepisane z arkuszy "Kalkulator v5.2024-10_FALA B,C,BC,EB".
+# Arkusze F200 mają pustą komórkę E8 (druga klapa = 0). Arkusz "F200 B+ EB"
+# nie ma wiersza wymiaru zewnętrznego, więc przyjęto naddatki fali B.
+WAVE_KERNELS: dict[str, WaveKernel] = {
+    "FALA B": WaveKernel(2.0, 1.0, 10.0, 1.0, 1.0, 3.0, 3.0, 3.0, 35.0, 35.0, 12.0, 2.0, 3.0, 3.0, 2.0),
+    "FALA E": WaveKernel(2.0, 1.0, 4.0, 1.0, 0.0, 2.0, 2.0, 2.0, 35.0, 35.0, 12.0, 6.0, 2.0, 2.0, 4.0),
+    "FALA C+EB": WaveKernel(2.0, 1.0, 10.0, 1.0, 1.0, 3.0, 3.0, 3.0, 35.0, 35.0, 12.0, 2.0, 5.0, 5.0, 6.0),
+    "FALA EB+B 203": WaveKernel(2.0, 2.0, 10.0, 1.0, 1.0, 3.0, 3.0, 3.0, 35.0, 35.0, 12.0, 2.0, 3.0, 3.0, 2.0),
+    "FALA BC": WaveKernel(4.0, 1.0, 15.0, 1.0, 3.0, 5.0, 5.0, 5.0, 40.0, 40.0, 20.0, 2.0, 8.0, 5.0, 6.0),
+    "F203 FALA BC": WaveKernel(4.0, 2.0, 15.0, 1.0, 3.0, 5.0, 5.0, 5.0, 40.0, 40.0, 20.0, 2.0, 8.0, 5.0, 6.0),
+    "F200 B+ EB": WaveKernel(2.0, 1.0, 5.0, 0.0, 1.0, 3.0, 3.0, 3.0, 35.0, 35.0, 12.0, 2.0, 3.0, 3.0, 2.0),
+    "F200 BC": WaveKernel(4.0, 1.0, 7.0, 0.0, 3.0, 5.0, 5.0, 5.0, 40.0, 40.0, 20.0, 2.0, 5.0, 4.0, 0.0),
+}
+WAVE_NAMES: tuple[str, ...] = tuple(WAVE_KERNELS)
+
+
+def get_wave_kernel(fala: str) -> WaveKernel:
+    try:
+        return WAVE_KERNELS[fala]
+    except KeyError:
+        raise ValueError(f"Nieznany rodzaj fali: {fala}") from None
+
+
+def oblicz_geometrie(fala: str, dl: float, sz: float, wys: float) -> dict[str, Any]:
+    """Liczy część wyniku zależną wyłącznie od fali i wymiarów kartonu."""
+
+    k = get_wave_kernel(fala)
 
     # --- BIGI I BIGOWE (wiersze 8–9) ---
-    c8 = (sz / 2.0) + 2.0
-    d8 = wys + 10.0
-    e8 = (sz / 2.0) + 2.0
-    f8 = sz + 1.0
-    g8 = dl + 3.0
-    h8 = sz + 3.0
-    i8 = dl + 3.0
-    j8 = 35.0
+    c8 = ((sz / 2.0) + k.bigi_naddatek) * k.bigi_mnoznik
+    d8 = wys + k.wys_naddatek
+    e8 = c8 * k.druga_klapa
+    f8 = sz + k.bigowe_sz_naddatek
+    g8 = dl + k.bigowe_dl_naddatek
+    h8 = sz + k.bigowe_sz2_naddatek
+    i8 = dl + k.bigowe_dl2_naddatek
+    j8 = k.zakladka
 
     c9 = c8
     d9 = c8 + d8
@@ -47,32 +143,26 @@ def oblicz_fala_b(
     j9 = f8 + g8 + h8 + i8 + j8
 
     # --- FORMATKA I WYMIAR ZEWNĘTRZNY ---
-    formatka_c11 = (((dl + sz) * 2.0) + 35.0 + 12.0) - 2.0
+    formatka_c11 = (
+        ((dl + sz) * 2.0) + k.formatka_zakladka + k.formatka_naddatek
+    ) - k.formatka_odjecie
     wymiar_zewnetrzny_e11 = c8 + d8 + e8
 
-    # --- ZUŻYCIE M2 ORAZ WAGA ---
+    # --- ZUŻYCIE M2 ---
     zuzycie_m2 = excel_fixed((formatka_c11 * wymiar_zewnetrzny_e11) / 1_000_000.0, 3)
-    waga_kg = (gramatura * zuzycie_m2) / 1000.0 if gramatura else 0.0
-
-    # --- PODSTAWOWE KOSZTY ---
-    koszt_mat_na_szt = zuzycie_m2 * cena_m2
 
     # --- MINIMUM PRODUKCYJNE I WERYFIKACJA ---
     min_aq = 500.0 / formatka_c11 * 1000.0 if formatka_c11 else 0.0
     min_con = 300.0 / zuzycie_m2 if zuzycie_m2 else 0.0
     min_pg = 500.0 / zuzycie_m2 if zuzycie_m2 else 0.0
 
-    weryfikacja_dl = i8 + 3.0
-    weryfikacja_sz = h8 + 3.0
-    weryfikacja_wys = d8 + 2.0
+    weryfikacja_dl = i8 + k.weryfikacja_dl
+    weryfikacja_sz = h8 + k.weryfikacja_sz
+    weryfikacja_wys = d8 + k.weryfikacja_wys
 
     paletyzacja_dlugosc = f8 + g8
     paletyzacja_szerokosc = wymiar_zewnetrzny_e11
 
-    # --- TRANSPORT ---
-    stawka_pelna = stawka_transport_km * (2.0 if transport_powrot else 1.0)
-    koszt_transport_calk = stawka_pelna * max(dystans_km, 0.0)
-
     return {
         "bigi": {"c8": c8, "d8": d8, "e8": e8},
         "bigowe": {"f8": f8, "g8": g8, "h8": h8, "i8": i8, "j8": j8},
@@ -80,12 +170,50 @@ def oblicz_fala_b(
         "formatka_mm": formatka_c11,
         "wymiar_zewnetrzny_mm": wymiar_zewnetrzny_e11,
         "zuzycie_m2_na_szt": zuzycie_m2,
-        "waga_kg_na_szt": waga_kg,
-        "koszt_mat_na_szt": koszt_mat_na_szt,
-        "koszty_dodatkowe": dodatkowe_koszty,
         "minimum_produkcji": {"aq": min_aq, "con": min_con, "pg": min_pg},
         "weryfikacja_zewnetrzna": {"dl": weryfikacja_dl, "sz": weryfikacja_sz, "wys": weryfikacja_wys},
         "paletyzacja": {"dlugosc": paletyzacja_dlugosc, "szerokosc": paletyzacja_szerokosc},
+    }
+
+
+def uzupelnij_koszty(
+    geometria: dict[str, Any],
+    gramatura: float,
+    cena_m2: float,
+    dodatkowe_koszty: float,
+    stawka_transport_km: float,
+    dystans_km: float,
+    transport_powrot: bool = True,
+) -> dict[str, Any]:
+    """Dokłada do geometrii wagę, koszty materiału i transport.
+
+    Zagnieżdżone słowniki geometrii są kopiowane, więc ten sam obiekt
+    ``geometria`` można bezpiecznie użyć wielokrotnie.
+    """
+
+    zuzycie_m2 = geometria["zuzycie_m2_na_szt"]
+
+    # --- WAGA I PODSTAWOWE KOSZTY ---
+    waga_kg = (gramatura * zuzycie_m2) / 1000.0 if gramatura else 0.0
+    koszt_mat_na_szt = zuzycie_m2 * cena_m2
+
+    # --- TRANSPORT ---
+    stawka_pelna = stawka_transport_km * (2.0 if transport_powrot else 1.0)
+    koszt_transport_calk = stawka_pelna * max(dystans_km, 0.0)
+
+    return {
+        "bigi": dict(geometria["bigi"]),
+        "bigowe": dict(geometria["bigowe"]),
+        "sumy_bigowe": dict(geometria["sumy_bigowe"]),
+        "formatka_mm": geometria["formatka_mm"],
+        "wymiar_zewnetrzny_mm": geometria["wymiar_zewnetrzny_mm"],
+        "zuzycie_m2_na_szt": zuzycie_m2,
+        "waga_kg_na_szt": waga_kg,
+        "koszt_mat_na_szt": koszt_mat_na_szt,
+        "koszty_dodatkowe": dodatkowe_koszty,
+        "minimum_produkcji": dict(geometria["minimum_produkcji"]),
+        "weryfikacja_zewnetrzna": dict(geometria["weryfikacja_zewnetrzna"]),
+        "paletyzacja": dict(geometria["paletyzacja"]),
         "transport": {
             "stawka_pelna": stawka_pelna,
             "koszt_calkowity": koszt_transport_calk,
@@ -95,4 +223,83 @@ def oblicz_fala_b(
     }
 
 
-__all__ = ["excel_fixed", "oblicz_fala_b"]
+def oblicz_fale(
+    fala: str,
+    dl: float,
+    sz: float,
+    wys: float,
+    gramatura: float,
+    cena_m2: float,
+    dodatkowe_koszty: float,
+    stawka_transport_km: float,
+    dystans_km: float,
+    transport_powrot: bool = True,
+) -> dict[str, Any]:
+    """Przelicza zależności z arkusza wskazanej fali (klucz ``WAVE_KERNELS``)."""
+
+    return uzupelnij_koszty(
+        oblicz_geometrie(fala, dl, sz, wys),
+        gramatura,
+        cena_m2,
+        dodatkowe_koszty,
+        stawka_transport_km,
+        dystans_km,
+        transport_powrot,
+    )
+
+
+def oblicz_fala_b(
+    dl: float,
+    sz: float,
+    wys: float,
+    gramatura: float,
+    cena_m2: float,
+    dodatkowe_koszty: float,
+    stawka_transport_km: float,
+    dystans_km: float,
+    transport_powrot: bool = True,
+) -> dict[str, Any]:
+    """Przelicza wszystkie zależności z arkusza "FALA B"."""
+
+    return oblicz_fale(
+        "FALA B",
+        dl,
+        sz,
+        wys,
+        gramatura,
+        cena_m2,
+        dodatkowe_koszty,
+        stawka_transport_km,
+        dystans_km,
+        transport_powrot,
+    )
+
+
+def flatten_results(wyniki: dict[str, Any], prefix: str = "") -> Iterator[tuple[str, Any]]:
+    """Spłaszcza zagnieżdżony wynik ``oblicz_fala_b`` do par ``klucz.podklucz``."""
+    for key, value in wyniki.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten_results(value, prefix=f"{name}.")
+        else:
+            yield name, value
+
+
+RESULT_COLUMNS: tuple[str, ...] = tuple(
+    name for name, _ in flatten_results(oblicz_fala_b(1.0, 1.0, 1.0, 1.0, 1.0, 0.0, 0.0, 0.0))
+)
+
+
+__all__ = [
+    "RESULT_COLUMNS",
+    "WAVE_KERNELS",
+    "WAVE_NAMES",
+    "WaveKernel",
+    "excel_fixed",
+    "flatten_results",
+    "get_wave_kernel",
+    "oblicz_fala_b",
+    "oblicz_fale",
+    "oblicz_geometrie",
+    "uzupelnij_koszty",
+]
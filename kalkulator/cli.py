@@ -0,0 +1,600 @@
+"""Tryb wsadowy (bez interfejsu graficznego) uruchamiany z wiersza poleceń."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Sequence
+
+from .calculations import RESULT_COLUMNS, WAVE_NAMES
+
+# Pola liczbowe zbierane przez ``CalculatorTab.policz``: klucz, etykieta, wymagane.
+NUMERIC_FIELDS: tuple[tuple[str, str, bool], ...] = (
+    ("dl", "DŁ", True),
+    ("sz", "SZ", True),
+    ("wys", "WYS", True),
+    ("gramatura", "Gramatura", True),
+    ("cena_m2", "Cena 1 m²", True),
+    ("dodatkowe_koszty", "Dodatkowe koszty", False),
+    ("stawka_transport", "Stawka transport", False),
+    ("dystans", "Dystans km", False),
+)
+TRUE_VALUES = {"1", "true", "tak", "t", "y", "yes"}
+FALSE_VALUES = {"0", "false", "nie", "n", "no"}
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+class BatchInputError(ValueError):
+    """Błąd danych wejściowych w konkretnym wierszu pliku wsadowego."""
+
+
+def parse_number(value: Any, name: str, required: bool) -> float:
+    """Parsuje liczbę tak samo jak pola formularza w ``CalculatorTab``."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    text = "" if value is None else str(value).strip().replace(",", ".")
+    if not text:
+        if not required:
+            return 0.0
+        raise ValueError(f"Wymagana wartość w polu: {name}")
+    try:
+        return float(text)
+    except ValueError as exc:
+        raise ValueError(f"Nieprawidłowa wartość w polu: {name}") from exc
+
+
+def parse_flag(value: Any, default: bool = True) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = "" if value is None else str(value).strip().lower()
+    if not text:
+        return default
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError("Nieprawidłowa wartość w polu: Powrót")
+
+
+def parse_wave(value: Any) -> int:
+    """Zwraca kod fali (indeks w ``WAVE_NAMES``); domyślnie "FALA B"."""
+    text = "" if value is None else str(value).strip()
+    if not text:
+        return 0
+    for code, name in enumerate(WAVE_NAMES):
+        if name.casefold() == text.casefold():
+            return code
+    raise ValueError(f"Nieznany rodzaj fali: {text}")
+
+
+def rows_to_columns(rows: Sequence[Dict[str, Any]], first_row_number: int = 1) -> Dict[str, list]:
+    """Zamienia wiersze wejściowe na kolumny argumentów ``oblicz_fale``."""
+    columns: Dict[str, list] = {key: [] for key, _, _ in NUMERIC_FIELDS}
+    columns["powrot"] = []
+    columns["fala"] = []
+    for offset, row in enumerate(rows):
+        try:
+            for key, label, required in NUMERIC_FIELDS:
+                columns[key].append(parse_number(row.get(key), label, required))
+            columns["powrot"].append(parse_flag(row.get("powrot")))
+            columns["fala"].append(parse_wave(row.get("fala")))
+        except ValueError as exc:
+            raise BatchInputError(f"Wiersz {first_row_number + offset}: {exc}") from exc
+    return columns
+
+
+def read_rows(stream: IO[str], fmt: str, delimiter: str) -> tuple[list[str], Iterator[Dict[str, Any]]]:
+    """Zwraca nagłówek (jeśli znany) i leniwy iterator wierszy wejściowych."""
+    if fmt == "jsonl":
+        def jsonl_rows() -> Iterator[Dict[str, Any]]:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+
+        return [], jsonl_rows()
+
+    first_line = stream.readline()
+    if first_line.startswith("sep="):
+        delimiter = first_line[4:].strip() or delimiter
+        lines: Iterable[str] = stream
+    else:
+        lines = itertools.chain([first_line], stream)
+    reader = csv.DictReader(lines, delimiter=delimiter)
+    fieldnames = list(reader.fieldnames or [])
+    return fieldnames, iter(reader)
+
+
+class _RowWriter:
+    """Zapisuje wiersze wyników przyrostowo w formacie CSV lub JSONL."""
+
+    def __init__(self, stream: IO[str], fmt: str, delimiter: str, header: list[str] | None):
+        self.stream = stream
+        self.fmt = fmt
+        self.header = header
+        self._csv = None
+        self._header_written = False
+        if fmt == "csv":
+            self._csv = csv.writer(stream, delimiter=delimiter, lineterminator="\n")
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> None:
+        if self._csv is not None:
+            for row in rows:
+                if not self._header_written:
+                    # Bez jawnej listy kolumn nagłówek wyznacza pierwszy wiersz.
+                    if self.header is None:
+                        self.header = list(row)
+                    self._csv.writerow(self.header)
+                    self._header_written = True
+                self._csv.writerow([_csv_value(row.get(name)) for name in self.header])
+        else:
+            for row in rows:
+                if self.header is not None:
+                    row = {name: row.get(name) for name in self.header}
+                self.stream.write(json.dumps(row, ensure_ascii=False))
+                self.stream.write("\n")
+        self.stream.flush()
+
+    def finish(self, header: list[str] | None = None) -> None:
+        """Zapisuje sam nagłówek CSV, jeśli nie było żadnego wiersza wyników."""
+
+        if self._csv is None or self._header_written:
+            return
+        header = self.header or header
+        if header:
+            self._csv.writerow(header)
+            self._header_written = True
+            self.stream.flush()
+
+
+def _csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value)
+
+
+def _chunks(rows: Iterator[Dict[str, Any]], chunk_size: int) -> Iterator[list[Dict[str, Any]]]:
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(
+    source: IO[str],
+    target: IO[str],
+    *,
+    input_format: str = "csv",
+    output_format: str = "csv",
+    delimiter: str = ";",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    columns: Sequence[str] | None = None,
+    pallet: Any = None,
+) -> int:
+    """Przetwarza strumień wierszy porcjami i zwraca liczbę policzonych wierszy.
+
+    W pamięci znajduje się najwyżej ``2 * workers + 1`` porcji naraz, więc
+    zużycie pamięci nie zależy od rozmiaru pliku. Z ustawieniami ``pallet``
+    (:class:`kalkulator.pallets.PalletSettings`) do wyniku dochodzą kolumny
+    ``PALLET_COLUMNS`` liczone dla ilości z kolumny ``ilosc``.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("Rozmiar porcji musi być dodatni.")
+    fieldnames, rows = read_rows(source, input_format, delimiter)
+    output_columns = list(RESULT_COLUMNS)
+    if pallet is not None:
+        from .pallets import PALLET_COLUMNS, plan_pallets_batch
+
+        output_columns += PALLET_COLUMNS
+
+    header = list(columns) if columns else None
+    if header:
+        if not fieldnames:
+            # JSONL nie ma nagłówka – pola wejściowe brane są z pierwszego wiersza.
+            first = next(rows, None)
+            if first is not None:
+                fieldnames = list(first)
+                rows = itertools.chain([first], rows)
+        known = set(output_columns) | set(fieldnames)
+        unknown = [name for name in header if name not in known]
+        if unknown:
+            raise ValueError("Nieznane kolumny: " + ", ".join(unknown))
+    writer = _RowWriter(target, output_format, delimiter, header)
+
+    from .parallel import iter_parallel
+
+    pending: deque[tuple[list[Dict[str, Any]], Dict[str, list]]] = deque()
+
+    def parsed_chunks() -> Iterator[Dict[str, list]]:
+        row_number = 1
+        for chunk in _chunks(rows, chunk_size):
+            parsed = rows_to_columns(chunk, first_row_number=row_number)
+            if pallet is not None:
+                parsed["ilosc"] = []
+                for offset, row in enumerate(chunk):
+                    try:
+                        parsed["ilosc"].append(parse_number(row.get("ilosc"), "Ilość", False))
+                    except ValueError as exc:
+                        raise BatchInputError(f"Wiersz {row_number + offset}: {exc}") from exc
+            row_number += len(chunk)
+            pending.append((chunk, parsed))
+            yield parsed
+
+    processed = 0
+    for results in iter_parallel(parsed_chunks(), workers=workers):
+        chunk, parsed = pending.popleft()
+        if pallet is not None:
+            results = {
+                **results,
+                **plan_pallets_batch(
+                    parsed["fala"],
+                    results["paletyzacja.dlugosc"],
+                    results["paletyzacja.szerokosc"],
+                    results["waga_kg_na_szt"],
+                    parsed["ilosc"],
+                    results["transport.koszt_calkowity"],
+                    pallet,
+                ),
+            }
+        names = list(results)
+        merged = (
+            {**row, **dict(zip(names, values))}
+            for row, values in zip(chunk, zip(*(column.tolist() for column in results.values())))
+        )
+        writer.write(merged)
+        processed += len(chunk)
+    # Wejście bez wierszy: nagłówek CSV z ``columns`` albo z pól wejściowych
+    # w tej samej kolejności, jaką miałyby wiersze wyników.
+    writer.finish(
+        fieldnames + [name for name in output_columns if name not in fieldnames]
+        if fieldnames
+        else None
+    )
+    return processed
+
+
+def _detect_format(path: str, explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    return "jsonl" if Path(path).suffix.lower() in {".jsonl", ".ndjson"} else "csv"
+
+
+def _open_input(path: str) -> IO[str]:
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def _open_output(path: str) -> IO[str]:
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m kalkulator",
+        description="Kalkulator Rekruso. Bez argumentów uruchamia interfejs graficzny.",
+    )
+    parser.add_argument(
+        "--startup-report",
+        metavar="PLIK",
+        help="Dopisz raport czasu uruchamiania GUI (JSON) do pliku ('-' = stderr).",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="Przelicza plik CSV/JSONL bez interfejsu graficznego.",
+    )
+    batch.add_argument("input", help="Plik wejściowy CSV lub JSONL ('-' = stdin).")
+    batch.add_argument(
+        "-o", "--output", default="-", help="Plik wynikowy ('-' = stdout)."
+    )
+    batch.add_argument("--input-format", choices=("csv", "jsonl"))
+    batch.add_argument("--output-format", choices=("csv", "jsonl"))
+    batch.add_argument(
+        "--delimiter", default=";", help="Separator pól CSV (domyślnie ';')."
+    )
+    batch.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Liczba wierszy liczonych w jednej porcji.",
+    )
+    batch.add_argument(
+        "--workers", type=int, default=1, help="Liczba procesów roboczych."
+    )
+    batch.add_argument(
+        "--paleta",
+        help="Rodzaj palety (np. 'EUR'); dodaje kolumny palety.* liczone dla kolumny 'ilosc'.",
+    )
+    batch.add_argument(
+        "--max-wysokosc", type=float, help="Maks. wysokość palety z ładunkiem [mm]."
+    )
+    batch.add_argument("--max-waga", type=float, help="Maks. waga ładunku palety [kg].")
+    batch.add_argument(
+        "--columns",
+        help="Lista kolumn wyjściowych oddzielonych przecinkami, np. "
+        "'dl,sz,wys,zuzycie_m2_na_szt,transport.koszt_calkowity'.",
+    )
+
+    scaling = subparsers.add_parser(
+        "scaling",
+        help="Mierzy przepustowość obliczeń wsadowych dla różnej liczby procesów.",
+    )
+    scaling.add_argument("--rows", type=int, default=1_000_000)
+    scaling.add_argument(
+        "--workers",
+        help="Liczby procesów oddzielone przecinkami, np. '1,2,4,8'.",
+    )
+    scaling.add_argument("--chunk-size", type=int, default=50_000)
+
+    history = subparsers.add_parser(
+        "historia",
+        help="Wyszukuje zapisane wyceny w dzienniku (wynik w formacie JSONL).",
+    )
+    history.add_argument("--nip")
+    history.add_argument("--firma", help="Początek nazwy firmy (bez względu na wielkość liter).")
+    history.add_argument("--wymiary", help="Wymiary DLxSZxWYS w mm, np. '400x300x150'.")
+    history.add_argument("--tolerancja", type=float, default=0.0, help="Tolerancja wymiarów [mm].")
+    history.add_argument("--od", help="Data początkowa, np. '2024-10-01'.")
+    history.add_argument("--do", help="Data końcowa (włącznie), np. '2024-10-31 23:59:59'.")
+    history.add_argument("--limit", type=int, default=100)
+    history.add_argument("--baza", help="Plik bazy dziennika (domyślnie w katalogu konfiguracji).")
+
+    similar = subparsers.add_parser(
+        "podobne",
+        help="Wyszukuje wyceny kartonów o najbliższych wymiarach (wynik w formacie JSONL).",
+    )
+    similar.add_argument("wymiary", help="Wymiary DLxSZxWYS w mm, np. '402x298x150'.")
+    similar.add_argument("--fala", help="Rodzaj fali (domyślnie wszystkie).")
+    similar.add_argument("-k", type=int, default=5, help="Liczba zwracanych wycen.")
+    similar.add_argument("--baza", help="Plik bazy dziennika (domyślnie w katalogu konfiguracji).")
+
+    solve = subparsers.add_parser(
+        "dobierz",
+        help="Wyznacza największy wymiar (lub karton) spełniający limity (wynik w formacie JSON).",
+    )
+    solve.add_argument(
+        "szukany",
+        choices=("dl", "sz", "wys", "karton"),
+        help="Szukany wymiar albo 'karton' (największa objętość).",
+    )
+    solve.add_argument("--fala", help="Rodzaj fali (domyślnie 'FALA B').")
+    for name in ("dl", "sz", "wys"):
+        solve.add_argument(f"--{name}", type=float, help=f"Ustalony wymiar {name.upper()} [mm].")
+    solve.add_argument("--max-zuzycie", type=float, help="Maks. zużycie [m²/szt.].")
+    solve.add_argument("--max-cena", type=float, help="Maks. cena jednostkowa [zł/szt.].")
+    solve.add_argument("--cena-m2", type=float, help="Cena 1 m² (wymagana z --max-cena).")
+    solve.add_argument(
+        "--ilosc", type=int, help="Ilość, dla której liczona jest cena (marża z ustawień)."
+    )
+    solve.add_argument("--koszty-dodatkowe", type=float, default=0.0)
+    solve.add_argument("--koszt-transportu", type=float, default=0.0)
+    solve.add_argument("--max-dl-palety", type=float, help="Maks. długość paletyzacji [mm].")
+    solve.add_argument("--max-szer-palety", type=float, help="Maks. szerokość paletyzacji [mm].")
+    solve.add_argument("--krok", type=float, help="Krok wyniku [mm] (domyślnie 1, dla kartonu 5).")
+    return parser
+
+
+def parse_dimensions(text: str) -> tuple[float, float, float]:
+    """Parsuje wymiary zapisane jako ``DLxSZxWYS`` (np. ``400x300x150``)."""
+    parts = text.lower().replace("×", "x").split("x")
+    if len(parts) != 3:
+        raise ValueError(f"Nieprawidłowe wymiary: {text}")
+    dl, sz, wys = (parse_number(part, "Wymiary", True) for part in parts)
+    return dl, sz, wys
+
+
+def _print_history(args: argparse.Namespace) -> int:
+    import sqlite3
+
+    from .journal import QuoteJournal
+
+    try:
+        dims = parse_dimensions(args.wymiary) if args.wymiary else (None, None, None)
+    except ValueError as exc:
+        print(f"Błąd: {exc}", file=sys.stderr)
+        return 1
+    journal = QuoteJournal(args.baza)
+    try:
+        entries = journal.search(
+            nip=args.nip,
+            company=args.firma,
+            dl=dims[0],
+            sz=dims[1],
+            wys=dims[2],
+            tolerance=args.tolerancja,
+            since=args.od,
+            until=args.do,
+            limit=args.limit,
+        )
+    except (OSError, ValueError, sqlite3.Error) as exc:
+        print(f"Błąd: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        journal.close()
+    for entry in entries:
+        _print_entry(entry)
+    return 0
+
+
+def _print_entry(entry: Any, **extra: Any) -> None:
+    record = entry.as_results()
+    record["wyniki"] = entry.wyniki.to_dict()
+    print(
+        json.dumps(
+            {**extra, "id": entry.id, "created": entry.created, **record}, ensure_ascii=False
+        )
+    )
+
+
+def _print_similar(args: argparse.Namespace) -> int:
+    import sqlite3
+
+    from .journal import QuoteJournal
+    from .similar import find_similar
+
+    try:
+        dims = parse_dimensions(args.wymiary)
+        wave = WAVE_NAMES[parse_wave(args.fala)] if args.fala else None
+    except ValueError as exc:
+        print(f"Błąd: {exc}", file=sys.stderr)
+        return 1
+    journal = QuoteJournal(args.baza)
+    try:
+        matches = find_similar(journal, *dims, wave=wave, k=args.k)
+    except (OSError, ValueError, sqlite3.Error) as exc:
+        print(f"Błąd: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        journal.close()
+    for match, entry in matches:
+        _print_entry(entry, distance=round(match.distance, 3))
+    return 0
+
+
+def _print_solution(args: argparse.Namespace) -> int:
+    from . import solver
+
+    try:
+        wave = WAVE_NAMES[parse_wave(args.fala)]
+        limits = [] if args.max_zuzycie is None else [args.max_zuzycie]
+        if args.max_cena is not None:
+            if args.cena_m2 is None:
+                raise ValueError("Podaj --cena-m2, aby liczyć limit ceny.")
+            margin_rules: list[dict[str, float]] = []
+            if args.ilosc is not None:
+                from .config import ConfigManager
+
+                margin_rules = ConfigManager().get_margin_rules()
+            limits.append(
+                solver.zuzycie_limit_for_price(
+                    args.max_cena,
+                    args.cena_m2,
+                    quantity=args.ilosc,
+                    dodatkowe_koszty=args.koszty_dodatkowe,
+                    koszt_transportu=args.koszt_transportu,
+                    margin_rules=margin_rules,
+                )
+            )
+        constraints = solver.Constraints(
+            max_zuzycie_m2=min(limits) if limits else None,
+            max_pallet_length=args.max_dl_palety,
+            max_pallet_width=args.max_szer_palety,
+        )
+        if args.szukany == "karton":
+            step = args.krok or solver.DEFAULT_GRID_STEP_MM
+            solution = solver.largest_box(wave, constraints, step=step)
+        else:
+            dims = {}
+            for name in solver.DIMENSIONS:
+                value = getattr(args, name)
+                if name == args.szukany:
+                    continue
+                if value is None:
+                    raise ValueError(f"Podaj --{name}.")
+                dims[name] = value
+            step = args.krok or solver.DEFAULT_STEP_MM
+            solution = solver.max_dimension(wave, args.szukany, constraints, step=step, **dims)
+    except ValueError as exc:
+        print(f"Błąd: {exc}", file=sys.stderr)
+        return 1
+    if solution is None:
+        print("Błąd: Żaden wymiar nie spełnia podanych ograniczeń.", file=sys.stderr)
+        return 1
+    print(json.dumps({"fala": wave, **solution._asdict()}, ensure_ascii=False))
+    return 0
+
+
+def _print_scaling(args: argparse.Namespace) -> int:
+    from .parallel import measure_scaling
+
+    worker_counts = (
+        [int(value) for value in args.workers.split(",")] if args.workers else None
+    )
+    report = measure_scaling(
+        rows=args.rows, worker_counts=worker_counts, chunk_size=args.chunk_size
+    )
+    print(f"{'Procesy':>8} {'Czas [s]':>10} {'Wiersze/s':>14} {'Przyspieszenie':>15}")
+    for entry in report:
+        print(
+            f"{entry['workers']:>8} {entry['seconds']:>10.3f} "
+            f"{entry['rows_per_second']:>14,.0f} {entry['speedup']:>14.2f}x"
+        )
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        from .ui import main as gui_main
+
+        gui_main(startup_report=args.startup_report)
+        return 0
+    if args.command == "scaling":
+        return _print_scaling(args)
+    if args.command == "historia":
+        return _print_history(args)
+    if args.command == "podobne":
+        return _print_similar(args)
+    if args.command == "dobierz":
+        return _print_solution(args)
+
+    input_format = _detect_format(args.input, args.input_format)
+    if args.output_format is None and args.output == "-":
+        output_format = input_format
+    else:
+        output_format = _detect_format(args.output, args.output_format)
+    columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+    pallet = None
+    if args.paleta:
+        from .config import ConfigManager
+        from .pallets import DEFAULT_MAX_HEIGHT_MM, PalletSettings, apply_overrides
+
+        pallet = apply_overrides(
+            PalletSettings(
+                pallet=args.paleta,
+                max_height_mm=args.max_wysokosc or DEFAULT_MAX_HEIGHT_MM,
+                max_weight_kg=args.max_waga,
+            ),
+            ConfigManager().get_pallet_overrides(),
+        )
+
+    try:
+        with _open_input(args.input) as source, _open_output(args.output) as target:
+            run_batch(
+                source,
+                target,
+                input_format=input_format,
+                output_format=output_format,
+                delimiter=args.delimiter,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                columns=columns,
+                pallet=pallet,
+            )
+    except (OSError, ValueError) as exc:
+        print(f"Błąd: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+__all__ = [
+    "BatchInputError",
+    "main",
+    "run_batch",
+]
@@ -2,25 +2,30 @@
 
 from __future__ import annotations
 
-import base64
-import binascii
-import hashlib
-import hmac
+import atexit
 import json
 import os
 import sys
+import threading
 from copy import deepcopy
 from pathlib import Path
 from typing import Any, Dict
 
 CONFIG_DIR_NAME = "kalkulator_retruso"
 CONFIG_FILE_NAME = "config.json"
+# Ustawienia jednego komputera (np. wykryta ścieżka Adobe Reader). Nazwa
+# zawiera nazwę komputera, więc stanowiska ze wspólnym katalogiem
+# konfiguracji nie nadpisują sobie nawzajem tych wartości.
+LOCAL_FILE_TEMPLATE = "local-{machine}.json"
 DEFAULT_MARGIN_RULES = [
     {"max_quantity": 300, "margin_percent": 100.0},
     {"max_quantity": 500, "margin_percent": 70.0},
     {"max_quantity": 1000, "margin_percent": 25.0},
 ]
 PBKDF2_ITERATIONS = 120_000
+DEFAULT_PDF_COMPRESSION_LEVEL = 6
+# Zapisy zlecone w tym oknie (sekundy) są łączone w jeden zapis pliku.
+SAVE_DELAY = 0.5
 
 
 def _get_config_dir() -> Path:
@@ -32,22 +37,60 @@ def _get_config_dir() -> Path:
     return Path.home() / ".config" / CONFIG_DIR_NAME
 
 
+def _machine_name() -> str:
+    import platform
+
+    name = platform.node() or "local"
+    return "".join(char if char.isalnum() or char in "-_" else "_" for char in name)
+
+
 class ConfigManager:
-    """Odpowiada za wczytywanie i zapisywanie ustawień programu."""
+    """Odpowiada za wczytywanie i zapisywanie ustawień programu.
+
+    :meth:`save` nie zapisuje pliku od razu: kolejne wywołania w ciągu
+    ``save_delay`` sekund są łączone w jeden zapis wykonywany w tle. Plik
+    jest podmieniany atomowo (plik tymczasowy + ``os.replace``), więc
+    przerwany zapis nie uszkodzi konfiguracji. Oczekujące zmiany są
+    zapisywane przez :meth:`flush`, także przy zakończeniu programu.
+
+    Wartości dotyczące tylko tego komputera (wykryta ścieżka Adobe Reader)
+    trafiają do osobnego pliku ``local-<komputer>.json`` zamiast do
+    współdzielonego ``config.json``.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, *, save_delay: float = SAVE_DELAY, fsync: bool = False) -> None:
         self.config_dir = _get_config_dir()
         self.config_file = self.config_dir / CONFIG_FILE_NAME
-        self.data: Dict[str, Any] = {
+        self.save_delay = save_delay
+        self.fsync = fsync
+        self._save_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._save_timer: threading.Timer | None = None
+        self._dirty = False
+        self._file_signature: tuple[int, int] | None = None
+        self._save_stats = {"requested": 0, "written": 0, "coalesced": 0, "failed": 0}
+        self._local_lock = threading.Lock()
+        self._local: Dict[str, Any] | None = None
+        self.data: Dict[str, Any] = self._defaults()
+        self.load()
+
+    @staticmethod
+    def _defaults() -> Dict[str, Any]:
+        return {
             "password": None,
             "margin_rules": deepcopy(DEFAULT_MARGIN_RULES),
+            "pdf_compression_level": DEFAULT_PDF_COMPRESSION_LEVEL,
+            "adobe_reader_override": None,
+            "pallets": {},
         }
-        self.load()
 
     # ------------------------------------------------------------------
     # Operacje na pliku konfiguracyjnym
     # ------------------------------------------------------------------
     def load(self) -> None:
+        # Sygnatura sprzed odczytu: zmiana w trakcie czytania zostanie
+        # wykryta przy następnym sprawdzeniu.
+        signature = self._stat_signature()
         try:
             with self.config_file.open("r", encoding="utf-8") as file:
                 raw_data = json.load(file)
@@ -55,6 +98,17 @@ class ConfigManager:
             return
         except (json.JSONDecodeError, OSError):
             return
+        if not isinstance(raw_data, dict):
+            return
+        self._file_signature = signature
+
+        # Klucz usunięty z pliku lub ustawiony na ``null`` wraca do wartości
+        # domyślnej, tak aby stanowiska współdzielące plik miały te same
+        # ustawienia. Wyjątkiem jest hasło: nieaktualny lub ręcznie zmieniony
+        # plik nie może zdjąć blokady ustawień – zmienia je tylko poprawna wartość.
+        for key, default in self._defaults().items():
+            if key != "password" and raw_data.get(key) is None:
+                self.data[key] = default
 
         password_value = raw_data.get("password")
         if isinstance(password_value, str):
@@ -78,21 +132,161 @@ class ConfigManager:
         if margin_rules is not None:
             self.data["margin_rules"] = margin_rules
 
-    def save(self) -> None:
+        compression_level = self._sanitize_compression_level(
+            raw_data.get("pdf_compression_level")
+        )
+        if compression_level is not None:
+            self.data["pdf_compression_level"] = compression_level
+
+        value = raw_data.get("adobe_reader_override")
+        if isinstance(value, str) and value.strip():
+            self.data["adobe_reader_override"] = value.strip()
+
+        pallets = self._sanitize_pallet_overrides(raw_data.get("pallets"))
+        if pallets is not None:
+            self.data["pallets"] = pallets
+
+    def reload_if_changed(self) -> bool:
+        """Wczytuje plik ponownie, jeśli zmienił go inny proces.
+
+        Zmiana jest wykrywana po czasie modyfikacji i rozmiarze pliku, więc
+        wywołanie jest tanie i może być wykonywane cyklicznie. Zwraca
+        ``True``, gdy zmieniły się progi marży. Niezapisane lokalne zmiany
+        mają pierwszeństwo – do czasu ich zapisu plik nie jest wczytywany.
+        """
+
+        signature = self._stat_signature()
+        if signature is None or signature == self._file_signature:
+            return False
+        with self._save_lock:
+            if self._dirty:
+                return False
+        previous = self.data.get("margin_rules")
+        self.load()
+        return self.data.get("margin_rules") != previous
+
+    def _stat_signature(self) -> tuple[int, int] | None:
         try:
-            self.config_dir.mkdir(parents=True, exist_ok=True)
-            with self.config_file.open("w", encoding="utf-8") as file:
-                json.dump(
-                    {
-                        "password": self.data.get("password"),
-                        "margin_rules": self.data.get("margin_rules", []),
-                    },
-                    file,
-                    ensure_ascii=False,
-                    indent=2,
-                )
+            stat = self.config_file.stat()
         except OSError:
-            pass
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def save(self) -> None:
+        """Zleca zapis konfiguracji (z opóźnieniem ``save_delay``)."""
+
+        with self._save_lock:
+            self._save_stats["requested"] += 1
+            if self._dirty:
+                self._save_stats["coalesced"] += 1
+                return
+            self._dirty = True
+            if self.save_delay > 0:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                atexit.register(self.flush)
+        if self.save_delay <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Natychmiast zapisuje oczekujące zmiany (jeśli są)."""
+
+        with self._write_lock:
+            with self._save_lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                timer, self._save_timer = self._save_timer, None
+                payload = self._payload()
+            if timer is not None:
+                timer.cancel()
+                atexit.unregister(self.flush)
+            try:
+                self._write_file(payload)
+            except OSError:
+                self._save_stats["failed"] += 1
+            else:
+                self._save_stats["written"] += 1
+
+    def save_stats(self) -> dict[str, int]:
+        """Liczniki zapisów: zleconych, wykonanych, połączonych i nieudanych."""
+
+        with self._save_lock:
+            return dict(self._save_stats)
+
+    def _payload(self) -> Dict[str, Any]:
+        # Wywoływane pod ``_save_lock``; kopia odcina zapis w tle od zmian
+        # ``self.data`` wprowadzanych w międzyczasie.
+        return deepcopy({
+            "password": self.data.get("password"),
+            "margin_rules": self.data.get("margin_rules", []),
+            "pdf_compression_level": self.data.get(
+                "pdf_compression_level", DEFAULT_PDF_COMPRESSION_LEVEL
+            ),
+            "adobe_reader_override": self.data.get("adobe_reader_override"),
+            "pallets": self.data.get("pallets", {}),
+        })
+
+    def _write_file(self, payload: Dict[str, Any]) -> None:
+        self._replace_file(self.config_file, payload)
+        # Własny zapis nie powinien być traktowany jak zmiana z zewnątrz.
+        self._file_signature = self._stat_signature()
+
+    def _replace_file(self, target: Path, payload: Dict[str, Any]) -> None:
+        """Zapisuje JSON atomowo: plik tymczasowy w tym samym katalogu + ``os.replace``."""
+
+        import tempfile
+
+        content = json.dumps(payload, ensure_ascii=False, indent=2)
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(
+            prefix=target.name + ".", suffix=".tmp", dir=self.config_dir
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(content)
+                if self.fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            os.replace(temp_name, target)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+    # ------------------------------------------------------------------
+    # Ustawienia lokalne (tylko ten komputer)
+    # ------------------------------------------------------------------
+    @property
+    def local_file(self) -> Path:
+        return self.config_dir / LOCAL_FILE_TEMPLATE.format(machine=_machine_name())
+
+    def _local_data(self) -> Dict[str, Any]:
+        # Wywoływane pod ``_local_lock``; plik czytany jest raz.
+        if self._local is None:
+            try:
+                with self.local_file.open("r", encoding="utf-8") as file:
+                    raw_data = json.load(file)
+            except (OSError, json.JSONDecodeError):
+                raw_data = {}
+            self._local = raw_data if isinstance(raw_data, dict) else {}
+        return self._local
+
+    def _set_local(self, key: str, value: Any) -> None:
+        """Zapisuje wartość lokalną od razu (także z wątku roboczego)."""
+
+        with self._local_lock:
+            data = self._local_data()
+            if data.get(key) == value:
+                return
+            data[key] = value
+            try:
+                self._replace_file(self.local_file, dict(data))
+            except OSError:
+                self._save_stats["failed"] += 1
 
     # ------------------------------------------------------------------
     # Obsługa hasła
@@ -119,6 +313,11 @@ class ConfigManager:
 
     @staticmethod
     def _verify_hashed_password(password_info: Dict[str, Any], password: str) -> bool:
+        import base64
+        import binascii
+        import hashlib
+        import hmac
+
         salt_b64 = password_info.get("salt")
         hash_b64 = password_info.get("hash")
         iterations = password_info.get("iterations", PBKDF2_ITERATIONS)
@@ -151,6 +350,54 @@ class ConfigManager:
         self.save()
         return deepcopy(self.data["margin_rules"])
 
+    # ------------------------------------------------------------------
+    # Ustawienia wydruku
+    # ------------------------------------------------------------------
+    def get_pdf_compression_level(self) -> int:
+        return int(self.data.get("pdf_compression_level", DEFAULT_PDF_COMPRESSION_LEVEL))
+
+    def set_pdf_compression_level(self, level: int) -> None:
+        sanitized = self._sanitize_compression_level(level)
+        if sanitized is None:
+            raise ValueError("Poziom kompresji PDF musi mieścić się w zakresie 0–9.")
+        self.data["pdf_compression_level"] = sanitized
+        self.save()
+
+    def get_adobe_reader_path(self) -> str | None:
+        """Ścieżka Adobe Reader znaleziona na tym komputerze przy ostatnim wyszukiwaniu."""
+        with self._local_lock:
+            value = self._local_data().get("adobe_reader_path")
+        return value if isinstance(value, str) and value.strip() else None
+
+    def set_adobe_reader_path(self, path: str | None) -> None:
+        self._set_local("adobe_reader_path", path)
+
+    def get_adobe_reader_override(self) -> str | None:
+        """Ścieżka Adobe Reader wskazana ręcznie przez użytkownika."""
+        return self.data.get("adobe_reader_override")
+
+    def set_adobe_reader_override(self, path: str | None) -> None:
+        self.data["adobe_reader_override"] = path.strip() if path and path.strip() else None
+        self.save()
+
+    # ------------------------------------------------------------------
+    # Ustawienia paletyzacji
+    # ------------------------------------------------------------------
+    def get_pallet_overrides(self) -> dict[str, Any]:
+        """Nadpisane wartości szacunkowe z :mod:`kalkulator.pallets`.
+
+        Klucze (wszystkie opcjonalne): ``deck_height_mm``, ``per_truck``
+        (rodzaj palety → liczba palet na aucie) i ``thickness_mm`` (fala →
+        grubość tektury w mm).
+        """
+        return deepcopy(self.data.get("pallets", {}))
+
+    def set_pallet_overrides(self, overrides: dict[str, Any]) -> dict[str, Any]:
+        sanitized = self._sanitize_pallet_overrides(overrides)
+        self.data["pallets"] = sanitized if sanitized is not None else {}
+        self.save()
+        return deepcopy(self.data["pallets"])
+
     # ------------------------------------------------------------------
     # Funkcje pomocnicze
     # ------------------------------------------------------------------
@@ -174,8 +421,54 @@ class ConfigManager:
         sanitized.sort(key=lambda rule: rule["max_quantity"])
         return sanitized
 
+    @staticmethod
+    def _sanitize_pallet_overrides(value: Any) -> dict[str, Any] | None:
+        if not isinstance(value, dict):
+            return None
+
+        def positive(item: Any, kind: type) -> Any:
+            if isinstance(item, bool):
+                return None
+            try:
+                number = kind(item)
+            except (TypeError, ValueError):
+                return None
+            return number if number > 0 else None
+
+        sanitized: dict[str, Any] = {}
+        deck_height = positive(value.get("deck_height_mm"), float)
+        if deck_height is not None:
+            sanitized["deck_height_mm"] = deck_height
+        for key, kind in (("per_truck", int), ("thickness_mm", float)):
+            table = value.get(key)
+            if not isinstance(table, dict):
+                continue
+            entries = {
+                str(name): number
+                for name, number in ((name, positive(item, kind)) for name, item in table.items())
+                if number is not None
+            }
+            if entries:
+                sanitized[key] = entries
+        return sanitized
+
+    @staticmethod
+    def _sanitize_compression_level(value: Any) -> int | None:
+        if isinstance(value, bool):
+            return None
+        try:
+            level = int(value)
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= level <= 9:
+            return None
+        return level
+
 
 __all__ = [
     "ConfigManager",
     "DEFAULT_MARGIN_RULES",
+    "DEFAULT_PDF_COMPRESSION_LEVEL",
+    "LOCAL_FILE_TEMPLATE",
+    "SAVE_DELAY",
 ]
@@ -0,0 +1,358 @@
+"""Dziennik wycen zapisywany w lokalnej bazie SQLite.
+
+Każda kalkulacja (klient, dane wejściowe, wynik i progi marży) trafia do
+tabeli ``quotes``. Zapisy są kolejkowane i wstawiane partiami przez wątek
+roboczy, więc wywołanie :meth:`QuoteJournal.record` z wątku Tk nie czeka na
+dysk. Indeksy po NIP, nazwie firmy, wymiarach i dacie pozwalają wyszukiwać
+wyceny w milisekundach także przy milionie wierszy.
+
+Wynik zapisywany jest jako obiekt JSON kolumna -> wartość, więc zmiana
+``RESULT_COLUMNS`` nie unieważnia starszych wpisów. Wiersze, których nie da
+się odczytać (uszkodzone albo w dawnym formacie binarnym o innym układzie),
+są pomijane przy wyszukiwaniu zamiast przerywać je błędem.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import queue
+import threading
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Mapping, NamedTuple, Sequence
+
+from .calculations import RESULT_COLUMNS
+from .config import _get_config_dir
+from .results import QuoteResult
+
+if TYPE_CHECKING:
+    import sqlite3
+
+JOURNAL_FILE_NAME = "quotes.sqlite3"
+BATCH_SIZE = 500
+DEFAULT_SEARCH_LIMIT = 100
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    wave TEXT NOT NULL,
+    nip TEXT NOT NULL,
+    company TEXT NOT NULL,
+    company_key TEXT NOT NULL,
+    dl REAL NOT NULL,
+    sz REAL NOT NULL,
+    wys REAL NOT NULL,
+    client TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    margin_rules TEXT NOT NULL,
+    quantities TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_quotes_nip ON quotes (nip, created);
+CREATE INDEX IF NOT EXISTS idx_quotes_company ON quotes (company_key, created);
+CREATE INDEX IF NOT EXISTS idx_quotes_dims ON quotes (dl, sz, wys);
+CREATE INDEX IF NOT EXISTS idx_quotes_created ON quotes (created);
+"""
+_INSERT = (
+    "INSERT INTO quotes (created, wave, nip, company, company_key, dl, sz, wys,"
+    " client, inputs, margin_rules, quantities, result)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_COLUMNS = "id, created, client, inputs, margin_rules, quantities, result"
+
+
+def normalize_nip(value: Any) -> str:
+    """Zostawia w NIP same cyfry (``"123-456-32-18"`` -> ``"1234563218"``)."""
+    return "".join(char for char in str(value or "") if char.isdigit())
+
+
+def _company_key(value: Any) -> str:
+    return " ".join(str(value or "").split()).casefold()
+
+
+class JournalEntry(NamedTuple):
+    """Jedna zapisana wycena."""
+
+    id: int
+    created: str
+    client: Dict[str, str]
+    inputs: Dict[str, Any]
+    margin_rules: list[dict[str, float]]
+    quantities: list[int]
+    wyniki: QuoteResult
+
+    def as_results(self) -> Dict[str, Any]:
+        """Zwraca wpis w postaci ``CalculatorTab.last_results``."""
+        return {
+            "client": dict(self.client),
+            "inputs": dict(self.inputs),
+            "wyniki": self.wyniki,
+            "margin_rules": [dict(rule) for rule in self.margin_rules],
+            "quantities": list(self.quantities),
+        }
+
+
+def _row_for(last_results: Mapping[str, Any], created: datetime) -> tuple:
+    client = dict(last_results.get("client") or {})
+    inputs = dict(last_results.get("inputs") or {})
+    wyniki = last_results["wyniki"]
+    if not isinstance(wyniki, QuoteResult):
+        wyniki = QuoteResult(wyniki)
+    return (
+        created.strftime(_DATE_FORMAT),
+        str(inputs.get("fala", "")),
+        normalize_nip(client.get("nip")),
+        str(client.get("nazwa", "")),
+        _company_key(client.get("nazwa")),
+        float(inputs.get("dl", 0.0)),
+        float(inputs.get("sz", 0.0)),
+        float(inputs.get("wys", 0.0)),
+        json.dumps(client, ensure_ascii=False),
+        json.dumps(inputs, ensure_ascii=False),
+        json.dumps(list(last_results.get("margin_rules") or []), ensure_ascii=False),
+        json.dumps(list(last_results.get("quantities") or [])),
+        json.dumps(wyniki.columns()),
+    )
+
+
+def _result_from(stored: str | bytes) -> QuoteResult:
+    if isinstance(stored, bytes):
+        # Dawny format: surowe ``array('d')`` w bieżącym układzie kolumn.
+        values = array("d")
+        values.frombytes(stored)
+        if len(values) != len(RESULT_COLUMNS):
+            raise ValueError("nieobsługiwany układ wyniku")
+        return QuoteResult._from_values(values)
+    columns = json.loads(stored)
+    if not isinstance(columns, dict):
+        raise ValueError("wynik nie jest obiektem JSON")
+    return QuoteResult.from_columns(columns)
+
+
+def _entry_from_row(row: tuple) -> JournalEntry | None:
+    """Tworzy wpis z wiersza bazy; ``None`` dla wiersza, którego nie da się odczytać."""
+
+    entry_id, created, client, inputs, margin_rules, quantities, stored = row
+    try:
+        return JournalEntry(
+            id=entry_id,
+            created=created,
+            client=json.loads(client),
+            inputs=json.loads(inputs),
+            margin_rules=json.loads(margin_rules),
+            quantities=json.loads(quantities),
+            wyniki=_result_from(stored),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def _entries(rows: Sequence[tuple]) -> list[JournalEntry]:
+    return [entry for entry in map(_entry_from_row, rows) if entry is not None]
+
+
+def _date_text(value: datetime | str) -> str:
+    return value.strftime(_DATE_FORMAT) if isinstance(value, datetime) else str(value)
+
+
+class QuoteJournal:
+    """Dziennik wycen z zapisem partiami w wątku roboczym.
+
+    ``path`` domyślnie wskazuje plik ``quotes.sqlite3`` w katalogu
+    konfiguracji. Baza jest otwierana dopiero przy pierwszym zapisie lub
+    wyszukiwaniu. Oczekujące zapisy są wykonywane przy :meth:`close`
+    (także przy zakończeniu programu).
+    """
+
+    def __init__(self, path: str | Path | None = None, *, batch_size: int = BATCH_SIZE) -> None:
+        self.path = Path(path) if path is not None else _get_config_dir() / JOURNAL_FILE_NAME
+        self.batch_size = batch_size
+        self._pending: queue.Queue[tuple | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._reader: sqlite3.Connection | None = None
+        self._closed = False
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Zapis
+    # ------------------------------------------------------------------
+    def record(self, last_results: Mapping[str, Any], created: datetime | None = None) -> None:
+        """Kolejkuje zapis wyniku w postaci ``CalculatorTab.last_results``."""
+
+        if self._closed:
+            raise RuntimeError("Dziennik wycen został zamknięty.")
+        self._pending.put(_row_for(last_results, created or datetime.now()))
+        self._ensure_worker()
+
+    def flush(self) -> None:
+        """Czeka, aż wszystkie zakolejkowane wyceny zostaną zapisane."""
+        if self._worker is not None:
+            self._pending.join()
+
+    def close(self) -> None:
+        """Zapisuje oczekujące wyceny i zamyka bazę."""
+
+        if self._closed:
+            return
+        self._closed = True
+        worker = self._worker
+        if worker is not None:
+            self._pending.put(None)
+            worker.join()
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        atexit.unregister(self.close)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="kalkulator-quote-journal", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        import sqlite3
+
+        try:
+            connection: sqlite3.Connection | None = self._connect()
+        except (OSError, sqlite3.Error):
+            # Bez bazy wyceny są liczone jako nieudane, żeby flush()/close() nie czekały.
+            connection = None
+        try:
+            while True:
+                row = self._pending.get()
+                batch = [] if row is None else [row]
+                stop = row is None
+                # Wszystko, co zdążyło się zebrać w kolejce, idzie jedną transakcją.
+                while not stop and len(batch) < self.batch_size:
+                    try:
+                        row = self._pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    if row is None:
+                        stop = True
+                    else:
+                        batch.append(row)
+                if batch and connection is None:
+                    self.failed += len(batch)
+                elif batch:
+                    try:
+                        with connection:
+                            connection.executemany(_INSERT, batch)
+                    except sqlite3.Error:
+                        self.failed += len(batch)
+                    else:
+                        self.written += len(batch)
+                        self.batches += 1
+                for _ in range(len(batch) + stop):
+                    self._pending.task_done()
+                if stop:
+                    return
+        finally:
+            if connection is not None:
+                connection.close()
+
+    # ------------------------------------------------------------------
+    # Wyszukiwanie
+    # ------------------------------------------------------------------
+    def search(
+        self,
+        *,
+        nip: str | None = None,
+        company: str | None = None,
+        dl: float | None = None,
+        sz: float | None = None,
+        wys: float | None = None,
+        tolerance: float = 0.0,
+        wave: str | None = None,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> list[JournalEntry]:
+        """Zwraca najnowsze wyceny spełniające wszystkie podane warunki.
+
+        ``company`` dopasowuje początek nazwy firmy bez względu na wielkość
+        liter, a wymiary są porównywane z tolerancją ``tolerance`` mm.
+        Wyceny jeszcze czekające w kolejce zapisu nie są uwzględniane.
+        """
+
+        conditions: list[str] = []
+        params: list[Any] = []
+        if nip:
+            conditions.append("nip = ?")
+            params.append(normalize_nip(nip))
+        if company:
+            key = _company_key(company)
+            conditions.append("company_key >= ? AND company_key < ?")
+            params.extend((key, key + "\U0010ffff"))
+        for column, value in (("dl", dl), ("sz", sz), ("wys", wys)):
+            if value is not None:
+                conditions.append(f"{column} BETWEEN ? AND ?")
+                params.extend((float(value) - tolerance, float(value) + tolerance))
+        if wave:
+            conditions.append("wave = ?")
+            params.append(wave)
+        if since is not None:
+            conditions.append("created >= ?")
+            params.append(_date_text(since))
+        if until is not None:
+            conditions.append("created <= ?")
+            params.append(_date_text(until))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT {_COLUMNS} FROM quotes{where} ORDER BY created DESC, id DESC LIMIT ?"
+        params.append(int(limit))
+        return _entries(self._read(sql, params))
+
+    def get(self, ids: Sequence[int]) -> list[JournalEntry]:
+        """Zwraca wpisy o podanych identyfikatorach (w kolejności ``ids``)."""
+
+        ids = [int(entry_id) for entry_id in ids]
+        if not ids:
+            return []
+        placeholders = ", ".join("?" * len(ids))
+        rows = self._read(f"SELECT {_COLUMNS} FROM quotes WHERE id IN ({placeholders})", ids)
+        entries = {entry.id: entry for entry in _entries(rows)}
+        return [entries[entry_id] for entry_id in ids if entry_id in entries]
+
+    def dimensions(self, after_id: int = 0) -> list[tuple[int, str, float, float, float]]:
+        """Zwraca ``(id, fala, dl, sz, wys)`` wycen o identyfikatorze większym niż ``after_id``."""
+
+        return self._read(
+            "SELECT id, wave, dl, sz, wys FROM quotes WHERE id > ? ORDER BY id", (int(after_id),)
+        )
+
+    def count(self) -> int:
+        return self._read("SELECT COUNT(*) FROM quotes", ())[0][0]
+
+    def _read(self, sql: str, params: Sequence[Any]) -> list[tuple]:
+        with self._lock:
+            if self._reader is None:
+                self._reader = self._connect(check_same_thread=False)
+            return self._reader.execute(sql, params).fetchall()
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        # sqlite3 ładowany jest dopiero przy pierwszym użyciu dziennika.
+        import sqlite3
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        connection.executescript(_SCHEMA)
+        return connection
+
+
+__all__ = [
+    "JournalEntry",
+    "QuoteJournal",
+    "normalize_nip",
+]
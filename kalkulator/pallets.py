@@ -0,0 +1,417 @@
+"""Układanie formatek na paletach.
+
+Złożone na płasko kartony (formatki ``paletyzacja.dlugosc`` ×
+``paletyzacja.szerokosc``) układane są warstwami. Układ warstwy to
+dwublokowy wzór gilotynowy: część formatek leży wzdłuż palety, reszta
+obrócona o 90° w pozostałym pasie – sprawdzane są wszystkie podziały w obu
+kierunkach. Układ zależy tylko od wymiarów formatki i palety, więc jest
+zapamiętywany (``lru_cache``); we wsadach liczony jest wektorowo raz dla
+każdego unikalnego wymiaru, podobnie jak reszta planu (warstwy, palety, kursy).
+
+Liczba warstw wynika z limitu wysokości ładunku i wysokości jednej sztuki
+oraz z limitu wagi palety. Formatka ``paletyzacja`` to sklejony, złożony na
+płasko karton, więc sztuka w stosie ma grubość dwóch warstw tektury
+(``PalletSettings.plies``). Liczba palet przekłada się na liczbę kursów transportu
+(:func:`transport_trips`), a ta – na łączny koszt transportu w cenniku.
+
+Wysokość palety, liczba palet na aucie i grubości tektury to wartości
+szacunkowe (opisane przy stałych). Można je nadpisać w sekcji ``pallets``
+wspólnej konfiguracji (``ConfigManager.get_pallet_overrides``), a
+:func:`apply_overrides` przenosi je do :class:`PalletSettings`.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import Any, Mapping, NamedTuple, Sequence
+
+from .calculations import WAVE_NAMES
+
+
+class PalletType(NamedTuple):
+    """Wymiary palety [mm], dopuszczalne obciążenie [kg] i liczba palet na aucie."""
+
+    name: str
+    length: float
+    width: float
+    deck_height: float
+    max_load_kg: float
+    per_truck: int
+
+
+# Wymiary i wysokość (144 mm) palety EUR wg EN 13698-1; paleta przemysłowa
+# 1200 × 1000 mm przyjęta z tą samą wysokością. 1500 kg to typowe dopuszczalne
+# obciążenie przy ładunku rozłożonym równomiernie. Liczba palet na aucie
+# dotyczy naczepy 13,6 m przy jednej warstwie palet (33 EUR, 26 przemysłowych)
+# – faktyczny przewoźnik może przyjąć mniej.
+PALLET_TYPES: dict[str, PalletType] = {
+    "EUR": PalletType("EUR", 1200.0, 800.0, 144.0, 1500.0, 33),
+    "przemysłowa": PalletType("przemysłowa", 1200.0, 1000.0, 144.0, 1500.0, 26),
+}
+DEFAULT_PALLET = "EUR"
+# Łączna wysokość palety z ładunkiem.
+DEFAULT_MAX_HEIGHT_MM = 1800.0
+# Warstwy tektury w jednej sztuce stosu: złożony płasko karton to dwie ścianki.
+DEFAULT_PLIES = 2
+
+# Nominalna grubość tektury [mm] dla fal z ``WAVE_NAMES`` – przybliżone
+# wartości katalogowe fal (B ≈ 3 mm, E ≈ 1,5 mm, C ≈ 4 mm); grubość
+# rzeczywistej tektury zależy od producenta i gramatury, dlatego liczba
+# warstw jest szacunkiem.
+BLANK_THICKNESS_MM: dict[str, float] = {
+    "FALA B": 3.0,
+    "FALA E": 1.5,
+    "FALA C+EB": 8.5,
+    "FALA EB+B 203": 7.5,
+    "FALA BC": 7.0,
+    "F203 FALA BC": 7.0,
+    "F200 B+ EB": 7.5,
+    "F200 BC": 7.0,
+}
+
+PALLET_COLUMNS: tuple[str, ...] = (
+    "palety.na_warstwe",
+    "palety.warstwy",
+    "palety.na_palete",
+    "palety.liczba",
+    "palety.kursy",
+    "palety.koszt_transportu",
+)
+
+
+class PalletSettings(NamedTuple):
+    """Ustawienia paletyzacji; ``None`` oznacza wartość domyślną palety lub fali.
+
+    ``thickness_mm`` dotyczy wszystkich fal, a ``thicknesses`` nadpisuje
+    grubość tylko wymienionych fal. ``plies`` to liczba warstw tektury
+    w jednej sztuce stosu (złożony płasko karton – dwie).
+    """
+
+    pallet: str = DEFAULT_PALLET
+    max_height_mm: float = DEFAULT_MAX_HEIGHT_MM
+    max_weight_kg: float | None = None
+    thickness_mm: float | None = None
+    deck_height_mm: float | None = None
+    per_truck: int | None = None
+    thicknesses: Mapping[str, float] | None = None
+    plies: int = DEFAULT_PLIES
+
+
+class LayerPattern(NamedTuple):
+    """Układ jednej warstwy: formatki wzdłuż palety i obrócone."""
+
+    count: int
+    straight: int
+    rotated: int
+
+
+class PalletPlan(NamedTuple):
+    """Plan załadunku zamówienia ``quantity`` sztuk."""
+
+    pallet: str
+    quantity: int
+    per_layer: int
+    straight: int
+    rotated: int
+    layers: int
+    per_pallet: int
+    pallets: int
+    trips: int
+    load_kg: float
+    limited_by: str
+
+
+def pallet_type(name: str) -> PalletType:
+    try:
+        return PALLET_TYPES[name]
+    except KeyError:
+        raise ValueError(f"Nieznany rodzaj palety: {name}") from None
+
+
+def settings_from(value: PalletSettings | Mapping[str, Any] | None) -> PalletSettings:
+    """Zwraca ustawienia z obiektu, słownika (np. z ``last_results``) lub domyślne."""
+
+    if value is None:
+        return PalletSettings()
+    if isinstance(value, PalletSettings):
+        return value
+    return PalletSettings(**{key: value[key] for key in PalletSettings._fields if key in value})
+
+
+def apply_overrides(settings: PalletSettings, overrides: Mapping[str, Any]) -> PalletSettings:
+    """Uzupełnia ustawienia wartościami z sekcji ``pallets`` konfiguracji.
+
+    ``overrides`` ma postać zwracaną przez ``ConfigManager.get_pallet_overrides``:
+    ``deck_height_mm``, ``per_truck`` (słownik rodzaj palety → liczba) i
+    ``thickness_mm`` (słownik fala → grubość). Wartości podane wprost w
+    ``settings`` mają pierwszeństwo.
+    """
+
+    per_truck = (overrides.get("per_truck") or {}).get(settings.pallet)
+    thicknesses = dict(overrides.get("thickness_mm") or {})
+    thicknesses.update(settings.thicknesses or {})
+    return settings._replace(
+        deck_height_mm=(
+            overrides.get("deck_height_mm")
+            if settings.deck_height_mm is None
+            else settings.deck_height_mm
+        ),
+        per_truck=per_truck if settings.per_truck is None else settings.per_truck,
+        thicknesses=thicknesses or None,
+    )
+
+
+def _resolve(settings: PalletSettings) -> PalletType:
+    """Rodzaj palety z uwzględnieniem nadpisanej wysokości i liczby palet na aucie."""
+
+    spec = pallet_type(settings.pallet)
+    if settings.deck_height_mm is not None:
+        spec = spec._replace(deck_height=float(settings.deck_height_mm))
+    if settings.per_truck is not None:
+        spec = spec._replace(per_truck=int(settings.per_truck))
+    return spec
+
+
+@lru_cache(maxsize=4096)
+def _pattern(length: float, width: float, pallet_length: float, pallet_width: float) -> LayerPattern:
+    best = LayerPattern(0, 0, 0)
+    if length <= 0 or width <= 0:
+        return best
+    # Podział wzdłuż długości palety: n kolumn formatek wzdłuż, reszta obrócona.
+    for n in range(int(pallet_length // length) + 1):
+        straight = n * int(pallet_width // width)
+        rest = pallet_length - n * length
+        rotated = int(rest // width) * int(pallet_width // length)
+        if straight + rotated > best.count:
+            best = LayerPattern(straight + rotated, straight, rotated)
+    # Podział wzdłuż szerokości palety: m rzędów formatek wzdłuż, reszta obrócona.
+    for m in range(int(pallet_width // width) + 1):
+        straight = m * int(pallet_length // length)
+        rest = pallet_width - m * width
+        rotated = int(rest // length) * int(pallet_length // width)
+        if straight + rotated > best.count:
+            best = LayerPattern(straight + rotated, straight, rotated)
+    return best
+
+
+def layer_pattern(length: float, width: float, pallet: str = DEFAULT_PALLET) -> LayerPattern:
+    """Największa liczba formatek ``length`` × ``width`` w jednej warstwie palety."""
+
+    spec = pallet_type(pallet)
+    # Zaokrąglenie do 0,01 mm, żeby szum float nie mnożył wpisów w pamięci podręcznej.
+    return _pattern(round(float(length), 2), round(float(width), 2), spec.length, spec.width)
+
+
+def blank_thickness(fala: str, settings: PalletSettings) -> float:
+    if settings.thickness_mm is not None:
+        return settings.thickness_mm
+    if settings.thicknesses and fala in settings.thicknesses:
+        return float(settings.thicknesses[fala])
+    try:
+        return BLANK_THICKNESS_MM[fala]
+    except KeyError:
+        raise ValueError(f"Nieznany rodzaj fali: {fala}") from None
+
+
+def _check(settings: PalletSettings, spec: PalletType, thickness: float) -> None:
+    if thickness <= 0:
+        raise ValueError("Grubość tektury musi być większa od zera.")
+    if settings.plies < 1:
+        raise ValueError("Liczba warstw tektury w sztuce musi być dodatnia.")
+    if spec.deck_height < 0:
+        raise ValueError("Wysokość palety nie może być ujemna.")
+    if settings.max_height_mm <= spec.deck_height:
+        raise ValueError("Maksymalna wysokość musi być większa od wysokości palety.")
+    if spec.per_truck <= 0:
+        raise ValueError("Liczba palet na aucie musi być większa od zera.")
+    if settings.max_weight_kg is not None and settings.max_weight_kg <= 0:
+        raise ValueError("Maksymalna waga musi być większa od zera.")
+
+
+def plan_pallets(
+    wyniki: Mapping[str, Any],
+    quantity: int,
+    fala: str = "FALA B",
+    settings: PalletSettings | Mapping[str, Any] | None = None,
+) -> PalletPlan:
+    """Plan załadunku dla wyniku :func:`oblicz_fale`.
+
+    Formatka, która nie mieści się na palecie (lub za ciężka nawet na jedną
+    warstwę), daje plan z ``per_pallet == 0``, zerem palet i jednym kursem –
+    koszt transportu zostaje wtedy bez zmian.
+    """
+
+    if quantity < 0:
+        raise ValueError("Ilość nie może być ujemna.")
+    settings = settings_from(settings)
+    spec = _resolve(settings)
+    thickness = blank_thickness(fala, settings)
+    _check(settings, spec, thickness)
+    paletyzacja = wyniki["paletyzacja"]
+    pattern = layer_pattern(paletyzacja["dlugosc"], paletyzacja["szerokosc"], spec.name)
+    waga = float(wyniki["waga_kg_na_szt"])
+    max_weight = spec.max_load_kg if settings.max_weight_kg is None else settings.max_weight_kg
+
+    layers = int((settings.max_height_mm - spec.deck_height) // (thickness * settings.plies))
+    limited_by = "wysokość"
+    layer_weight = pattern.count * waga
+    if layer_weight > 0 and max_weight // layer_weight < layers:
+        layers = int(max_weight // layer_weight)
+        limited_by = "waga"
+    per_pallet = pattern.count * layers
+    pallets = math.ceil(quantity / per_pallet) if per_pallet else 0
+    return PalletPlan(
+        pallet=spec.name,
+        quantity=int(quantity),
+        per_layer=pattern.count,
+        straight=pattern.straight,
+        rotated=pattern.rotated,
+        layers=layers,
+        per_pallet=per_pallet,
+        pallets=pallets,
+        trips=transport_trips(pallets, spec.name, spec.per_truck),
+        load_kg=per_pallet * waga,
+        limited_by=limited_by,
+    )
+
+
+def plan_quantities(
+    wyniki: Mapping[str, Any],
+    quantities: Sequence[int],
+    fala: str = "FALA B",
+    settings: PalletSettings | Mapping[str, Any] | None = None,
+) -> list[PalletPlan]:
+    """Plany załadunku dla cennika ilościowego (układ warstwy liczony raz)."""
+
+    return [plan_pallets(wyniki, quantity, fala, settings) for quantity in quantities]
+
+
+def transport_trips(
+    pallets: int, pallet: str = DEFAULT_PALLET, per_truck: int | None = None
+) -> int:
+    """Liczba kursów potrzebnych na ``pallets`` palet (co najmniej jeden)."""
+
+    if per_truck is None:
+        per_truck = pallet_type(pallet).per_truck
+    return max(math.ceil(pallets / per_truck), 1)
+
+
+def _pattern_counts(length: Any, width: Any, pallet_length: float, pallet_width: float) -> Any:
+    """Wektorowa wersja :func:`_pattern` zwracająca same liczby formatek.
+
+    ``np.floor_divide`` liczy tak samo jak ``//`` w :func:`_pattern`
+    (``np.floor(a / b)`` może dać o jeden więcej, gdy iloraz zaokrągli się w górę).
+    """
+
+    import numpy as np
+
+    best = np.zeros(length.shape)
+    valid = (length > 0) & (width > 0)
+    length = np.where(valid, length, np.inf)
+    width = np.where(valid, width, np.inf)
+    for along, across, side, other in (
+        (pallet_length, pallet_width, length, width),
+        (pallet_width, pallet_length, width, length),
+    ):
+        blocks = np.floor_divide(along, side)
+        per_block = np.floor_divide(across, other)
+        rotated_per_row = np.floor_divide(across, side)
+        for n in range(int(blocks.max(initial=0.0)) + 1):
+            rest = along - n * side
+            total = n * per_block + np.floor_divide(rest, other) * rotated_per_row
+            best = np.where(n <= blocks, np.maximum(best, total), best)
+    return best
+
+
+def plan_pallets_batch(
+    fala: Any,
+    dlugosc: Any,
+    szerokosc: Any,
+    waga_kg: Any,
+    quantity: Any,
+    koszt_transportu: Any,
+    settings: PalletSettings | Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Wektorowy odpowiednik :func:`plan_pallets`; zwraca kolumny ``PALLET_COLUMNS``.
+
+    ``fala`` to nazwa jednej fali albo kolumna kodów (indeksów ``WAVE_NAMES``)
+    lub nazw. Układ warstwy liczony jest raz dla każdego unikalnego wymiaru
+    formatki. ``palety.koszt_transportu`` to łączny koszt transportu
+    pomnożony przez liczbę kursów.
+    """
+
+    import numpy as np
+
+    from .batch import wave_codes
+
+    settings = settings_from(settings)
+    spec = _resolve(settings)
+    dlugosc, szerokosc, waga_kg, quantity, koszt_transportu = np.broadcast_arrays(
+        *(
+            np.asarray(value, dtype=np.float64)
+            for value in (dlugosc, szerokosc, waga_kg, quantity, koszt_transportu)
+        )
+    )
+    if quantity.size and quantity.min() < 0:
+        raise ValueError("Ilość nie może być ujemna.")
+    if settings.thickness_mm is not None:
+        thickness = np.full(dlugosc.shape, settings.thickness_mm)
+    else:
+        table = np.array([blank_thickness(name, settings) for name in WAVE_NAMES], dtype=np.float64)
+        codes = wave_codes(fala if not isinstance(fala, str) else [fala])
+        thickness = np.broadcast_to(table[codes], dlugosc.shape)
+    _check(settings, spec, float(thickness.min()) if thickness.size else 1.0)
+    max_weight = spec.max_load_kg if settings.max_weight_kg is None else settings.max_weight_kg
+
+    # Jeden układ warstwy na unikalny wymiar formatki (klucz w setnych mm).
+    keys = np.round(dlugosc.ravel() * 100.0).astype(np.int64) << 32
+    keys |= np.round(szerokosc.ravel() * 100.0).astype(np.int64)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = _pattern_counts(
+        (unique >> 32) / 100.0, (unique & 0xFFFFFFFF) / 100.0, spec.length, spec.width
+    )
+    per_layer = counts[inverse.reshape(-1)].reshape(dlugosc.shape)
+
+    # ``floor_divide`` – ten sam wzór co ``//`` w :func:`plan_pallets`.
+    layers = np.floor_divide(
+        settings.max_height_mm - spec.deck_height, thickness * settings.plies
+    )
+    layer_weight = per_layer * waga_kg
+    with np.errstate(divide="ignore", invalid="ignore"):
+        by_weight = np.where(
+            layer_weight > 0, np.floor_divide(max_weight, layer_weight), np.inf
+        )
+        layers = np.minimum(layers, by_weight)
+        per_pallet = per_layer * layers
+        pallets = np.where(per_pallet > 0, np.ceil(quantity / per_pallet), 0.0)
+    trips = np.maximum(np.ceil(pallets / spec.per_truck), 1.0)
+    return {
+        "palety.na_warstwe": per_layer,
+        "palety.warstwy": layers,
+        "palety.na_palete": per_pallet,
+        "palety.liczba": pallets,
+        "palety.kursy": trips,
+        "palety.koszt_transportu": koszt_transportu * trips,
+    }
+
+
+__all__ = [
+    "BLANK_THICKNESS_MM",
+    "DEFAULT_MAX_HEIGHT_MM",
+    "DEFAULT_PALLET",
+    "DEFAULT_PLIES",
+    "LayerPattern",
+    "PALLET_COLUMNS",
+    "PALLET_TYPES",
+    "PalletPlan",
+    "PalletSettings",
+    "PalletType",
+    "apply_overrides",
+    "layer_pattern",
+    "plan_pallets",
+    "plan_pallets_batch",
+    "plan_quantities",
+    "settings_from",
+    "transport_trips",
+]
@@ -0,0 +1,196 @@
+"""Równoległe przeliczanie dużych wsadów na wielu procesach.
+
+Dane między procesami przesyłane są jako spójne bufory float64 (kolumna po
+kolumnie), a nie jako słowniki wierszy, więc koszt serializacji ogranicza się
+do skopiowania bajtów.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from .batch import oblicz_fale_batch, wave_codes
+from .calculations import RESULT_COLUMNS, WAVE_NAMES, flatten_results
+
+INPUT_COLUMNS: tuple[str, ...] = (
+    "fala",
+    "dl",
+    "sz",
+    "wys",
+    "gramatura",
+    "cena_m2",
+    "dodatkowe_koszty",
+    "stawka_transport",
+    "dystans",
+    "powrot",
+)
+BOOL_COLUMNS = frozenset({"powrot", "transport.powrot"})
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def pack_columns(columns: Mapping[str, Any], names: Sequence[str]) -> bytes:
+    """Składa kolumny w jeden bufor float64 o układzie ``[kolumna][wiersz]``."""
+    return np.stack([np.asarray(columns[name], dtype=np.float64) for name in names]).tobytes()
+
+
+def unpack_columns(buffer: bytes, names: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Odtwarza kolumny z bufora utworzonego przez :func:`pack_columns`."""
+    matrix = np.frombuffer(buffer, dtype=np.float64).reshape(len(names), -1)
+    return {
+        name: matrix[index] != 0.0 if name in BOOL_COLUMNS else matrix[index]
+        for index, name in enumerate(names)
+    }
+
+
+def compute_columns(columns: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    """Liczy wyniki dla kolumn ``INPUT_COLUMNS`` i zwraca spłaszczone kolumny.
+
+    Kolumna ``fala`` zawiera kody fal (indeksy ``WAVE_NAMES``) lub nazwy.
+    """
+    wyniki = oblicz_fale_batch(
+        fala=columns["fala"],
+        dl=columns["dl"],
+        sz=columns["sz"],
+        wys=columns["wys"],
+        gramatura=columns["gramatura"],
+        cena_m2=columns["cena_m2"],
+        dodatkowe_koszty=columns["dodatkowe_koszty"],
+        stawka_transport_km=columns["stawka_transport"],
+        dystans_km=columns["dystans"],
+        transport_powrot=columns["powrot"],
+    )
+    return dict(flatten_results(wyniki))
+
+
+def _compute_packed(buffer: bytes) -> bytes:
+    """Zadanie procesu roboczego: bufor wejściowy -> bufor wyników."""
+    return pack_columns(compute_columns(unpack_columns(buffer, INPUT_COLUMNS)), RESULT_COLUMNS)
+
+
+def iter_parallel(
+    chunks: Iterable[Mapping[str, Any]], workers: int | None = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Liczy kolejne porcje kolumn i zwraca wyniki w kolejności wejścia.
+
+    Przy ``workers > 1`` porcje trafiają do puli procesów; w locie jest
+    najwyżej ``2 * workers`` porcji, więc wejście może być dowolnie długie.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for chunk in chunks:
+            yield compute_columns(chunk)
+        return
+
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(workers) as executor:
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(_compute_packed, pack_columns(chunk, INPUT_COLUMNS)))
+                if len(pending) >= 2 * workers:
+                    yield unpack_columns(pending.popleft().result(), RESULT_COLUMNS)
+            while pending:
+                yield unpack_columns(pending.popleft().result(), RESULT_COLUMNS)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def oblicz_fale_parallel(
+    columns: Mapping[str, Any],
+    *,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, np.ndarray]:
+    """Przelicza całe kolumny wejściowe, dzieląc je na porcje między procesy.
+
+    Klucze wejściowe to ``INPUT_COLUMNS`` (brak ``fala`` oznacza "FALA B"); wynik to spłaszczone kolumny
+    ``RESULT_COLUMNS`` w kolejności wierszy wejściowych.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("Rozmiar porcji musi być dodatni.")
+    inputs = dict(columns)
+    inputs["fala"] = wave_codes(columns.get("fala", "FALA B"))
+    arrays = dict(
+        zip(
+            INPUT_COLUMNS,
+            np.broadcast_arrays(*(np.asarray(inputs[name], dtype=np.float64) for name in INPUT_COLUMNS)),
+        )
+    )
+    total = arrays["dl"].size
+    chunks = (
+        {name: values[start : start + chunk_size] for name, values in arrays.items()}
+        for start in range(0, total, chunk_size)
+    )
+    parts = list(iter_parallel(chunks, workers=workers))
+    if not parts:
+        return compute_columns(arrays)
+    return {name: np.concatenate([part[name] for part in parts]) for name in RESULT_COLUMNS}
+
+
+def sample_columns(rows: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Generuje powtarzalny zestaw danych wejściowych do pomiarów."""
+    rng = np.random.default_rng(seed)
+    return {
+        "fala": rng.integers(0, len(WAVE_NAMES), rows),
+        "dl": rng.integers(100, 1200, rows) + rng.integers(0, 2, rows) * 0.5,
+        "sz": rng.integers(80, 800, rows).astype(np.float64),
+        "wys": rng.integers(40, 600, rows).astype(np.float64),
+        "gramatura": rng.choice([390.0, 450.0, 520.0, 610.0], rows),
+        "cena_m2": rng.uniform(1.2, 4.5, rows).round(4),
+        "dodatkowe_koszty": rng.choice([0.0, 50.0, 120.0], rows),
+        "stawka_transport": rng.uniform(2.0, 6.0, rows).round(2),
+        "dystans": rng.integers(0, 600, rows).astype(np.float64),
+        "powrot": rng.integers(0, 2, rows).astype(bool),
+    }
+
+
+def measure_scaling(
+    rows: int = 1_000_000,
+    worker_counts: Sequence[int] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = 0,
+) -> list[dict[str, float]]:
+    """Mierzy przepustowość dla różnych liczb procesów.
+
+    Zwraca listę słowników z kluczami ``workers``, ``seconds``,
+    ``rows_per_second`` i ``speedup`` (względem pierwszej pozycji).
+    """
+
+    if worker_counts is None:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+    columns = sample_columns(rows, seed=seed)
+    report: list[dict[str, float]] = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        oblicz_fale_parallel(columns, workers=workers, chunk_size=chunk_size)
+        seconds = time.perf_counter() - start
+        report.append(
+            {
+                "workers": workers,
+                "seconds": seconds,
+                "rows_per_second": rows / seconds if seconds else float("inf"),
+                "speedup": report[0]["seconds"] / seconds if report and seconds else 1.0,
+            }
+        )
+    return report
+
+
+__all__ = [
+    "INPUT_COLUMNS",
+    "compute_columns",
+    "iter_parallel",
+    "measure_scaling",
+    "oblicz_fale_parallel",
+    "pack_columns",
+    "sample_columns",
+    "unpack_columns",
+]
@@ -0,0 +1,250 @@
+"""Wycena zamówienia na podstawie progów marży.
+
+Progi (``max_quantity``/``margin_percent`` z ``ConfigManager``) są
+kompilowane do posortowanego indeksu, w którym próg dla danej ilości
+wyszukiwany jest binarnie. Obowiązuje pierwszy próg o ``max_quantity``
+nie mniejszym od ilości; powyżej ostatniego progu stosowana jest jego marża.
+
+Koszt jednostkowy zamówienia ``n`` sztuk to koszt materiału na sztukę plus
+koszty partii (``koszty_dodatkowe`` i łączny koszt transportu) rozłożone na
+``n`` sztuk. Cena jednostkowa to koszt jednostkowy powiększony o marżę.
+:func:`price_table` zwraca taki rozkład dla całej listy ilości (cennik).
+Opcjonalna liczba kursów (``transport_trips``, zob. :mod:`kalkulator.pallets`)
+mnoży łączny koszt transportu dla danej ilości.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, NamedTuple, Sequence
+
+# Typowe ilości, o które pytają klienci.
+DEFAULT_QUANTITY_LADDER = (100, 300, 500, 1000, 2000, 5000, 10000)
+MAX_LADDER_LENGTH = 50
+_QUANTITY_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+class PriceQuote(NamedTuple):
+    """Wycena dla jednej ilości."""
+
+    quantity: int
+    tier: int | None
+    max_quantity: int | None
+    margin_percent: float
+    material_cost: float
+    extra_cost: float
+    transport_cost: float
+    unit_cost: float
+    unit_price: float
+    total_price: float
+
+
+class MarginIndex:
+    """Posortowane progi marży z wyszukiwaniem binarnym."""
+
+    __slots__ = ("limits", "margins")
+
+    def __init__(self, rules: Iterable[Mapping[str, Any]]) -> None:
+        pairs = sorted(
+            (int(rule["max_quantity"]), float(rule["margin_percent"])) for rule in rules
+        )
+        self.limits: tuple[int, ...] = tuple(limit for limit, _ in pairs)
+        self.margins: tuple[float, ...] = tuple(margin for _, margin in pairs)
+
+    def __len__(self) -> int:
+        return len(self.limits)
+
+    def tier(self, quantity: float) -> int | None:
+        """Indeks progu obowiązującego dla ``quantity`` (``None`` bez progów)."""
+
+        if not self.limits:
+            return None
+        return min(bisect_left(self.limits, quantity), len(self.limits) - 1)
+
+    def margin(self, quantity: float) -> float:
+        index = self.tier(quantity)
+        return 0.0 if index is None else self.margins[index]
+
+    def tiers(self, quantities: Any) -> Any:
+        """Wektorowy odpowiednik :meth:`tier` (tablica indeksów, -1 bez progów)."""
+
+        import numpy as np
+
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if not self.limits:
+            return np.full(quantities.shape, -1, dtype=np.intp)
+        index = np.searchsorted(np.asarray(self.limits, dtype=np.float64), quantities)
+        return np.minimum(index, len(self.limits) - 1)
+
+
+@lru_cache(maxsize=32)
+def _compiled(key: tuple[tuple[int, float], ...]) -> MarginIndex:
+    return MarginIndex({"max_quantity": limit, "margin_percent": margin} for limit, margin in key)
+
+
+def compile_margin_rules(rules: Iterable[Mapping[str, Any]] | MarginIndex) -> MarginIndex:
+    """Zwraca indeks progów; ten sam zestaw reguł kompilowany jest raz."""
+
+    if isinstance(rules, MarginIndex):
+        return rules
+    key = tuple(
+        sorted((int(rule["max_quantity"]), float(rule["margin_percent"])) for rule in rules)
+    )
+    return _compiled(key)
+
+
+def order_costs(wyniki: Mapping[str, Any]) -> tuple[float, float, float]:
+    """Zwraca (koszt materiału/szt., koszty dodatkowe partii, koszt transportu)."""
+
+    return (
+        float(wyniki["koszt_mat_na_szt"]),
+        float(wyniki["koszty_dodatkowe"]),
+        float(wyniki["transport"]["koszt_calkowity"]),
+    )
+
+
+def price_quote(
+    wyniki: Mapping[str, Any],
+    quantity: int,
+    margin_rules: Iterable[Mapping[str, Any]] | MarginIndex,
+    transport_trips: int = 1,
+) -> PriceQuote:
+    """Wycenia zamówienie ``quantity`` sztuk dla wyniku :func:`oblicz_fala_b`."""
+
+    if quantity <= 0:
+        raise ValueError("Ilość musi być większa od zera.")
+    index = compile_margin_rules(margin_rules)
+    material, extra, transport = order_costs(wyniki)
+    extra_cost = extra / quantity
+    transport_cost = transport * transport_trips / quantity
+    unit_cost = material + extra_cost + transport_cost
+    tier = index.tier(quantity)
+    margin = 0.0 if tier is None else index.margins[tier]
+    unit_price = unit_cost * (1.0 + margin / 100.0)
+    return PriceQuote(
+        quantity=int(quantity),
+        tier=tier,
+        max_quantity=None if tier is None else index.limits[tier],
+        margin_percent=margin,
+        material_cost=material,
+        extra_cost=extra_cost,
+        transport_cost=transport_cost,
+        unit_cost=unit_cost,
+        unit_price=unit_price,
+        total_price=unit_price * quantity,
+    )
+
+
+def price_ladder(
+    wyniki: Mapping[str, Any],
+    quantities: Sequence[int] = DEFAULT_QUANTITY_LADDER,
+    margin_rules: Iterable[Mapping[str, Any]] | MarginIndex = (),
+    transport_trips: Sequence[int] | None = None,
+) -> dict[str, Any]:
+    """Wycenia wiele ilości naraz; zwraca kolumny NumPy zgodne z :class:`PriceQuote`.
+
+    Kolumna ``tier`` zawiera -1, gdy nie zdefiniowano żadnych progów, a
+    ``max_quantity`` ma wtedy wartość 0. ``transport_trips`` podaje liczbę
+    kursów dla każdej ilości (domyślnie jeden).
+    """
+
+    import numpy as np
+
+    index = compile_margin_rules(margin_rules)
+    quantity = np.asarray(quantities, dtype=np.int64)
+    if quantity.size and quantity.min() <= 0:
+        raise ValueError("Ilość musi być większa od zera.")
+    material, extra, transport = order_costs(wyniki)
+    extra_cost = extra / quantity
+    if transport_trips is not None:
+        transport = transport * np.asarray(transport_trips, dtype=np.float64)
+    transport_cost = transport / quantity
+    unit_cost = material + extra_cost + transport_cost
+    tier = index.tiers(quantity)
+    if len(index):
+        margin = np.asarray(index.margins, dtype=np.float64)[tier]
+        max_quantity = np.asarray(index.limits, dtype=np.int64)[tier]
+    else:
+        margin = np.zeros(quantity.shape)
+        max_quantity = np.zeros(quantity.shape, dtype=np.int64)
+    unit_price = unit_cost * (1.0 + margin / 100.0)
+    return {
+        "quantity": quantity,
+        "tier": tier,
+        "max_quantity": max_quantity,
+        "margin_percent": margin,
+        "material_cost": np.full(quantity.shape, material),
+        "extra_cost": extra_cost,
+        "transport_cost": transport_cost,
+        "unit_cost": unit_cost,
+        "unit_price": unit_price,
+        "total_price": unit_price * quantity,
+    }
+
+
+def price_table(
+    wyniki: Mapping[str, Any],
+    quantities: Sequence[int] = DEFAULT_QUANTITY_LADDER,
+    margin_rules: Iterable[Mapping[str, Any]] | MarginIndex = (),
+    transport_trips: Sequence[int] | None = None,
+) -> list[PriceQuote]:
+    """Cennik ilościowy: jeden :class:`PriceQuote` na każdą ilość.
+
+    Z NumPy cały cennik liczony jest jednym przebiegiem :func:`price_ladder`;
+    bez niego – kolejnymi wywołaniami :func:`price_quote` (wynik jest ten sam).
+    """
+
+    index = compile_margin_rules(margin_rules)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:  # pragma: no cover - NumPy jest opcjonalny
+        trips = transport_trips if transport_trips is not None else [1] * len(quantities)
+        return [
+            price_quote(wyniki, quantity, index, trip)
+            for quantity, trip in zip(quantities, trips)
+        ]
+
+    columns = price_ladder(wyniki, quantities, index, transport_trips)
+    rows = zip(*(columns[name].tolist() for name in PriceQuote._fields))
+    return [
+        quote._replace(tier=None, max_quantity=None) if quote.tier < 0 else quote
+        for quote in (PriceQuote._make(row) for row in rows)
+    ]
+
+
+def parse_quantities(text: str) -> list[int]:
+    """Parsuje listę ilości wpisaną np. jako ``"100, 300; 500 1000"``.
+
+    Zwraca posortowane ilości bez powtórzeń.
+    """
+
+    quantities = set()
+    for part in _QUANTITY_SEPARATORS.split(text.strip()):
+        if not part:
+            continue
+        try:
+            value = int(part)
+        except ValueError:
+            raise ValueError(f"Nieprawidłowa ilość: {part}") from None
+        if value <= 0:
+            raise ValueError("Ilość musi być większa od zera.")
+        quantities.add(value)
+    if len(quantities) > MAX_LADDER_LENGTH:
+        raise ValueError(f"Cennik może zawierać najwyżej {MAX_LADDER_LENGTH} ilości.")
+    return sorted(quantities)
+
+
+__all__ = [
+    "DEFAULT_QUANTITY_LADDER",
+    "MAX_LADDER_LENGTH",
+    "MarginIndex",
+    "PriceQuote",
+    "compile_margin_rules",
+    "order_costs",
+    "parse_quantities",
+    "price_ladder",
+    "price_quote",
+    "price_table",
+]
@@ -0,0 +1,314 @@
+"""Kolejka wydruków działająca w tle.
+
+Budowanie dokumentu i wysyłanie go do drukarki odbywa się w wątku roboczym,
+więc okno aplikacji nie zamarza podczas spoolowania. Zmiany stanu zadań są
+przekazywane do wątku Tk przez kolejkę zdarzeń odczytywaną w ``after()``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+CLEANUP_DELAY = 10.0
+POLL_INTERVAL_MS = 100
+
+StatusCallback = Callable[["PrintJob", str], None]
+
+
+class PrintJob:
+    """Stan pojedynczego zadania wydruku."""
+
+    __slots__ = (
+        "job_id",
+        "description",
+        "producer",
+        "stream",
+        "suffix",
+        "callback",
+        "retries",
+        "status",
+        "attempts",
+        "error",
+        "result",
+    )
+
+    def __init__(
+        self,
+        job_id: int,
+        producer: Callable[..., Any],
+        *,
+        stream: bool,
+        suffix: str,
+        description: str,
+        callback: StatusCallback | None,
+        retries: int,
+    ) -> None:
+        self.job_id = job_id
+        self.description = description
+        self.producer = producer
+        self.stream = stream
+        self.suffix = suffix
+        self.callback = callback
+        self.retries = retries
+        self.status = QUEUED
+        self.attempts = 0
+        self.error: Exception | None = None
+        self.result: Any = None
+
+    def __repr__(self) -> str:
+        return f"PrintJob({self.job_id}, {self.status!r}, {self.description!r})"
+
+
+class PrintQueue:
+    """Kolejka zadań wydruku obsługiwana przez jeden wątek roboczy.
+
+    ``producer`` zadania zwraca gotowe bajty dokumentu (albo, przy
+    ``stream=True``, sam zapisuje je do podanego pliku binarnego) i jest
+    wywoływany w wątku roboczym. Jeśli system ma spooler czytający stdin
+    (``lpr``/``lp``), dokument trafia do niego potokiem bez pliku
+    tymczasowego; ``callback(job, status)`` otrzymuje każdą zmianę stanu
+    (w wątku Tk po :meth:`attach_tk`, w przeciwnym razie w wątku roboczym).
+    Pliki tymczasowe usuwa po ``cleanup_delay`` sekundach (czas na odczyt
+    przez Adobe Reader/spooler) wspólny ``printing.temp_file_cleaner``,
+    a pozostałe – :meth:`close` lub zakończenie programu.
+    """
+
+    def __init__(
+        self,
+        *,
+        cleanup_delay: float = CLEANUP_DELAY,
+        sender: Callable[..., None] | None = None,
+        spooler: Callable[[], list[str] | None] | None = None,
+    ) -> None:
+        # Domyślne ``sender``/``spooler`` pochodzą z modułu ``printing``,
+        # ładowanego dopiero przy pierwszym zadaniu.
+        self.cleanup_delay = cleanup_delay
+        self._sender = sender
+        self._spooler = spooler
+        self._jobs: Dict[int, PrintJob] = {}
+        self._ids = itertools.count(1)
+        self._pending: queue.Queue[PrintJob | None] = queue.Queue()
+        self._events: queue.Queue[tuple[StatusCallback, PrintJob, str]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._closed = False
+        self._tk_widget: Any = None
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # API zadań
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        producer: Callable[..., Any],
+        *,
+        stream: bool = False,
+        suffix: str = ".pdf",
+        description: str = "",
+        callback: StatusCallback | None = None,
+        retries: int = 0,
+    ) -> int:
+        """Dodaje zadanie do kolejki i zwraca jego identyfikator."""
+
+        if self._closed:
+            from .printing import PrinterError
+
+            raise PrinterError("Kolejka wydruków została zamknięta.")
+        with self._lock:
+            job = PrintJob(
+                next(self._ids),
+                producer,
+                stream=stream,
+                suffix=suffix,
+                description=description,
+                callback=callback,
+                retries=retries,
+            )
+            self._jobs[job.job_id] = job
+        self._ensure_worker()
+        self._notify(job)
+        self._pending.put(job)
+        return job.job_id
+
+    def cancel(self, job_id: int) -> bool:
+        """Anuluje zadanie oczekujące w kolejce.
+
+        Zadania już wysyłanego do drukarki nie da się przerwać – wtedy
+        zwracane jest ``False``.
+        """
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            job.status = CANCELLED
+        self._notify(job)
+        return True
+
+    def retry(self, job_id: int) -> bool:
+        """Ponownie kolejkuje zadanie zakończone błędem lub anulowane."""
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in (FAILED, CANCELLED):
+                return False
+            job.status = QUEUED
+            job.error = None
+        self._ensure_worker()
+        self._notify(job)
+        self._pending.put(job)
+        return True
+
+    def status(self, job_id: int) -> str | None:
+        job = self._jobs.get(job_id)
+        return job.status if job is not None else None
+
+    def jobs(self) -> list[PrintJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Czeka, aż kolejka zostanie opróżniona (przydatne bez Tk)."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                busy = any(job.status in (QUEUED, RUNNING) for job in self._jobs.values())
+            if not busy:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        """Kończy wątek roboczy i usuwa wszystkie pozostałe pliki tymczasowe."""
+
+        if self._closed:
+            return
+        self._closed = True
+        worker = self._worker
+        if worker is not None:
+            self._pending.put(None)
+            worker.join(timeout=5.0)
+        # Bez zadań moduł ``printing`` mógł nie zostać załadowany.
+        printing = sys.modules.get(__package__ + ".printing")
+        if printing is not None:
+            printing.temp_file_cleaner.remove_all()
+
+    # ------------------------------------------------------------------
+    # Integracja z Tk
+    # ------------------------------------------------------------------
+    def attach_tk(self, widget: Any, interval_ms: int = POLL_INTERVAL_MS) -> None:
+        """Przekazuje wywołania zwrotne do wątku Tk przez ``widget.after()``."""
+
+        self._tk_widget = widget
+
+        def poll() -> None:
+            self.dispatch_events()
+            if not self._closed:
+                widget.after(interval_ms, poll)
+
+        widget.after(interval_ms, poll)
+
+    def dispatch_events(self) -> None:
+        """Wywołuje oczekujące wywołania zwrotne w bieżącym wątku."""
+
+        while True:
+            try:
+                callback, job, status = self._events.get_nowait()
+            except queue.Empty:
+                return
+            callback(job, status)
+
+    # ------------------------------------------------------------------
+    # Wątek roboczy
+    # ------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="kalkulator-print-queue", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._pending.get()
+            if job is None:
+                return
+            self._process(job)
+
+    def _process(self, job: PrintJob) -> None:
+        from . import printing
+
+        with self._lock:
+            if job.status != QUEUED:
+                return
+            job.status = RUNNING
+            job.attempts += 1
+        self._notify(job)
+
+        try:
+            if job.stream:
+                write = job.producer
+            else:
+                content = job.producer()
+                write = lambda target: target.write(content)  # noqa: E731
+            result = printing._spool(
+                write,
+                job.suffix,
+                command=(self._spooler or printing._spooler_command)(),
+                sender=self._sender or printing._send_to_printer,
+                use_adobe_reader=job.suffix == ".pdf",
+                cleanup_delay=self.cleanup_delay,
+            )
+        except Exception as exc:
+            error = exc
+        else:
+            error = None
+
+        with self._lock:
+            if error is None:
+                job.status = DONE
+                job.result = result
+            elif job.attempts <= job.retries:
+                job.status = QUEUED
+                job.error = error
+            else:
+                job.status = FAILED
+                job.error = error
+        self._notify(job)
+        if job.status == QUEUED:
+            self._pending.put(job)
+
+    def _notify(self, job: PrintJob) -> None:
+        if job.callback is None:
+            return
+        if self._tk_widget is None:
+            job.callback(job, job.status)
+        else:
+            self._events.put((job.callback, job, job.status))
+
+
+__all__ = [
+    "CANCELLED",
+    "DONE",
+    "FAILED",
+    "PrintJob",
+    "PrintQueue",
+    "QUEUED",
+    "RUNNING",
+]
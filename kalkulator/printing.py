@@ -2,15 +2,37 @@
 
 from __future__ import annotations
 
+import atexit
+import heapq
+import io
+import itertools
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
 import threading
+import time
 import unicodedata
+import zlib
+from array import array
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterable, NamedTuple, Sequence, TypeVar
+
+from .config import DEFAULT_PDF_COMPRESSION_LEVEL
+from .pallets import plan_quantities
+from .pricing import price_table
+
+T = TypeVar("T")
+
+# Czas (sekundy), po którym plik tymczasowy wydruku jest usuwany – Adobe
+# Reader/spooler musi zdążyć go odczytać.
+CLEANUP_DELAY = 10.0
+
+# Próg (bajty), do którego wyrenderowany wydruk czekający na spooler jest
+# trzymany w pamięci; większy dokument trafia do pliku tymczasowego.
+SPOOL_MEMORY_LIMIT = 8 * 1024 * 1024
 
 
 class PrinterError(RuntimeError):
@@ -172,16 +194,39 @@ def build_summary_sections(
         )
     )
 
+    quantities = last_results.get("quantities")
+    plans = []
+    if quantities and wyniki and last_results.get("pallet"):
+        try:
+            plans = plan_quantities(
+                wyniki, quantities, inputs.get("fala", "FALA B"), last_results["pallet"]
+            )
+        except ValueError:
+            plans = []
+
     paletyzacja = wyniki.get("paletyzacja", {})
-    sections.append(
-        (
-            "Paletyzacja",
-            [
-                ("Długość paletyzacyjna [mm]", fmt(paletyzacja.get("dlugosc"))),
-                ("Szerokość paletyzacyjna [mm]", fmt(paletyzacja.get("szerokosc"))),
-            ],
-        )
-    )
+    pallet_rows = [
+        ("Długość paletyzacyjna [mm]", fmt(paletyzacja.get("dlugosc"))),
+        ("Szerokość paletyzacyjna [mm]", fmt(paletyzacja.get("szerokosc"))),
+    ]
+    if plans:
+        plan = plans[0]
+        pallet_rows.append(("Paleta", plan.pallet))
+        if plan.per_pallet:
+            pallet_rows.extend(
+                [
+                    (
+                        "Formatek na warstwę",
+                        f"{plan.per_layer} ({plan.straight} wzdłuż + {plan.rotated} obrócone)",
+                    ),
+                    ("Warstw na paletę", f"{plan.layers} (ogranicza {plan.limited_by})"),
+                    ("Formatek na paletę", str(plan.per_pallet)),
+                    ("Waga palety [kg]", fmt(plan.load_kg, 1)),
+                ]
+            )
+        else:
+            pallet_rows.append(("Formatek na paletę", "formatka się nie mieści"))
+    sections.append(("Paletyzacja", pallet_rows))
 
     transport = wyniki.get("transport", {})
     sections.append(
@@ -244,65 +289,343 @@ def build_summary_sections(
         )
     )
 
+    if quantities and wyniki:
+        trips = [plan.trips for plan in plans] if plans else None
+        for index, quote in enumerate(price_table(wyniki, quantities, margin_rules or [], trips)):
+            if quote.max_quantity is None:
+                tier_text = "brak progów"
+            else:
+                tier_text = f"do {quote.max_quantity} szt. - {quote.margin_percent:.2f} %"
+            rows = [
+                ("Materiał/szt. [zł]", fmt(quote.material_cost, 4)),
+                ("Koszty dodatkowe/szt. [zł]", fmt(quote.extra_cost, 4)),
+                ("Transport/szt. [zł]", fmt(quote.transport_cost, 4)),
+            ]
+            if plans and plans[index].per_pallet:
+                rows.append(
+                    ("Palety (kursy transportu)", f"{plans[index].pallets} ({plans[index].trips})")
+                )
+            rows.extend(
+                [
+                    ("Koszt jednostkowy [zł]", fmt(quote.unit_cost, 4)),
+                    ("Próg marży", tier_text),
+                    ("Cena jednostkowa [zł]", fmt(quote.unit_price, 4)),
+                    ("Wartość zamówienia [zł]", fmt(quote.total_price)),
+                ]
+            )
+            sections.append((f"Cennik {quote.quantity} szt.", rows))
+
     return sections
 
 
 def build_summary_pdf(
     last_results: dict[str, Any],
     fallback_margin_rules: list[dict[str, float]] | None = None,
+    *,
+    compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+    object_streams: bool = False,
 ) -> bytes:
-    """Tworzy plik PDF z podsumowaniem kalkulacji."""
+    """Tworzy plik PDF z podsumowaniem kalkulacji.
+
+    ``compression_level`` (0–9) steruje kompresją strumieni treści
+    (0 – bez kompresji), a ``object_streams`` włącza strumienie obiektów PDF 1.5.
+    """
 
     sections = build_summary_sections(
         last_results,
         fallback_margin_rules=fallback_margin_rules,
     )
 
-    pdf = _SummaryPDFBuilder()
+    pdf = _SummaryPDFBuilder(
+        compression_level=compression_level, object_streams=object_streams
+    )
     pdf.add_title("Kalkulator Rekruso — podsumowanie")
     for section_name, rows in sections:
         pdf.add_section(section_name, rows)
     return pdf.render()
 
 
+class QuotePages(NamedTuple):
+    """Położenie jednej kalkulacji w dokumencie zbiorczym."""
+
+    index: int
+    first_page: int | None
+    last_page: int | None
+    error: str | None = None
+
+
+def write_quote_book(
+    results: Iterable[dict[str, Any]],
+    target: BinaryIO,
+    fallback_margin_rules: list[dict[str, float]] | None = None,
+    *,
+    compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+    object_streams: bool = False,
+) -> list[tuple[int, int]]:
+    """Zapisuje wiele kalkulacji jako jeden dokument PDF do pliku binarnego.
+
+    Strony trafiają do ``target`` na bieżąco, więc zużycie pamięci nie
+    zależy od liczby kalkulacji. Każda kalkulacja zaczyna się na nowej
+    stronie; zwracane są zakresy stron (numerowane od 1) kolejnych kalkulacji.
+    """
+
+    pdf = _StreamingPDFWriter(
+        target, compression_level=compression_level, object_streams=object_streams
+    )
+    pages = _write_quotes(pdf, results, fallback_margin_rules, skip_invalid=False)
+    pdf.close()
+    return [(entry.first_page, entry.last_page) for entry in pages]  # type: ignore[misc]
+
+
+def print_summary_batch(
+    results: Iterable[dict[str, Any]],
+    fallback_margin_rules: list[dict[str, float]] | None = None,
+    *,
+    compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+) -> list[QuotePages]:
+    """Drukuje wiele kalkulacji jako jeden dokument i jedno zadanie wydruku.
+
+    Kalkulacje bez danych są pomijane i zgłaszane w polu ``error``;
+    pozostałe otrzymują zakres stron w dokumencie zbiorczym.
+    """
+
+    records = list(results)
+    if not any(records):
+        raise ValueError("Brak danych do wydruku. Najpierw wykonaj obliczenia.")
+    return print_pdf_stream(
+        lambda target: write_quote_pages(
+            records,
+            target,
+            fallback_margin_rules,
+            compression_level=compression_level,
+        )
+    )
+
+
+def write_quote_pages(
+    results: Iterable[dict[str, Any]],
+    target: BinaryIO,
+    fallback_margin_rules: list[dict[str, float]] | None = None,
+    *,
+    compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+) -> list[QuotePages]:
+    """Jak :func:`write_quote_book`, ale pomija kalkulacje bez danych.
+
+    Dla każdej kalkulacji zwraca :class:`QuotePages` z zakresem stron albo
+    opisem błędu.
+    """
+
+    pdf = _StreamingPDFWriter(target, compression_level=compression_level)
+    pages = _write_quotes(pdf, results, fallback_margin_rules, skip_invalid=True)
+    pdf.close()
+    return pages
+
+
+def _write_quotes(
+    pdf: "_StreamingPDFWriter",
+    results: Iterable[dict[str, Any]],
+    fallback_margin_rules: list[dict[str, float]] | None,
+    *,
+    skip_invalid: bool,
+) -> list[QuotePages]:
+    pages: list[QuotePages] = []
+    for index, last_results in enumerate(results):
+        try:
+            sections = build_summary_sections(
+                last_results,
+                fallback_margin_rules=fallback_margin_rules,
+            )
+        except ValueError as exc:
+            if not skip_invalid:
+                raise
+            pages.append(QuotePages(index, None, None, str(exc)))
+            continue
+        pdf.page_break()
+        first_page = pdf.page_number
+        pdf.add_title("Kalkulator Rekruso — podsumowanie")
+        for section_name, rows in sections:
+            pdf.add_section(section_name, rows)
+        pages.append(QuotePages(index, first_page, pdf.page_number))
+    return pages
+
+
 def print_text_document(
     content: str, suffix: str = ".txt", *, prefer_notepad: bool = False
 ) -> None:
-    """Zapisuje treść do pliku tymczasowego i wysyła go na drukarkę."""
+    """Wysyła tekst na drukarkę – potokiem do spoolera lub przez plik tymczasowy."""
 
-    temp_path: Path | None = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            "w", delete=False, encoding="utf-8", suffix=suffix
-        ) as temp_file:
-            temp_file.write(content)
-            temp_path = Path(temp_file.name)
-    except OSError as exc:
-        raise PrinterError("Nie udało się przygotować pliku do wydruku.") from exc
+    data = _encode_text(content)
+    _print_stream(lambda target: target.write(data), suffix=suffix, prefer_notepad=prefer_notepad)
+
+
+def print_pdf_document(content: bytes) -> None:
+    """Drukuje dokument PDF – potokiem do ``lpr``/``lp`` lub przez Adobe Reader."""
+
+    _print_stream(lambda target: target.write(content), suffix=".pdf", use_adobe_reader=True)
+
+
+def print_pdf_stream(write: Callable[[BinaryIO], T]) -> T:
+    """Drukuje PDF zapisywany strumieniowo przez ``write(target)``.
+
+    Tam, gdzie to możliwe (``lpr``/``lp``), dokument trafia do spoolera przez
+    standardowe wejście; w pamięci trzymane jest najwyżej
+    :data:`SPOOL_MEMORY_LIMIT` bajtów, reszta w pliku tymczasowym, np.
+    ``print_pdf_stream(lambda out: write_quote_book(wyniki, out))``.
+    Zwraca wynik ``write``.
+    """
+
+    return _print_stream(write, suffix=".pdf", use_adobe_reader=True)
+
+
+def _print_stream(
+    write: Callable[[BinaryIO], T],
+    *,
+    suffix: str,
+    use_adobe_reader: bool = False,
+    prefer_notepad: bool = False,
+) -> T:
+    return _spool(
+        write,
+        suffix,
+        command=_spooler_command(),
+        sender=_send_to_printer,
+        use_adobe_reader=use_adobe_reader,
+        prefer_notepad=prefer_notepad,
+    )
+
+
+def _spool(
+    write: Callable[[BinaryIO], T],
+    suffix: str,
+    *,
+    command: list[str] | None,
+    sender: Callable[..., None],
+    use_adobe_reader: bool = False,
+    prefer_notepad: bool = False,
+    cleanup_delay: float = CLEANUP_DELAY,
+) -> T:
+    """Wysyła dokument potokiem do ``command``, a w razie błędu przez plik tymczasowy.
+
+    ``write`` jest wywoływane dokładnie raz – dokument renderowany jest do
+    :class:`tempfile.SpooledTemporaryFile`, z którego kopiowany jest do
+    spoolera, a gdy ten go odrzuci, do pliku tymczasowego przekazywanego do
+    ``sender``. Plik usuwa :data:`temp_file_cleaner` po ``cleanup_delay``
+    sekundach.
+    """
+
+    if command is None:
+        temp_path, result = _write_temp_stream(write, suffix)
+    else:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT) as buffer:
+            try:
+                result = write(buffer)  # type: ignore[arg-type]
+            except OSError as exc:
+                raise PrinterError("Nie udało się przygotować dokumentu do wydruku.") from exc
+
+            def replay(target: BinaryIO) -> None:
+                buffer.seek(0)
+                shutil.copyfileobj(buffer, target)
+
+            try:
+                _pipe_to_spooler(command, replay)
+                return result
+            except PrinterError:
+                # Np. ``lpr`` bez skonfigurowanej kolejki – druga próba przez plik.
+                pass
+            temp_path = _write_temp_stream(replay, suffix)[0]
 
     try:
-        _send_to_printer(temp_path, prefer_notepad=prefer_notepad)
+        sender(temp_path, use_adobe_reader=use_adobe_reader, prefer_notepad=prefer_notepad)
     finally:
-        if temp_path is not None:
-            _schedule_cleanup(temp_path)
+        temp_file_cleaner.schedule(temp_path, cleanup_delay)
+    return result
 
 
-def print_pdf_document(content: bytes) -> None:
-    """Zapisuje dokument PDF w pliku tymczasowym i drukuje go przez Adobe Reader."""
+def _spooler_command() -> list[str] | None:
+    """Polecenie spoolera czytające dokument ze standardowego wejścia.
+
+    W systemie Windows drukowanie wymaga pliku (Adobe Reader, Notepad),
+    dlatego zwracane jest ``None`` – tak samo, gdy w systemie nie ma
+    ``lp``/``lpr``.
+    """
+
+    if sys.platform.startswith("win"):
+        return None
+    name = "lp" if sys.platform == "darwin" else "lpr"
+    if shutil.which(name) is None:
+        return None
+    return [name]
+
+
+def _pipe_to_spooler(command: list[str], write: Callable[[BinaryIO], T]) -> T:
+    """Uruchamia spooler i zapisuje dokument bezpośrednio do jego stdin."""
 
-    temp_path: Path | None = None
     try:
-        with tempfile.NamedTemporaryFile("wb", delete=False, suffix=".pdf") as temp_file:
-            temp_file.write(content)
-            temp_path = Path(temp_file.name)
-    except OSError as exc:
-        raise PrinterError("Nie udało się przygotować pliku PDF do wydruku.") from exc
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError as exc:
+        raise PrinterError("Nie znaleziono polecenia drukarki w systemie.") from exc
 
+    assert process.stdin is not None and process.stderr is not None
+    result = None
     try:
-        _send_to_printer(temp_path, use_adobe_reader=True)
-    finally:
+        result = write(process.stdin)
+        process.stdin.close()
+    except BrokenPipeError:
+        # Spooler zakończył się przed odczytaniem całości – o wyniku decyduje
+        # jego kod wyjścia.
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    stderr = process.stderr.read()
+    process.stderr.close()
+    process.wait()
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", "replace").strip()
+        raise PrinterError(
+            "Polecenie drukarki zakończyło się niepowodzeniem."
+            + (f"\n{message}" if message else "")
+        )
+    return result  # type: ignore[return-value]
+
+
+def _encode_text(content: str) -> bytes:
+    """Koduje tekst tak jak plik otwarty w trybie tekstowym (systemowe końce linii)."""
+    return content.replace("\n", os.linesep).encode("utf-8")
+
+
+def _write_temp_file(content: bytes, suffix: str) -> Path:
+    """Zapisuje treść wydruku w pliku tymczasowym, który usuwa wywołujący."""
+
+    return _write_temp_stream(lambda target: target.write(content), suffix)[0]
+
+
+def _write_temp_stream(write: Callable[[BinaryIO], T], suffix: str) -> tuple[Path, T]:
+    """Jak :func:`_write_temp_file`, ale treść zapisuje ``write(target)``."""
+
+    temp_path: Path | None = None
+    try:
+        with tempfile.NamedTemporaryFile("wb", delete=False, suffix=suffix) as temp_file:
+            temp_path = Path(temp_file.name)
+            result = write(temp_file)
+    except BaseException as exc:
         if temp_path is not None:
-            _schedule_cleanup(temp_path)
+            temp_path.unlink(missing_ok=True)
+        if not isinstance(exc, OSError):
+            raise
+        if suffix == ".pdf":
+            raise PrinterError("Nie udało się przygotować pliku PDF do wydruku.") from exc
+        raise PrinterError("Nie udało się przygotować pliku do wydruku.") from exc
+    return temp_path, result
 
 
 def _send_to_printer(
@@ -311,7 +634,7 @@ def _send_to_printer(
     try:
         if sys.platform.startswith("win"):
             if use_adobe_reader:
-                reader_path = _find_adobe_reader()
+                reader_path = adobe_reader_locator.locate()
                 if reader_path is None:
                     raise PrinterError(
                         "Nie znaleziono instalacji Adobe Reader potrzebnej do wydruku PDF."
@@ -374,16 +697,67 @@ def _send_to_printer(
         raise PrinterError("Polecenie drukarki zakończyło się niepowodzeniem.") from exc
 
 
-def _schedule_cleanup(path: Path) -> None:
-    def _cleanup() -> None:
-        try:
-            path.unlink()
-        except FileNotFoundError:
-            pass
+class TempFileCleaner:
+    """Usuwa pliki tymczasowe wydruków po zadanym czasie.
+
+    Wszystkie pliki obsługuje jeden wątek w tle uruchamiany przy pierwszym
+    :meth:`schedule`; pozostałe pliki są usuwane przy zakończeniu programu.
+    """
+
+    def __init__(self) -> None:
+        self._files: list[tuple[float, int, Path]] = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, path: Path, delay: float = CLEANUP_DELAY) -> None:
+        with self._condition:
+            heapq.heappush(
+                self._files, (time.monotonic() + delay, next(self._order), path)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="kalkulator-temp-cleanup", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.remove_all)
+            self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._files)
+
+    def remove_all(self) -> None:
+        """Usuwa od razu wszystkie oczekujące pliki."""
+
+        with self._condition:
+            files, self._files = self._files, []
+        for _, _, path in files:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._files:
+                    self._condition.wait()
+                timeout = self._files[0][0] - time.monotonic()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+                _, _, path = heapq.heappop(self._files)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Plik może być jeszcze otwarty przez czytnik PDF.
+                self.schedule(path)
+
 
-    timer = threading.Timer(10.0, _cleanup)
-    timer.daemon = True
-    timer.start()
+temp_file_cleaner = TempFileCleaner()
 
 
 def _find_adobe_reader() -> Path | None:
@@ -421,6 +795,86 @@ def _find_adobe_reader() -> Path | None:
     return None
 
 
+class AdobeReaderLocator:
+    """Zapamiętuje położenie Adobe Reader, by nie przeszukiwać dysku przy każdym wydruku.
+
+    Kolejność: istniejąca ścieżka wskazana przez użytkownika, ścieżka
+    zapamiętana w lokalnych ustawieniach tego komputera (sprawdzana jednym
+    ``exists()``), a dopiero na końcu pełne wyszukiwanie
+    :func:`_find_adobe_reader`. ``store`` to obiekt z metodami
+    ``get_adobe_reader_path``/``set_adobe_reader_path`` i
+    ``get_adobe_reader_override`` (np. ``ConfigManager``).
+    """
+
+    def __init__(
+        self,
+        store: Any = None,
+        finder: Callable[[], Path | None] = _find_adobe_reader,
+    ) -> None:
+        self.store = store
+        self._finder = finder
+        self._cached: Path | None = None
+        self._lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+
+    def attach(self, store: Any) -> None:
+        """Podłącza trwałe przechowywanie ścieżki (zwykle ``ConfigManager``)."""
+        with self._lock:
+            self.store = store
+            self._cached = None
+
+    def locate(self) -> Path | None:
+        """Zwraca ścieżkę programu, w razie potrzeby wyszukując go od nowa."""
+
+        override = self._stored("get_adobe_reader_override")
+        if override is not None and override.exists():
+            return override
+
+        with self._lock:
+            cached = self._cached
+        if cached is None:
+            cached = self._stored("get_adobe_reader_path")
+        if cached is not None and cached.exists():
+            with self._lock:
+                self._cached = cached
+            return cached
+        return self.refresh()
+
+    def refresh(self) -> Path | None:
+        """Wyszukuje program i zapamiętuje wynik."""
+
+        found = self._finder()
+        with self._lock:
+            self._cached = found
+            store = self.store
+        if store is not None:
+            store.set_adobe_reader_path(str(found) if found is not None else None)
+        return found
+
+    def refresh_in_background(self) -> threading.Thread:
+        """Odświeża zapamiętaną ścieżkę w wątku w tle (np. przy starcie programu)."""
+
+        with self._lock:
+            thread = self._refresh_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(
+                    target=self.refresh, name="kalkulator-adobe-reader", daemon=True
+                )
+                self._refresh_thread = thread
+                thread.start()
+        return thread
+
+    def _stored(self, getter: str) -> Path | None:
+        store = self.store
+        if store is None:
+            return None
+        value = getattr(store, getter)()
+        return Path(value) if value else None
+
+
+adobe_reader_locator = AdobeReaderLocator()
+
+
 class _SummaryPDFBuilder:
     """Pomocnicza klasa tworząca prosty dokument PDF z sekcjami tabel."""
 
@@ -435,7 +889,14 @@ class _SummaryPDFBuilder:
     padding_y = 6.0
     column_ratio = 0.45
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+        object_streams: bool = False,
+    ) -> None:
+        self.compression_level = _check_compression_level(compression_level)
+        self.object_streams = object_streams
         self.pages: list[list[str]] = []
         self.cursor_y: float = 0.0
         self.current_page: list[str] | None = None
@@ -509,83 +970,27 @@ class _SummaryPDFBuilder:
         if not self.pages:
             self._new_page()
 
-        font_objects = [
-            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
-            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
-        ]
-
-        num_pages = len(self.pages)
-        font_start = 3
-        page_start = font_start + len(font_objects)
-        content_start = page_start + num_pages
-        total_objects = content_start + num_pages - 1
-
-        objects: list[bytes] = [b""] * (total_objects + 1)
-
-        pages_obj = 2
-        objects[1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode("ascii")
-
-        kids = " ".join(f"{page_start + i} 0 R" for i in range(num_pages))
-        media_box = (
-            f"[0 0 {self.page_width:.2f} {self.page_height:.2f}]".encode("ascii")
+        buffer = io.BytesIO()
+        writer = _PDFObjectWriter(
+            buffer,
+            compression_level=self.compression_level,
+            object_streams=self.object_streams,
         )
-        objects[pages_obj] = (
-            b"<< /Type /Pages /Kids ["
-            + kids.encode("ascii")
-            + b"] /Count "
-            + str(num_pages).encode("ascii")
-            + b" /MediaBox "
-            + media_box
-            + b" >>"
-        )
-
-        for index, font in enumerate(font_objects):
-            objects[font_start + index] = font
-
-        for page_index, commands in enumerate(self.pages):
-            page_obj_num = page_start + page_index
-            content_obj_num = content_start + page_index
-            resources = (
-                f"<< /Font << /F1 {font_start} 0 R /F2 {font_start + 1} 0 R >> >>"
-            )
-            objects[page_obj_num] = (
-                f"<< /Type /Page /Parent {pages_obj} 0 R /Resources {resources}"
-                f" /Contents {content_obj_num} 0 R >>"
-            ).encode("ascii")
-
-            stream_text = "\n".join(commands).encode("ascii")
-            stream = (
-                b"<< /Length "
-                + str(len(stream_text)).encode("ascii")
-                + b" >>\nstream\n"
-                + stream_text
-                + b"\nendstream"
-            )
-            objects[content_obj_num] = stream
-
-        buffer = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
-        offsets = [0]
-
-        for obj_num in range(1, len(objects)):
-            offsets.append(len(buffer))
-            buffer.extend(f"{obj_num} 0 obj\n".encode("ascii"))
-            buffer.extend(objects[obj_num])
-            buffer.extend(b"\nendobj\n")
-
-        xref_pos = len(buffer)
-        buffer.extend(f"xref\n0 {len(objects)}\n".encode("ascii"))
-        buffer.extend(b"0000000000 65535 f \n")
-        for offset in offsets[1:]:
-            buffer.extend(f"{offset:010} 00000 n \n".encode("ascii"))
-
-        buffer.extend(b"trailer\n")
-        buffer.extend(
-            f"<< /Size {len(objects)} /Root 1 0 R >>\n".encode("ascii")
-        )
-        buffer.extend(b"startxref\n")
-        buffer.extend(f"{xref_pos}\n".encode("ascii"))
-        buffer.extend(b"%%EOF")
-        return bytes(buffer)
+        catalog_obj = writer.reserve()
+        pages_obj = writer.reserve()
+        resources_obj = _write_shared_resources(writer)
+        page_objects = [
+            _write_page(writer, commands, pages_obj, resources_obj) for commands in self.pages
+        ]
+        _write_page_tree(writer, pages_obj, page_objects, self.page_width, self.page_height)
+        writer.add(f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode("ascii"), catalog_obj)
+        writer.close(catalog_obj)
+        return buffer.getvalue()
+
+    def page_break(self) -> None:
+        """Zaczyna nową stronę, o ile bieżąca zawiera już jakąś treść."""
+        if self.current_page is not None and len(self.current_page) > 1:
+            self._new_page()
 
     def _append(self, command: str) -> None:
         if self.current_page is None:
@@ -605,6 +1010,267 @@ class _SummaryPDFBuilder:
         self._append("0.5 w")
 
 
+class _StreamingPDFWriter(_SummaryPDFBuilder):
+    """Wariant :class:`_SummaryPDFBuilder` zapisujący strony na bieżąco.
+
+    Zakończona strona jest od razu zapisywana do pliku wraz ze strumieniem
+    treści, a w pamięci zostają tylko przesunięcia obiektów potrzebne do
+    tablicy xref. Katalog i drzewo stron mają zarezerwowane numery obiektów
+    i są zapisywane w :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        target: BinaryIO,
+        *,
+        compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+        object_streams: bool = False,
+    ) -> None:
+        self._writer = _PDFObjectWriter(
+            target,
+            compression_level=_check_compression_level(compression_level),
+            object_streams=object_streams,
+        )
+        self._catalog_obj = self._writer.reserve()
+        self._pages_obj = self._writer.reserve()
+        self._resources_obj = _write_shared_resources(self._writer)
+        self._page_objects = array("Q")
+        self._closed = False
+        super().__init__(compression_level=compression_level, object_streams=object_streams)
+
+    @property
+    def page_number(self) -> int:
+        """Numer (od 1) bieżącej, jeszcze niezapisanej strony."""
+        return len(self._page_objects) + 1
+
+    def render(self) -> bytes:
+        raise TypeError("_StreamingPDFWriter zapisuje dokument do pliku; użyj close().")
+
+    def close(self) -> int:
+        """Zapisuje ostatnią stronę, drzewo stron, xref i trailer.
+
+        Zwraca liczbę stron dokumentu.
+        """
+
+        if self._closed:
+            return len(self._page_objects)
+        self._flush_page()
+        self._closed = True
+        _write_page_tree(
+            self._writer, self._pages_obj, self._page_objects, self.page_width, self.page_height
+        )
+        self._writer.add(
+            f"<< /Type /Catalog /Pages {self._pages_obj} 0 R >>".encode("ascii"),
+            self._catalog_obj,
+        )
+        self._writer.close(self._catalog_obj)
+        return len(self._page_objects)
+
+    def _new_page(self) -> None:
+        if self._closed:
+            raise ValueError("Dokument PDF został już zamknięty.")
+        self._flush_page()
+        self.current_page = []
+        self.pages = [self.current_page]
+        self.cursor_y = self.page_height - self.margin_top
+        self._append("0.5 w")
+
+    def _flush_page(self) -> None:
+        if self.current_page is None:
+            return
+        self._page_objects.append(
+            _write_page(self._writer, self.current_page, self._pages_obj, self._resources_obj)
+        )
+        self.current_page = None
+
+
+class _PDFObjectWriter:
+    """Zapisuje obiekty PDF do pliku, śledząc przesunięcia dla tablicy xref.
+
+    Strumienie są kompresowane filtrem FlateDecode, jeśli ``compression_level``
+    jest większy od zera. Przy ``object_streams=True`` obiekty niebędące
+    strumieniami są grupowane w strumienie obiektów (PDF 1.5), a tablica xref
+    zapisywana jest jako skompresowany strumień.
+    """
+
+    objects_per_stream = 100
+
+    def __init__(
+        self,
+        target: BinaryIO,
+        *,
+        compression_level: int = DEFAULT_PDF_COMPRESSION_LEVEL,
+        object_streams: bool = False,
+    ) -> None:
+        self._target = target
+        self._position = 0
+        self.compression_level = compression_level
+        self.object_streams = object_streams
+        # Wpisy xref: typ (1 – przesunięcie w pliku, 2 – obiekt w strumieniu
+        # obiektów), przesunięcie lub numer strumienia, indeks w strumieniu.
+        self._types = array("B", [0])
+        self._fields = array("Q", [0])
+        self._indexes = array("H", [0])
+        self._pending: list[tuple[int, bytes]] = []
+        version = b"1.5" if object_streams else b"1.4"
+        self._write(b"%PDF-" + version + b"\n%\xe2\xe3\xcf\xd3\n")
+
+    def reserve(self) -> int:
+        """Rezerwuje numer obiektu zapisywanego później."""
+        self._types.append(0)
+        self._fields.append(0)
+        self._indexes.append(0)
+        return len(self._types) - 1
+
+    def add(self, body: bytes, number: int | None = None) -> int:
+        """Zapisuje obiekt słownikowy (bez strumienia) i zwraca jego numer."""
+        if number is None:
+            number = self.reserve()
+        if not self.object_streams:
+            self._write_direct(number, body)
+            return number
+        self._pending.append((number, body))
+        if len(self._pending) >= self.objects_per_stream:
+            self._flush_object_stream()
+        return number
+
+    def add_stream(self, data: bytes, number: int | None = None, extra: str = "") -> int:
+        """Zapisuje obiekt strumienia, w razie potrzeby kompresując dane."""
+        if number is None:
+            number = self.reserve()
+        filters = ""
+        if self.compression_level > 0:
+            data = zlib.compress(data, self.compression_level)
+            filters = " /Filter /FlateDecode"
+        header = f"<< /Length {len(data)}{filters}{extra} >>\nstream\n".encode("ascii")
+        self._write_direct(number, header + data + b"\nendstream")
+        return number
+
+    def close(self, root: int) -> None:
+        """Zapisuje tablicę xref (lub strumień xref) i trailer."""
+        self._flush_object_stream()
+        if self.object_streams:
+            self._write_xref_stream(root)
+            return
+
+        for number in range(1, len(self._types)):
+            if self._types[number] != 1:
+                raise ValueError(f"Obiekt PDF {number} nie został zapisany.")
+        xref_pos = self._position
+        size = len(self._types)
+        self._write(f"xref\n0 {size}\n".encode("ascii"))
+        self._write(b"0000000000 65535 f \n")
+        for start in range(1, size, 1024):
+            self._write(
+                b"".join(
+                    b"%010d 00000 n \n" % offset for offset in self._fields[start : start + 1024]
+                )
+            )
+        self._write(b"trailer\n")
+        self._write(f"<< /Size {size} /Root {root} 0 R >>\n".encode("ascii"))
+        self._write(b"startxref\n")
+        self._write(f"{xref_pos}\n".encode("ascii"))
+        self._write(b"%%EOF")
+
+    def _write_direct(self, number: int, body: bytes) -> None:
+        self._types[number] = 1
+        self._fields[number] = self._position
+        self._write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def _flush_object_stream(self) -> None:
+        if not self._pending:
+            return
+        stream_obj = self.reserve()
+        header_parts = []
+        body_parts = []
+        offset = 0
+        for index, (number, body) in enumerate(self._pending):
+            self._types[number] = 2
+            self._fields[number] = stream_obj
+            self._indexes[number] = index
+            header_parts.append(f"{number} {offset}")
+            body_parts.append(body)
+            offset += len(body) + 1
+        header = (" ".join(header_parts) + "\n").encode("ascii")
+        self.add_stream(
+            header + b"\n".join(body_parts),
+            stream_obj,
+            f" /Type /ObjStm /N {len(self._pending)} /First {len(header)}",
+        )
+        self._pending.clear()
+
+    def _write_xref_stream(self, root: int) -> None:
+        xref_obj = self.reserve()
+        self._types[xref_obj] = 1
+        self._fields[xref_obj] = self._position
+        for number in range(1, len(self._types)):
+            if self._types[number] == 0:
+                raise ValueError(f"Obiekt PDF {number} nie został zapisany.")
+        width = max(1, (max(self._fields).bit_length() + 7) // 8)
+        rows = bytearray()
+        for kind, field, index in zip(self._types, self._fields, self._indexes):
+            if kind == 0:
+                rows += b"\x00" + b"\x00" * width + b"\xff\xff"
+            else:
+                rows += bytes((kind,)) + field.to_bytes(width, "big") + index.to_bytes(2, "big")
+        xref_pos = self._position
+        self.add_stream(
+            bytes(rows),
+            xref_obj,
+            f" /Type /XRef /Size {len(self._types)} /W [1 {width} 2] /Root {root} 0 R",
+        )
+        self._write(b"startxref\n")
+        self._write(f"{xref_pos}\n".encode("ascii"))
+        self._write(b"%%EOF")
+
+    def _write(self, data: bytes) -> None:
+        self._target.write(data)
+        self._position += len(data)
+
+
+def _check_compression_level(level: int) -> int:
+    level = int(level)
+    if not 0 <= level <= 9:
+        raise ValueError("Poziom kompresji PDF musi mieścić się w zakresie 0–9.")
+    return level
+
+
+def _write_shared_resources(writer: _PDFObjectWriter) -> int:
+    """Zapisuje czcionki i wspólny słownik zasobów używany przez wszystkie strony."""
+    regular = writer.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    bold = writer.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>")
+    return writer.add(f"<< /Font << /F1 {regular} 0 R /F2 {bold} 0 R >> >>".encode("ascii"))
+
+
+def _write_page(
+    writer: _PDFObjectWriter, commands: list[str], pages_obj: int, resources_obj: int
+) -> int:
+    content_obj = writer.add_stream("\n".join(commands).encode("ascii"))
+    return writer.add(
+        (
+            f"<< /Type /Page /Parent {pages_obj} 0 R /Resources {resources_obj} 0 R"
+            f" /Contents {content_obj} 0 R >>"
+        ).encode("ascii")
+    )
+
+
+def _write_page_tree(
+    writer: _PDFObjectWriter,
+    pages_obj: int,
+    page_objects: Sequence[int],
+    page_width: float,
+    page_height: float,
+) -> None:
+    kids = " ".join(f"{number} 0 R" for number in page_objects)
+    writer.add(
+        (
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(page_objects)}"
+            f" /MediaBox [0 0 {page_width:.2f} {page_height:.2f}] >>"
+        ).encode("ascii"),
+        pages_obj,
+    )
+
+
 def _pdf_escape_text(text: str) -> str:
     normalized = unicodedata.normalize("NFKD", text)
     filtered = []
@@ -625,10 +1291,20 @@ def _pdf_escape_text(text: str) -> str:
 
 
 __all__ = [
+    "AdobeReaderLocator",
+    "DEFAULT_PDF_COMPRESSION_LEVEL",
     "PrinterError",
+    "QuotePages",
+    "TempFileCleaner",
+    "adobe_reader_locator",
     "build_summary_csv",
     "build_summary_pdf",
     "build_summary_sections",
     "print_text_document",
     "print_pdf_document",
+    "print_pdf_stream",
+    "print_summary_batch",
+    "temp_file_cleaner",
+    "write_quote_book",
+    "write_quote_pages",
 ]
@@ -0,0 +1,188 @@
+"""Zwarte reprezentacje wyników kalkulacji.
+
+``QuoteResult`` przechowuje pojedynczy wynik w jednej tablicy ``array('d')``
+zamiast w drzewie słowników, a ``QuoteBatch`` trzyma wyniki wsadu jako
+kolumny. Oba typy udostępniają widok zgodny z wynikiem :func:`oblicz_fale`,
+więc kod oczekujący słownika (np. ``build_summary_sections``) działa bez zmian.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Sequence
+
+from .calculations import RESULT_COLUMNS, flatten_results
+
+BOOL_COLUMNS = frozenset({"transport.powrot"})
+_COLUMN_INDEX = {name: index for index, name in enumerate(RESULT_COLUMNS)}
+
+
+def _build_layout() -> tuple[tuple[str, tuple[tuple[str, int], ...] | int], ...]:
+    """Opis struktury wyniku: klucz główny -> indeks albo lista podkluczy."""
+    layout: Dict[str, Any] = {}
+    for index, name in enumerate(RESULT_COLUMNS):
+        top, _, sub = name.partition(".")
+        if sub:
+            layout.setdefault(top, []).append((sub, index))
+        else:
+            layout[top] = index
+    return tuple(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in layout.items()
+    )
+
+
+_LAYOUT = _build_layout()
+_LAYOUT_INDEX = dict(_LAYOUT)
+
+
+def _convert(index: int, value: float) -> Any:
+    return bool(value) if RESULT_COLUMNS[index] in BOOL_COLUMNS else value
+
+
+class QuoteResult(Mapping):
+    """Niemodyfikowalny, zwarty wynik pojedynczej kalkulacji.
+
+    Zachowuje się jak słownik tylko do odczytu z kluczami wyniku
+    :func:`oblicz_fale`; zagnieżdżone sekcje tworzone są dopiero przy dostępie.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, wyniki: Mapping[str, Any]) -> None:
+        values = array("d", [0.0]) * len(RESULT_COLUMNS)
+        for name, value in flatten_results(dict(wyniki.items())):
+            values[_COLUMN_INDEX[name]] = float(value)
+        object.__setattr__(self, "_values", values)
+
+    @classmethod
+    def _from_values(cls, values: array) -> "QuoteResult":
+        result = cls.__new__(cls)
+        object.__setattr__(result, "_values", values)
+        return result
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Any]) -> "QuoteResult":
+        """Tworzy wynik ze spłaszczonych kolumn (``{"bigi.c8": ..., ...}``).
+
+        Kolumny nieznane w bieżącym ``RESULT_COLUMNS`` są pomijane, a brakujące
+        mają wartość NaN – np. przy wyniku zapisanym przez starszą wersję.
+        """
+
+        values = array("d", [float("nan")]) * len(RESULT_COLUMNS)
+        for name, value in columns.items():
+            index = _COLUMN_INDEX.get(name)
+            if index is not None:
+                values[index] = float(value)
+        return cls._from_values(values)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("QuoteResult jest niemodyfikowalny.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("QuoteResult jest niemodyfikowalny.")
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__._from_values, (self._values,))
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            layout = _LAYOUT_INDEX[key]
+        except KeyError:
+            raise KeyError(key) from None
+        if isinstance(layout, int):
+            return _convert(layout, self._values[layout])
+        return {sub: _convert(index, self._values[index]) for sub, index in layout}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_LAYOUT_INDEX)
+
+    def __len__(self) -> int:
+        return len(_LAYOUT)
+
+    def __repr__(self) -> str:
+        return f"QuoteResult({self.to_dict()!r})"
+
+    def value(self, column: str) -> Any:
+        """Zwraca pojedynczą wartość po spłaszczonej nazwie, np. ``"bigi.c8"``."""
+        index = _COLUMN_INDEX[column]
+        return _convert(index, self._values[index])
+
+    def columns(self) -> Dict[str, float]:
+        """Zwraca wartości jako spłaszczone kolumny ``RESULT_COLUMNS``."""
+        return dict(zip(RESULT_COLUMNS, self._values))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Tworzy pełny, zagnieżdżony słownik jak z :func:`oblicz_fale`."""
+        return {key: self[key] for key in _LAYOUT_INDEX}
+
+
+class QuoteBatch:
+    """Wyniki wsadu przechowywane kolumnowo (struct-of-arrays).
+
+    Kolumny mogą być tablicami NumPy (np. z ``oblicz_fale_batch``) albo
+    ``array('d')``; pojedyncze wiersze zwracane są jako :class:`QuoteResult`.
+    """
+
+    __slots__ = ("_columns", "_size")
+
+    def __init__(self, columns: Mapping[str, Sequence[Any]]) -> None:
+        missing = [name for name in RESULT_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError("Brak kolumn wyników: " + ", ".join(missing))
+        self._columns = {name: columns[name] for name in RESULT_COLUMNS}
+        sizes = {len(column) for column in self._columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("Kolumny wyników mają różne długości.")
+        self._size = sizes.pop() if sizes else 0
+
+    @classmethod
+    def from_batch(cls, wyniki: Mapping[str, Any]) -> "QuoteBatch":
+        """Tworzy wsad z zagnieżdżonego wyniku ``oblicz_fale_batch``."""
+        return cls(dict(flatten_results(dict(wyniki))))
+
+    @classmethod
+    def from_results(cls, results: Sequence[Mapping[str, Any]]) -> "QuoteBatch":
+        """Składa wsad z pojedynczych wyników (słowników lub ``QuoteResult``)."""
+        columns = {name: array("d") for name in RESULT_COLUMNS}
+        for wyniki in results:
+            record = wyniki if isinstance(wyniki, QuoteResult) else QuoteResult(wyniki)
+            for name, value in zip(RESULT_COLUMNS, record._values):
+                columns[name].append(value)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> QuoteResult:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return QuoteResult._from_values(
+            array("d", (float(self._columns[name][index]) for name in RESULT_COLUMNS))
+        )
+
+    def __iter__(self) -> Iterator[QuoteResult]:
+        for index in range(self._size):
+            yield self[index]
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Zwraca kolumnę po spłaszczonej nazwie, np. ``"zuzycie_m2_na_szt"``."""
+        return self._columns[name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Zagnieżdżony słownik kolumn w układzie wyniku ``oblicz_fale_batch``."""
+        nested: Dict[str, Any] = {}
+        for key, layout in _LAYOUT:
+            if isinstance(layout, int):
+                nested[key] = self._columns[RESULT_COLUMNS[layout]]
+            else:
+                nested[key] = {
+                    sub: self._columns[RESULT_COLUMNS[index]] for sub, index in layout
+                }
+        return nested
+
+
+__all__ = ["QuoteBatch", "QuoteResult"]
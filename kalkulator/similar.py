@@ -0,0 +1,366 @@
+"""Wyszukiwanie najbardziej podobnych kartonów wśród wcześniejszych wycen.
+
+Wymiary ``(dl, sz, wys)`` zapisanych wycen trafiają do siatki sześciennych
+komórek o boku ``cell`` mm, osobno dla każdej fali. Zapytanie przegląda
+komórki warstwami wokół komórki zapytania i kończy, gdy k-ty najbliższy
+kandydat jest bliżej niż dowolny punkt w kolejnej warstwie. Zapytania bez
+fali korzystają z jednej, wspólnej siatki wszystkich fal (budowanej przy
+pierwszym takim zapytaniu), a nie z ośmiu osobnych. Wyceny dodane po
+zbudowaniu indeksu trzymane są w małym buforze przeszukiwanym w całości i
+dołączane do siatki przy kolejnym przebudowaniu.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple, Sequence
+
+import numpy as np
+
+from .calculations import WAVE_NAMES
+
+if TYPE_CHECKING:
+    from .journal import QuoteJournal
+
+DEFAULT_CELL_MM = 25.0
+DEFAULT_K = 5
+# Po tylu warstwach taniej jest policzyć odległości do wszystkich punktów fali.
+MAX_RINGS = 5
+PENDING_LIMIT = 4096
+_WAVE_CODES = {name: code for code, name in enumerate(WAVE_NAMES)}
+# Współrzędne komórek są przesunięte, żeby klucz był nieujemny.
+_COORD_OFFSET = 1 << 15
+_COORD_RANGE = 1 << 16
+# Kod "fali" wspólnej siatki wszystkich fal (klucze nie kolidują z falami).
+_ALL_WAVES = -1
+# Wspólna siatka ma komórki o połowę mniejsze (1/8 objętości), żeby przy
+# ośmiu falach komórka mieściła podobną liczbę wycen co w siatce jednej fali.
+_ALL_WAVES_CELL_RATIO = 0.5
+
+
+class SimilarBox(NamedTuple):
+    """Jedna znaleziona wycena i jej odległość od zapytania (mm)."""
+
+    id: int
+    distance: float
+    dl: float
+    sz: float
+    wys: float
+    wave: str
+
+
+def wave_code(wave: str | None) -> int:
+    """Kod fali w ``WAVE_NAMES`` (-1 dla nieznanej nazwy)."""
+    return _WAVE_CODES.get(wave or "", -1)
+
+
+def _box_distance(point: np.ndarray, low: np.ndarray, high: np.ndarray) -> float:
+    return float(np.sqrt(((point - np.clip(point, low, high)) ** 2).sum()))
+
+
+def _unexplored_distance(
+    point: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    cube_low: np.ndarray,
+    cube_high: np.ndarray,
+) -> float:
+    """Dolne ograniczenie odległości do punktów spoza przejrzanego sześcianu.
+
+    Punkty leżą w prostopadłościanie ``[low, high]``; nieprzejrzany punkt
+    wychodzi poza ``[cube_low, cube_high)`` w którejś osi, więc leży w jednej
+    z co najwyżej sześciu „płyt” – wynikiem jest odległość do najbliższej z
+    nich (``inf``, gdy sześcian obejmuje cały prostopadłościan).
+    """
+
+    bound = np.inf
+    for axis in range(3):
+        if cube_low[axis] > low[axis]:
+            slab_high = high.copy()
+            slab_high[axis] = cube_low[axis]
+            bound = min(bound, _box_distance(point, low, slab_high))
+        if cube_high[axis] <= high[axis]:
+            slab_low = low.copy()
+            slab_low[axis] = cube_high[axis]
+            bound = min(bound, _box_distance(point, slab_low, high))
+    return bound
+
+
+def _ring_offsets(radius: int) -> np.ndarray:
+    span = np.arange(-radius, radius + 1)
+    grid = np.stack(np.meshgrid(span, span, span, indexing="ij"), axis=-1).reshape(-1, 3)
+    return grid[np.abs(grid).max(axis=1) == radius]
+
+
+_RINGS = [_ring_offsets(radius) for radius in range(MAX_RINGS + 1)]
+
+
+class SimilarBoxIndex:
+    """Indeks najbliższych sąsiadów po wymiarach kartonu i fali.
+
+    Odległość to odległość euklidesowa ``(dl, sz, wys)`` w mm; porównywane
+    są tylko wyceny tej samej fali (``wave=None`` przeszukuje wszystkie).
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[int] | np.ndarray = (),
+        waves: Sequence[int] | np.ndarray = (),
+        dims: Sequence[Sequence[float]] | np.ndarray = (),
+        *,
+        cell: float = DEFAULT_CELL_MM,
+    ) -> None:
+        if cell <= 0:
+            raise ValueError("Rozmiar komórki musi być dodatni.")
+        self.cell = float(cell)
+        self.max_id = 0
+        self._pending: list[tuple[int, int, float, float, float]] = []
+        self._build(
+            np.asarray(ids, dtype=np.int64),
+            np.asarray(waves, dtype=np.int64),
+            np.asarray(dims, dtype=np.float64).reshape(-1, 3),
+        )
+
+    @classmethod
+    def from_journal(cls, journal: QuoteJournal, *, cell: float = DEFAULT_CELL_MM) -> "SimilarBoxIndex":
+        """Buduje indeks ze wszystkich wycen w dzienniku."""
+        index = cls(cell=cell)
+        index.update_from(journal)
+        index.rebuild()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Budowa i aktualizacja
+    # ------------------------------------------------------------------
+    def _build(self, ids: np.ndarray, waves: np.ndarray, dims: np.ndarray) -> None:
+        coords = np.floor(dims / self.cell).astype(np.int64) + _COORD_OFFSET
+        np.clip(coords, 0, _COORD_RANGE - 1, out=coords)
+        keys = self._keys(waves, coords)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        self._ids = ids[order]
+        self._waves = waves[order]
+        self._dims = dims[order]
+        unique, starts = np.unique(keys, return_index=True)
+        ends = np.append(starts[1:], len(keys))
+        self._cells = dict(zip(unique.tolist(), zip(starts.tolist(), ends.tolist())))
+        # Zakresy wierszy i prostopadłościan wymiarów każdej fali (dane są
+        # posortowane po kodzie fali).
+        self._wave_ranges = {}
+        self._wave_boxes = {}
+        self._all_grid: tuple[np.ndarray, dict, tuple[np.ndarray, np.ndarray]] | None = None
+        for code, start, end in zip(*self._group_bounds(self._waves)):
+            self._wave_ranges[int(code)] = (int(start), int(end))
+            block = self._dims[start:end]
+            self._wave_boxes[int(code)] = (block.min(axis=0), block.max(axis=0))
+        if len(ids):
+            self.max_id = max(self.max_id, int(ids.max()))
+
+    def _all_waves_grid(self) -> tuple[np.ndarray, dict, tuple[np.ndarray, np.ndarray]]:
+        """Siatka bez podziału na fale: (kolejność wierszy, komórki, prostopadłościan)."""
+
+        if self._all_grid is None:
+            cell = self.cell * _ALL_WAVES_CELL_RATIO
+            coords = np.floor(self._dims / cell).astype(np.int64) + _COORD_OFFSET
+            np.clip(coords, 0, _COORD_RANGE - 1, out=coords)
+            keys = self._keys(np.full(len(coords), _ALL_WAVES), coords)
+            order = np.argsort(keys, kind="stable")
+            unique, starts = np.unique(keys[order], return_index=True)
+            ends = np.append(starts[1:], len(keys))
+            cells = dict(zip(unique.tolist(), zip(starts.tolist(), ends.tolist())))
+            self._all_grid = (order, cells, (self._dims.min(axis=0), self._dims.max(axis=0)))
+        return self._all_grid
+
+    @staticmethod
+    def _group_bounds(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        unique, starts = np.unique(values, return_index=True)
+        return unique, starts, np.append(starts[1:], len(values))
+
+    @staticmethod
+    def _keys(waves: np.ndarray, coords: np.ndarray) -> np.ndarray:
+        return ((waves + 1) * _COORD_RANGE + coords[..., 0]) * _COORD_RANGE ** 2 + (
+            coords[..., 1] * _COORD_RANGE + coords[..., 2]
+        )
+
+    def add(self, quote_id: int, wave: int | str, dl: float, sz: float, wys: float) -> None:
+        """Dodaje wycenę do bufora; indeks jest przebudowywany co ``PENDING_LIMIT`` wpisów."""
+
+        self._extend([(quote_id, wave, dl, sz, wys)])
+
+    def update_from(self, journal: QuoteJournal) -> int:
+        """Dokłada wyceny zapisane w dzienniku po ostatniej aktualizacji."""
+
+        rows = journal.dimensions(after_id=self.max_id)
+        self._extend(rows)
+        return len(rows)
+
+    def _extend(self, rows: Sequence[tuple[int, int | str, float, float, float]]) -> None:
+        for quote_id, wave, dl, sz, wys in rows:
+            code = wave_code(wave) if isinstance(wave, str) else int(wave)
+            self._pending.append((int(quote_id), code, float(dl), float(sz), float(wys)))
+            self.max_id = max(self.max_id, int(quote_id))
+        if len(self._pending) >= PENDING_LIMIT:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Przenosi wpisy z bufora do siatki."""
+
+        if not self._pending:
+            return
+        pending = np.array(self._pending, dtype=np.float64)
+        self._pending.clear()
+        self._build(
+            np.concatenate([self._ids, pending[:, 0].astype(np.int64)]),
+            np.concatenate([self._waves, pending[:, 1].astype(np.int64)]),
+            np.concatenate([self._dims, pending[:, 2:]]),
+        )
+
+    # ------------------------------------------------------------------
+    # Zapytania
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        dl: float,
+        sz: float,
+        wys: float,
+        wave: str | None = None,
+        k: int = DEFAULT_K,
+    ) -> list[SimilarBox]:
+        """Zwraca ``k`` wycen o wymiarach najbliższych ``(dl, sz, wys)``."""
+
+        if k <= 0:
+            return []
+        point = np.array([dl, sz, wys], dtype=np.float64)
+        code = None if wave is None else wave_code(wave)
+        rows = np.concatenate(
+            [
+                self._grid_candidates(point, _ALL_WAVES if code is None else code, k),
+                self._pending_candidates(point, code),
+            ]
+        )
+        return self._nearest(point, rows, k)
+
+    def _grid_candidates(self, point: np.ndarray, code: int, k: int) -> np.ndarray:
+        """Indeksy wierszy siatki, wśród których na pewno jest ``k`` najbliższych."""
+
+        if code == _ALL_WAVES:
+            if not len(self._ids):
+                return np.empty(0, dtype=np.intp)
+            order, cells, (low, high) = self._all_waves_grid()
+            bounds = (0, len(self._ids))
+            cell = self.cell * _ALL_WAVES_CELL_RATIO
+        else:
+            bounds = self._wave_ranges.get(code)
+            if bounds is None:
+                return np.empty(0, dtype=np.intp)
+            order, cells, (low, high) = None, self._cells, self._wave_boxes[code]
+            cell = self.cell
+        # Zapytanie spoza zakresu danych zaczyna od najbliższego punktu
+        # prostopadłościanu z wymiarami fali.
+        center_cell = np.floor(np.clip(point, low, high) / cell)
+        center = center_cell.astype(np.int64) + _COORD_OFFSET
+        found: list[np.ndarray] = []
+        total = 0
+        for radius, offsets in enumerate(_RINGS):
+            coords = center + offsets
+            keys = self._keys(np.full(len(coords), code), coords).tolist()
+            for key in keys:
+                span = cells.get(key)
+                if span is not None:
+                    found.append(np.arange(*span) if order is None else order[span[0] : span[1]])
+                    total += span[1] - span[0]
+            bound = _unexplored_distance(
+                point,
+                low,
+                high,
+                (center_cell - radius) * cell,
+                (center_cell + radius + 1) * cell,
+            )
+            if bound == np.inf:
+                # Przejrzane warstwy obejmują już wszystkie wyceny fali.
+                return np.concatenate(found) if found else np.empty(0, dtype=np.intp)
+            if total >= k:
+                rows = np.concatenate(found)
+                distances = np.sqrt(((self._dims[rows] - point) ** 2).sum(axis=1))
+                if np.partition(distances, k - 1)[k - 1] <= bound:
+                    return rows
+        return np.arange(*bounds)
+
+    def _pending_candidates(self, point: np.ndarray, code: int | None) -> np.ndarray:
+        if not self._pending:
+            return np.empty(0, dtype=np.intp)
+        # Wiersze bufora mają indeksy za wierszami siatki.
+        start = len(self._ids)
+        rows = [
+            start + offset
+            for offset, entry in enumerate(self._pending)
+            if code is None or entry[1] == code
+        ]
+        return np.asarray(rows, dtype=np.intp)
+
+    def _nearest(self, point: np.ndarray, rows: np.ndarray, k: int) -> list[SimilarBox]:
+        if not len(rows):
+            return []
+        base = len(self._ids)
+        grid_rows = rows[rows < base]
+        pending_rows = rows[rows >= base] - base
+        ids = self._ids[grid_rows]
+        waves = self._waves[grid_rows]
+        dims = self._dims[grid_rows]
+        if len(pending_rows):
+            pending = np.array(self._pending, dtype=np.float64)[pending_rows]
+            ids = np.concatenate([ids, pending[:, 0].astype(np.int64)])
+            waves = np.concatenate([waves, pending[:, 1].astype(np.int64)])
+            dims = np.concatenate([dims, pending[:, 2:]])
+        distances = np.sqrt(((dims - point) ** 2).sum(axis=1))
+        if len(distances) > k:
+            best = np.argpartition(distances, k - 1)[:k]
+        else:
+            best = np.arange(len(distances))
+        best = best[np.lexsort((ids[best], distances[best]))]
+        return [
+            SimilarBox(
+                id=int(ids[row]),
+                distance=float(distances[row]),
+                dl=float(dims[row, 0]),
+                sz=float(dims[row, 1]),
+                wys=float(dims[row, 2]),
+                wave=WAVE_NAMES[waves[row]] if 0 <= waves[row] < len(WAVE_NAMES) else "",
+            )
+            for row in best
+        ]
+
+
+def find_similar(
+    journal: QuoteJournal,
+    dl: float,
+    sz: float,
+    wys: float,
+    wave: str | None = None,
+    k: int = DEFAULT_K,
+    *,
+    index: SimilarBoxIndex | None = None,
+) -> list[tuple[SimilarBox, Any]]:
+    """Zwraca pary (trafienie, ``JournalEntry``) dla ``k`` najbliższych wycen.
+
+    Bez ``index`` indeks budowany jest na jedno zapytanie; przekazany
+    indeks jest najpierw uzupełniany o nowe wpisy dziennika.
+    """
+
+    if index is None:
+        index = SimilarBoxIndex.from_journal(journal)
+    else:
+        index.update_from(journal)
+    matches = index.query(dl, sz, wys, wave=wave, k=k)
+    entries = {entry.id: entry for entry in journal.get([match.id for match in matches])}
+    return [(match, entries[match.id]) for match in matches if match.id in entries]
+
+
+__all__ = [
+    "SimilarBox",
+    "SimilarBoxIndex",
+    "find_similar",
+    "wave_code",
+]
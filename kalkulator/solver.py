@@ -0,0 +1,312 @@
+"""Obliczenia odwrotne: wymiary kartonu spełniające zadane ograniczenia.
+
+Wszystkie wielkości, które da się ograniczyć, są w arkuszu liniowe lub
+dwuliniowe względem wymiarów (dla współczynników ``k`` danej fali):
+
+* formatka ``F = 2·dl + 2·sz + (zakladka + naddatek − odjecie)``,
+* wymiar zewnętrzny ``E = a·sz + wys + b``, gdzie
+  ``a = mnoznik·(1 + druga_klapa)/2`` i ``b = naddatek·mnoznik·(1 + druga_klapa) + wys_naddatek``,
+* zużycie m² ``= FIXED(F·E / 10⁶, 3)``,
+* paletyzacja: długość ``dl + sz + c``, szerokość ``E``.
+
+Dzięki temu największą wartość jednego wymiaru przy pozostałych ustalonych
+można wyznaczyć wzorem (dla ``sz`` z równania kwadratowego), a największy
+karton – przeszukując siatkę ``dl × sz`` z wysokością liczoną wzorem dla
+całej siatki naraz. Wynik jest na koniec sprawdzany dokładnym
+:func:`oblicz_geometrie` (zaokrąglenie FIXED) i w razie potrzeby
+zmniejszany o krok.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from .calculations import get_wave_kernel, oblicz_geometrie
+from .pricing import compile_margin_rules
+
+DIMENSIONS = ("dl", "sz", "wys")
+DEFAULT_STEP_MM = 1.0
+DEFAULT_GRID_STEP_MM = 5.0
+# Ile razy wynik wzoru może zostać zmniejszony o krok przy weryfikacji.
+_MAX_CORRECTIONS = 8
+
+
+class Constraints(NamedTuple):
+    """Górne ograniczenia wyniku (``None`` – bez ograniczenia)."""
+
+    max_zuzycie_m2: float | None = None
+    max_pallet_length: float | None = None
+    max_pallet_width: float | None = None
+
+
+class BoxSolution(NamedTuple):
+    """Wymiary znalezionego kartonu i wielkości, które ograniczano."""
+
+    dl: float
+    sz: float
+    wys: float
+    zuzycie_m2_na_szt: float
+    paletyzacja_dlugosc: float
+    paletyzacja_szerokosc: float
+
+
+class _Linear(NamedTuple):
+    formatka_const: float
+    outer_sz: float
+    outer_const: float
+    pallet_const: float
+
+
+def _linear(fala: str) -> _Linear:
+    k = get_wave_kernel(fala)
+    flaps = k.bigi_mnoznik * (1.0 + k.druga_klapa)
+    return _Linear(
+        formatka_const=k.formatka_zakladka + k.formatka_naddatek - k.formatka_odjecie,
+        outer_sz=flaps / 2.0,
+        outer_const=k.bigi_naddatek * flaps + k.wys_naddatek,
+        pallet_const=k.bigowe_sz_naddatek + k.bigowe_dl_naddatek,
+    )
+
+
+def _area_limit(max_zuzycie_m2: float | None) -> float | None:
+    """Górna granica (wyłączna) iloczynu ``F·E`` w mm² dla limitu zużycia.
+
+    Zużycie jest zaokrąglane FIXED do 0,001 m² (połówki w górę), więc
+    ``FIXED(x, 3) <= Z`` dokładnie wtedy, gdy ``x < floor3(Z) + 0,0005``.
+    """
+
+    if max_zuzycie_m2 is None:
+        return None
+    rounded = math.floor(max_zuzycie_m2 * 1000.0 + 1e-9) / 1000.0
+    return (rounded + 0.0005) * 1_000_000.0
+
+
+def zuzycie_limit_for_price(
+    max_unit_price: float,
+    cena_m2: float,
+    *,
+    quantity: int | None = None,
+    dodatkowe_koszty: float = 0.0,
+    koszt_transportu: float = 0.0,
+    margin_rules: Iterable[Mapping[str, Any]] = (),
+) -> float:
+    """Przelicza limit ceny jednostkowej na limit zużycia m²/szt.
+
+    Cena liczona jest jak w :func:`kalkulator.pricing.price_quote`: koszt
+    materiału plus koszty partii rozłożone na ``quantity`` sztuk, powiększony
+    o marżę progu obowiązującego dla tej ilości.
+    """
+
+    if cena_m2 <= 0:
+        raise ValueError("Cena 1 m² musi być większa od zera.")
+    batch_costs = dodatkowe_koszty + koszt_transportu
+    index = compile_margin_rules(margin_rules)
+    if quantity is None:
+        if batch_costs or len(index):
+            raise ValueError("Podaj ilość, aby uwzględnić koszty partii i marżę.")
+        return max_unit_price / cena_m2
+    if quantity <= 0:
+        raise ValueError("Ilość musi być większa od zera.")
+    margin = index.margin(quantity)
+    return (max_unit_price / (1.0 + margin / 100.0) - batch_costs / quantity) / cena_m2
+
+
+def evaluate(fala: str, dl: float, sz: float, wys: float) -> BoxSolution:
+    """Liczy ograniczane wielkości dokładnie tak jak arkusz."""
+
+    geometria = oblicz_geometrie(fala, dl, sz, wys)
+    paletyzacja = geometria["paletyzacja"]
+    return BoxSolution(
+        dl=dl,
+        sz=sz,
+        wys=wys,
+        zuzycie_m2_na_szt=geometria["zuzycie_m2_na_szt"],
+        paletyzacja_dlugosc=paletyzacja["dlugosc"],
+        paletyzacja_szerokosc=paletyzacja["szerokosc"],
+    )
+
+
+def satisfies(solution: BoxSolution, constraints: Constraints) -> bool:
+    checks = (
+        (solution.zuzycie_m2_na_szt, constraints.max_zuzycie_m2),
+        (solution.paletyzacja_dlugosc, constraints.max_pallet_length),
+        (solution.paletyzacja_szerokosc, constraints.max_pallet_width),
+    )
+    return all(limit is None or value <= limit + 1e-9 for value, limit in checks)
+
+
+def _dimension_bound(
+    free: str, lin: _Linear, dl: Any, sz: Any, wys: Any, constraints: Constraints
+) -> Any:
+    """Ciągła górna granica wymiaru ``free`` (działa też na tablicach NumPy)."""
+
+    bounds = []
+    area = _area_limit(constraints.max_zuzycie_m2)
+    length = constraints.max_pallet_length
+    width = constraints.max_pallet_width
+    if free == "wys":
+        formatka = 2.0 * dl + 2.0 * sz + lin.formatka_const
+        rest = lin.outer_sz * sz + lin.outer_const
+        if area is not None:
+            bounds.append(area / formatka - rest)
+        if width is not None:
+            bounds.append(width - rest)
+        if length is not None:
+            # Długość paletyzacyjna nie zależy od wysokości – tylko wyklucza.
+            bounds.append(_gate(dl + sz + lin.pallet_const <= length))
+    elif free == "dl":
+        outer = lin.outer_sz * sz + wys + lin.outer_const
+        if area is not None:
+            bounds.append((area / outer - 2.0 * sz - lin.formatka_const) / 2.0)
+        if length is not None:
+            bounds.append(length - sz - lin.pallet_const)
+        if width is not None:
+            bounds.append(_gate(outer <= width))
+    elif free == "sz":
+        rest = wys + lin.outer_const
+        if area is not None:
+            # (2·sz + p)(a·sz + rest) = area  →  dodatni pierwiastek.
+            p = 2.0 * dl + lin.formatka_const
+            qa = 2.0 * lin.outer_sz
+            qb = 2.0 * rest + lin.outer_sz * p
+            qc = p * rest - area
+            # Ujemny wyróżnik oznacza dwa ujemne pierwiastki – wynik i tak < 0.
+            root = _maximum(qb * qb - 4.0 * qa * qc, 0.0) ** 0.5
+            bounds.append((-qb + root) / (2.0 * qa))
+        if length is not None:
+            bounds.append(length - dl - lin.pallet_const)
+        if width is not None:
+            bounds.append((width - rest) / lin.outer_sz)
+    else:
+        raise ValueError(f"Nieznany wymiar: {free}")
+    if not bounds:
+        raise ValueError(f"Podane ograniczenia nie ograniczają wymiaru {free.upper()}.")
+    result = bounds[0]
+    for bound in bounds[1:]:
+        result = _minimum(result, bound)
+    return result
+
+
+def _gate(condition: Any) -> Any:
+    """``inf`` gdy warunek spełniony, ``-inf`` gdy nie (także dla tablic)."""
+    if isinstance(condition, bool):
+        return math.inf if condition else -math.inf
+    import numpy as np
+
+    return np.where(condition, np.inf, -np.inf)
+
+
+def _minimum(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return min(left, right)
+    import numpy as np
+
+    return np.minimum(left, right)
+
+
+def _maximum(left: Any, right: Any) -> Any:
+    if isinstance(left, float) and isinstance(right, float):
+        return max(left, right)
+    import numpy as np
+
+    return np.maximum(left, right)
+
+
+def max_dimension(
+    fala: str,
+    free: str,
+    constraints: Constraints,
+    *,
+    dl: float = 0.0,
+    sz: float = 0.0,
+    wys: float = 0.0,
+    step: float = DEFAULT_STEP_MM,
+    minimum: float = 0.0,
+) -> BoxSolution | None:
+    """Największa wartość wymiaru ``free`` (wielokrotność ``step``) przy pozostałych ustalonych.
+
+    Wartość podana dla ``free`` jest ignorowana. Zwraca ``None``, gdy nawet
+    ``minimum`` nie spełnia ograniczeń.
+    """
+
+    if step <= 0:
+        raise ValueError("Krok musi być dodatni.")
+    dims = {"dl": float(dl), "sz": float(sz), "wys": float(wys)}
+    bound = _dimension_bound(free, _linear(fala), dims["dl"], dims["sz"], dims["wys"], constraints)
+    if math.isnan(bound) or bound < minimum:
+        return None
+    if math.isinf(bound):
+        raise ValueError(f"Podane ograniczenia nie ograniczają wymiaru {free.upper()}.")
+    value = math.floor(bound / step + 1e-9) * step
+    for _ in range(_MAX_CORRECTIONS):
+        if value < minimum:
+            return None
+        dims[free] = value
+        solution = evaluate(fala, **dims)
+        if satisfies(solution, constraints):
+            return solution
+        value -= step
+    return None
+
+
+def largest_box(
+    fala: str,
+    constraints: Constraints,
+    *,
+    dl_range: tuple[float, float] = (100.0, 1200.0),
+    sz_range: tuple[float, float] = (100.0, 800.0),
+    wys_range: tuple[float, float] = (50.0, 800.0),
+    step: float = DEFAULT_GRID_STEP_MM,
+) -> BoxSolution | None:
+    """Karton o największej objętości mieszczący się w ograniczeniach i zakresach.
+
+    ``dl`` i ``sz`` przeszukiwane są na siatce o kroku ``step``; największa
+    wysokość dla całej siatki liczona jest jednym wyrażeniem NumPy.
+    """
+
+    import numpy as np
+
+    if step <= 0:
+        raise ValueError("Krok musi być dodatni.")
+    lin = _linear(fala)
+    dl_values = np.arange(dl_range[0], dl_range[1] + step / 2.0, step)
+    sz_values = np.arange(sz_range[0], sz_range[1] + step / 2.0, step)
+    dl_grid, sz_grid = np.meshgrid(dl_values, sz_values, indexing="ij")
+    try:
+        wys_bound = _dimension_bound("wys", lin, dl_grid, sz_grid, 0.0, constraints)
+    except ValueError:
+        wys_bound = np.full(dl_grid.shape, np.inf)
+    with np.errstate(invalid="ignore"):
+        wys_grid = np.floor(np.minimum(wys_bound, wys_range[1]) / step + 1e-9) * step
+        volume = np.where(wys_grid >= wys_range[0], dl_grid * sz_grid * wys_grid, -1.0)
+    # Kandydaci od największej objętości; weryfikacja odrzuca przypadki
+    # graniczne zaokrąglenia FIXED.
+    for flat in np.argsort(volume, axis=None)[::-1][: _MAX_CORRECTIONS * 4]:
+        if volume.flat[flat] < 0:
+            break
+        dl = float(dl_grid.flat[flat])
+        sz = float(sz_grid.flat[flat])
+        wys = float(wys_grid.flat[flat])
+        for _ in range(_MAX_CORRECTIONS):
+            if wys < wys_range[0]:
+                break
+            solution = evaluate(fala, dl, sz, wys)
+            if satisfies(solution, constraints):
+                return solution
+            wys -= step
+    return None
+
+
+__all__ = [
+    "BoxSolution",
+    "Constraints",
+    "DEFAULT_GRID_STEP_MM",
+    "DEFAULT_STEP_MM",
+    "DIMENSIONS",
+    "evaluate",
+    "largest_box",
+    "max_dimension",
+    "satisfies",
+    "zuzycie_limit_for_price",
+]
@@ -0,0 +1,74 @@
+"""Pomiar czasu uruchamiania aplikacji.
+
+Moduł jest importowany jako pierwszy przez pakiet ``kalkulator``, więc
+zapisany tu punkt startowy obejmuje import całej aplikacji. Raport można
+zapisać, ustawiając ``KALKULATOR_STARTUP_REPORT`` (ścieżka pliku lub ``-``
+dla stderr) albo flagą ``python -m kalkulator --startup-report``.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+_ORIGIN = time.perf_counter()
+REPORT_ENV = "KALKULATOR_STARTUP_REPORT"
+
+
+class StartupTimer:
+    """Zbiera znaczniki czasu kolejnych etapów startu (w ms od importu pakietu)."""
+
+    def __init__(self, origin: float = _ORIGIN) -> None:
+        self.origin = origin
+        self.marks: dict[str, float] = {}
+
+    def mark(self, name: str) -> float:
+        """Zapisuje etap (tylko pierwsze wystąpienie) i zwraca jego czas w ms."""
+        elapsed = (time.perf_counter() - self.origin) * 1000.0
+        return self.marks.setdefault(name, elapsed)
+
+    def report(self) -> dict[str, object]:
+        import platform
+        from datetime import datetime
+
+        phases: dict[str, float] = {}
+        previous = 0.0
+        for name, value in self.marks.items():
+            phases[name] = round(value - previous, 3)
+            previous = value
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "marks_ms": {name: round(value, 3) for name, value in self.marks.items()},
+            "phases_ms": phases,
+        }
+
+    def write_report(self, target: str | None = None) -> None:
+        """Dopisuje raport jako wiersz JSON do pliku (``-`` = stderr).
+
+        Bez ``target`` używana jest zmienna środowiskowa ``KALKULATOR_STARTUP_REPORT``;
+        jeśli i ona nie jest ustawiona, nic nie jest zapisywane.
+        """
+
+        import json
+        import sys
+
+        target = target or os.environ.get(REPORT_ENV)
+        if not target:
+            return
+        line = json.dumps(self.report(), ensure_ascii=False)
+        if target == "-":
+            print(line, file=sys.stderr)
+            return
+        try:
+            with open(target, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+        except OSError:
+            pass
+
+
+startup_timer = StartupTimer()
+
+
+__all__ = ["REPORT_ENV", "StartupTimer", "startup_timer"]
@@ -2,35 +2,45 @@
 
 from __future__ import annotations
 
+import sys
+import threading
+from copy import deepcopy
 import tkinter as tk
 from tkinter import messagebox, ttk
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable
 
-from .calculations import oblicz_fala_b
+from .cache import QuoteCache
+from .calculations import WAVE_NAMES
 from .config import ConfigManager, DEFAULT_MARGIN_RULES
-from .printing import (
-    PrinterError,
-    build_summary_pdf,
-    print_pdf_document,
+from .journal import JournalEntry, QuoteJournal
+from .pallets import (
+    DEFAULT_MAX_HEIGHT_MM,
+    DEFAULT_PALLET,
+    PALLET_TYPES,
+    PalletPlan,
+    PalletSettings,
+    apply_overrides,
+    plan_quantities,
 )
+from .pricing import DEFAULT_QUANTITY_LADDER, parse_quantities, price_table
+from .print_queue import CANCELLED, DONE, FAILED, PrintJob, PrintQueue
+from .results import QuoteResult
+from .solver import Constraints, largest_box, max_dimension, zuzycie_limit_for_price
+from .startup import startup_timer
 
 
-WAVE_TABS = [
-    "FALA B",
-    "FALA E",
-    "FALA C+EB",
-    "FALA EB+B 203",
-    "FALA BC",
-    "F203 FALA BC",
-    "F200 B+ EB",
-    "F200 BC",
-]
+WAVE_TABS = list(WAVE_NAMES)
+LIVE_GROUPS = ("geometry", "costs", "transport", "prices")
+LIVE_UPDATE_DELAY_MS = 250
+CONFIG_POLL_INTERVAL_MS = 2000
+SEARCH_POLL_INTERVAL_MS = 50
+SIMILAR_BOXES_COUNT = 10
 
 
 class CalculatorTab(ttk.Frame):
     """Pojedyncza zakładka kalkulatora odpowiadająca konkretnej fali."""
 
-    def __init__(self, master: ttk.Notebook, app: "FalaBApp", wave_name: str):
+    def __init__(self, master: tk.Misc, app: "FalaBApp", wave_name: str):
         super().__init__(master)
         self.app = app
         self.wave_name = wave_name
@@ -38,6 +48,7 @@ class CalculatorTab(ttk.Frame):
 
         self._init_variables()
         self._build_ui()
+        self._init_live_tracing()
 
     # ------------------------------------------------------------------
     # Zmienne interfejsu użytkownika
@@ -61,6 +72,13 @@ class CalculatorTab(ttk.Frame):
         self.var_transport_stawka = tk.StringVar()
         self.var_transport_km = tk.StringVar()
         self.var_transport_powrot = tk.BooleanVar(value=True)
+        self.var_live = tk.BooleanVar(value=True)
+        self.var_quantities = tk.StringVar(
+            value=", ".join(str(quantity) for quantity in DEFAULT_QUANTITY_LADDER[:4])
+        )
+        self.var_pallet_type = tk.StringVar(value=DEFAULT_PALLET)
+        self.var_pallet_height = tk.StringVar(value=f"{DEFAULT_MAX_HEIGHT_MM:g}")
+        self.var_pallet_weight = tk.StringVar()
 
         # Wyniki – sekcja minimum produkcyjne i wymiary
         placeholder = ""
@@ -83,6 +101,8 @@ class CalculatorTab(ttk.Frame):
             value="Wprowadź parametry i kliknij \"Policz\", aby zobaczyć wyniki."
         )
         self.var_transport_info = tk.StringVar(value=placeholder)
+        self.var_pallet_info = tk.StringVar(value=placeholder)
+        self.var_print_status = tk.StringVar(value=placeholder)
 
     # ------------------------------------------------------------------
     # Budowanie interfejsu użytkownika
@@ -265,6 +285,10 @@ class CalculatorTab(ttk.Frame):
         frame_actions.grid(row=3, column=0, columnspan=2, sticky="we", pady=(0, 8))
         frame_actions.columnconfigure(0, weight=1)
         frame_actions.columnconfigure(1, weight=1)
+        frame_actions.columnconfigure(2, weight=1)
+        frame_actions.columnconfigure(3, weight=1)
+        frame_actions.columnconfigure(4, weight=1)
+        frame_actions.columnconfigure(5, weight=1)
 
         ttk.Button(frame_actions, text="Policz", command=self.policz).grid(
             row=0, column=0, sticky="we", padx=(0, 4)
@@ -273,7 +297,36 @@ class CalculatorTab(ttk.Frame):
             frame_actions,
             text="Drukuj podsumowanie",
             command=self.print_summary,
-        ).grid(row=0, column=1, sticky="we", padx=(4, 0))
+        ).grid(row=0, column=1, sticky="we", padx=4)
+        ttk.Button(
+            frame_actions,
+            text="Drukuj wszystkie zakładki",
+            command=self.app.print_all_summaries,
+        ).grid(row=0, column=2, sticky="we", padx=4)
+        ttk.Button(
+            frame_actions,
+            text="Historia wycen",
+            command=self.open_history,
+        ).grid(row=0, column=3, sticky="we", padx=4)
+        ttk.Button(
+            frame_actions,
+            text="Podobne kartony",
+            command=self.open_similar,
+        ).grid(row=0, column=4, sticky="we", padx=4)
+        ttk.Button(
+            frame_actions,
+            text="Dobierz wymiary",
+            command=self.open_solver,
+        ).grid(row=0, column=5, sticky="we", padx=(4, 0))
+        ttk.Checkbutton(
+            frame_actions,
+            text="Przeliczaj na bieżąco",
+            variable=self.var_live,
+            command=self._on_live_toggled,
+        ).grid(row=1, column=0, sticky="w", pady=(4, 0))
+        ttk.Label(frame_actions, textvariable=self.var_print_status).grid(
+            row=1, column=1, columnspan=5, sticky="e", pady=(4, 0)
+        )
 
         frame_results = ttk.LabelFrame(self, text="Wyniki")
         frame_results.grid(row=4, column=0, columnspan=2, sticky="nsew")
@@ -286,6 +339,56 @@ class CalculatorTab(ttk.Frame):
             row=1, column=0, sticky="w", pady=(0, 8)
         )
 
+        frame_prices = ttk.LabelFrame(self, text="Cennik ilościowy")
+        frame_prices.grid(row=5, column=0, columnspan=2, sticky="nsew", pady=(8, 0))
+        frame_prices.columnconfigure(1, weight=1)
+
+        ttk.Label(frame_prices, text="Ilości [szt.]").grid(row=0, column=0, sticky="w")
+        ttk.Entry(frame_prices, textvariable=self.var_quantities).grid(
+            row=0, column=1, sticky="we", padx=(4, 0)
+        )
+        frame_pallet = ttk.Frame(frame_prices)
+        frame_pallet.grid(row=1, column=0, columnspan=2, sticky="w", pady=(4, 0))
+        ttk.Label(frame_pallet, text="Paleta").grid(row=0, column=0, sticky="w")
+        ttk.Combobox(
+            frame_pallet,
+            textvariable=self.var_pallet_type,
+            values=list(PALLET_TYPES),
+            state="readonly",
+            width=12,
+        ).grid(row=0, column=1, sticky="w", padx=(4, 12))
+        ttk.Label(frame_pallet, text="Maks. wysokość [mm]").grid(row=0, column=2, sticky="w")
+        ttk.Entry(frame_pallet, textvariable=self.var_pallet_height, width=8).grid(
+            row=0, column=3, sticky="w", padx=(4, 12)
+        )
+        ttk.Label(frame_pallet, text="Maks. waga [kg]").grid(row=0, column=4, sticky="w")
+        ttk.Entry(frame_pallet, textvariable=self.var_pallet_weight, width=8).grid(
+            row=0, column=5, sticky="w", padx=(4, 0)
+        )
+        price_columns = (
+            ("quantity", "Ilość [szt.]", 90),
+            ("material", "Materiał/szt.", 100),
+            ("extra", "Koszty dod./szt.", 110),
+            ("transport", "Transport/szt.", 100),
+            ("pallets", "Palety (kursy)", 100),
+            ("tier", "Próg marży", 150),
+            ("unit_price", "Cena/szt. [zł]", 110),
+            ("total", "Wartość [zł]", 110),
+        )
+        self.price_tree = ttk.Treeview(
+            frame_prices,
+            columns=[name for name, _, _ in price_columns],
+            show="headings",
+            height=4,
+        )
+        for name, heading, width in price_columns:
+            self.price_tree.heading(name, text=heading)
+            self.price_tree.column(name, anchor="e", width=width)
+        self.price_tree.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(6, 0))
+        ttk.Label(frame_prices, textvariable=self.var_pallet_info, justify="left").grid(
+            row=3, column=0, columnspan=2, sticky="w", pady=(4, 0)
+        )
+
         self.rowconfigure(4, weight=1)
 
     # ------------------------------------------------------------------
@@ -307,41 +410,265 @@ class CalculatorTab(ttk.Frame):
 
     def policz(self) -> None:
         try:
-            dl = self._parse_float(self.var_dl, "DŁ")
-            sz = self._parse_float(self.var_sz, "SZ")
-            wys = self._parse_float(self.var_wys, "WYS")
-            gram = self._parse_float(self.var_gram, "Gramatura")
-            cena_m2 = self._parse_float(self.var_cena_m2, "Cena 1 m²")
-            dodatkowe = self._parse_float_optional(self.var_inne, "Dodatkowe koszty")
-            stawka_km = self._parse_float_optional(
-                self.var_transport_stawka, "Stawka transport"
-            )
-            dystans = self._parse_float_optional(self.var_transport_km, "Dystans km")
-            powrot = bool(self.var_transport_powrot.get())
+            inputs = self._read_inputs()
+            quantities = parse_quantities(self.var_quantities.get())
+            self._read_pallet_settings()
         except ValueError as exc:
             messagebox.showerror("Błąd danych", str(exc))
             return
+        self._cancel_live_update()
+        self._apply_results(inputs, LIVE_GROUPS, quantities)
+        # Do dziennika trafiają tylko jawne przeliczenia, nie każda zmiana pola.
+        self.app.quote_journal.record(self.last_results)
+
+    def open_history(self) -> None:
+        """Otwiera okno wyszukiwania wcześniejszych wycen (wstępnie po NIP/firmie)."""
+
+        QuoteHistoryWindow(self)
 
-        wyniki = oblicz_fala_b(
-            dl=dl,
-            sz=sz,
-            wys=wys,
-            gramatura=gram,
-            cena_m2=cena_m2,
-            dodatkowe_koszty=dodatkowe,
-            stawka_transport_km=stawka_km,
-            dystans_km=dystans,
-            transport_powrot=powrot,
+    def open_similar(self) -> None:
+        """Otwiera listę wycen kartonów o wymiarach najbliższych bieżącym."""
+
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            messagebox.showerror(
+                "Podobne kartony", "Wyszukiwanie podobnych kartonów wymaga pakietu NumPy."
+            )
+            return
+        SimilarBoxesWindow(self)
+
+    def open_solver(self) -> None:
+        """Otwiera okno doboru wymiarów do limitu ceny, zużycia lub palety."""
+
+        DimensionSolverWindow(self)
+
+    def load_entry(self, entry: JournalEntry) -> None:
+        """Wpisuje do formularza klienta i parametry zapisanej wyceny."""
+
+        client = entry.client
+        inputs = entry.inputs
+        self.var_client_name.set(client.get("nazwa", ""))
+        self.var_client_address.set(client.get("adres", ""))
+        self.var_client_nip.set(client.get("nip", ""))
+        self.var_client_email.set(client.get("email", ""))
+        for var, key in (
+            (self.var_dl, "dl"),
+            (self.var_sz, "sz"),
+            (self.var_wys, "wys"),
+            (self.var_gram, "gramatura"),
+            (self.var_cena_m2, "cena_m2"),
+            (self.var_inne, "dodatkowe_koszty"),
+            (self.var_transport_stawka, "stawka_transport"),
+            (self.var_transport_km, "dystans"),
+        ):
+            value = inputs.get(key)
+            var.set("" if value is None else f"{float(value):g}")
+        self.var_transport_powrot.set(bool(inputs.get("powrot", True)))
+        if entry.quantities:
+            self.var_quantities.set(", ".join(str(quantity) for quantity in entry.quantities))
+        # Bez ponownego zapisu do dziennika – to ta sama wycena.
+        self._cancel_live_update()
+        self._apply_results(
+            self._read_inputs(), LIVE_GROUPS, parse_quantities(self.var_quantities.get())
         )
 
+    # ------------------------------------------------------------------
+    # Przeliczanie na bieżąco
+    # ------------------------------------------------------------------
+    def _init_live_tracing(self) -> None:
+        """Podpina śledzenie pól wejściowych do odroczonego przeliczania."""
+
+        self._live_after_id: str | None = None
+        self._dirty_groups: set[str] = set()
+        self._label_texts: dict[str, str] = {}
+        groups = {
+            "geometry": (self.var_dl, self.var_sz, self.var_wys),
+            "costs": (self.var_gram, self.var_cena_m2, self.var_inne),
+            "transport": (
+                self.var_transport_stawka,
+                self.var_transport_km,
+                self.var_transport_powrot,
+            ),
+            "prices": (
+                self.var_quantities,
+                self.var_pallet_type,
+                self.var_pallet_height,
+                self.var_pallet_weight,
+            ),
+            "client": (
+                self.var_client_name,
+                self.var_client_address,
+                self.var_client_nip,
+                self.var_client_email,
+            ),
+        }
+        for group, variables in groups.items():
+            for var in variables:
+                var.trace_add("write", lambda *_args, group=group: self._on_input_changed(group))
+
+    def _on_live_toggled(self) -> None:
+        if self.var_live.get() and self._dirty_groups:
+            self._on_input_changed(next(iter(self._dirty_groups)))
+
+    def _on_input_changed(self, group: str) -> None:
+        self._dirty_groups.add(group)
+        if not self.var_live.get():
+            return
+        self._cancel_live_update()
+        self._live_after_id = self.after(LIVE_UPDATE_DELAY_MS, self._run_live_update)
+
+    def _cancel_live_update(self) -> None:
+        if self._live_after_id is not None:
+            self.after_cancel(self._live_after_id)
+            self._live_after_id = None
+
+    def _run_live_update(self) -> None:
+        self._live_after_id = None
+        if self._dirty_groups == {"client"}:
+            if self.last_results:
+                # Nowy słownik – poprzedni mógł już trafić do kolejki wydruków.
+                self.last_results = {**self.last_results, "client": self._read_client()}
+            self._dirty_groups.clear()
+            return
+        try:
+            inputs = self._read_inputs()
+        except ValueError:
+            # Niekompletne dane w trakcie pisania – wyniki zostają bez zmian,
+            # a błąd zobaczy dopiero jawne "Policz".
+            return
+        try:
+            quantities: list[int] | None = parse_quantities(self.var_quantities.get())
+        except ValueError:
+            quantities = None
+        groups = set(self._dirty_groups)
+        if not self.last_results:
+            groups = set(LIVE_GROUPS)
+        if "geometry" in groups:
+            # Zużycie m² zmienia koszt materiału.
+            groups.add("costs")
+        if groups & {"costs", "transport"}:
+            groups.add("prices")
+        self._apply_results(inputs, groups, quantities)
+
+    # ------------------------------------------------------------------
+    # Prezentacja wyników
+    # ------------------------------------------------------------------
+    def _read_client(self) -> Dict[str, str]:
+        return {
+            "nazwa": self.var_client_name.get().strip(),
+            "adres": self.var_client_address.get().strip(),
+            "nip": self.var_client_nip.get().strip(),
+            "email": self.var_client_email.get().strip(),
+        }
+
+    def _read_inputs(self) -> Dict[str, Any]:
+        return {
+            "dl": self._parse_float(self.var_dl, "DŁ"),
+            "sz": self._parse_float(self.var_sz, "SZ"),
+            "wys": self._parse_float(self.var_wys, "WYS"),
+            "gramatura": self._parse_float(self.var_gram, "Gramatura"),
+            "cena_m2": self._parse_float(self.var_cena_m2, "Cena 1 m²"),
+            "dodatkowe_koszty": self._parse_float_optional(self.var_inne, "Dodatkowe koszty"),
+            "stawka_transport": self._parse_float_optional(
+                self.var_transport_stawka, "Stawka transport"
+            ),
+            "dystans": self._parse_float_optional(self.var_transport_km, "Dystans km"),
+            "powrot": bool(self.var_transport_powrot.get()),
+        }
+
+    def _read_pallet_settings(self) -> PalletSettings:
+        weight = self.var_pallet_weight.get().strip()
+        settings = PalletSettings(
+            pallet=self.var_pallet_type.get(),
+            max_height_mm=self._parse_float(self.var_pallet_height, "Maks. wysokość palety"),
+            max_weight_kg=(
+                self._parse_float(self.var_pallet_weight, "Maks. waga palety") if weight else None
+            ),
+        )
+        return apply_overrides(settings, self.app.config.get_pallet_overrides())
+
+    def _apply_results(
+        self,
+        inputs: Dict[str, Any],
+        groups: Iterable[str],
+        quantities: list[int] | None = None,
+    ) -> None:
+        """Liczy wynik i odświeża tylko etykiety z podanych grup.
+
+        Przy ``quantities=None`` (np. niepoprawna lista w trakcie pisania)
+        zostaje poprzedni cennik.
+        """
+
+        if quantities is None:
+            quantities = self.last_results.get("quantities", [])
+        try:
+            pallet: Dict[str, Any] | None = self._read_pallet_settings()._asdict()
+        except ValueError:
+            pallet = self.last_results.get("pallet")
+
+        wyniki = self.app.quote_cache.oblicz(
+            self.wave_name,
+            dl=inputs["dl"],
+            sz=inputs["sz"],
+            wys=inputs["wys"],
+            gramatura=inputs["gramatura"],
+            cena_m2=inputs["cena_m2"],
+            dodatkowe_koszty=inputs["dodatkowe_koszty"],
+            stawka_transport_km=inputs["stawka_transport"],
+            dystans_km=inputs["dystans"],
+            transport_powrot=inputs["powrot"],
+        )
+        self._dirty_groups.clear()
+
+        groups = set(groups)
+        if "geometry" in groups:
+            self._show_geometry(wyniki)
+        if "costs" in groups:
+            self._show_costs(wyniki)
+        if "transport" in groups:
+            self._show_transport(wyniki)
+
+        self.last_results = {
+            "client": self._read_client(),
+            "inputs": {"fala": self.wave_name, **inputs},
+            "wyniki": QuoteResult(wyniki),
+            "margin_rules": self.app.config.get_margin_rules(),
+            "quantities": list(quantities),
+            "pallet": pallet,
+        }
+        if "prices" in groups:
+            self._show_prices()
+
+    def refresh_margin_rules(self, rules: list[dict[str, float]]) -> None:
+        """Podmienia progi marży w ostatnim wyniku (np. po zmianie na innym stanowisku)."""
+
+        if self.last_results:
+            self.last_results = {
+                **self.last_results,
+                "margin_rules": [rule.copy() for rule in rules],
+            }
+            self._show_prices()
+
+    def _set_text(self, var: tk.StringVar, text: str) -> None:
+        """Ustawia tekst etykiety tylko wtedy, gdy rzeczywiście się zmienił."""
+
+        key = str(var)
+        if self._label_texts.get(key) != text:
+            self._label_texts[key] = text
+            var.set(text)
+
+    def _show_geometry(self, wyniki: Dict[str, Any]) -> None:
         bigi = wyniki["bigi"]
         bigowe = wyniki["bigowe"]
         sumy_bigowe = wyniki["sumy_bigowe"]
 
-        self.var_bigi_row1.set(
-            f"{bigi['c8']:.2f} mm | {bigi['d8']:.2f} mm | {bigi['e8']:.2f} mm"
+        self._set_text(
+            self.var_bigi_row1,
+            f"{bigi['c8']:.2f} mm | {bigi['d8']:.2f} mm | {bigi['e8']:.2f} mm",
         )
-        self.var_bigi_row2.set(
+        self._set_text(
+            self.var_bigi_row2,
             "Pozycje bigów: "
             + " | ".join(
                 [
@@ -349,9 +676,10 @@ class CalculatorTab(ttk.Frame):
                     f"{sumy_bigowe['d9']:.2f} mm",
                     f"{sumy_bigowe['e9']:.2f} mm",
                 ]
-            )
+            ),
         )
-        self.var_bigowanie_row1.set(
+        self._set_text(
+            self.var_bigowanie_row1,
             "Szerokości segmentów: "
             + " | ".join(
                 [
@@ -361,9 +689,10 @@ class CalculatorTab(ttk.Frame):
                     f"{bigowe['i8']:.2f} mm",
                     f"{bigowe['j8']:.2f} mm",
                 ]
-            )
+            ),
         )
-        self.var_bigowanie_row2.set(
+        self._set_text(
+            self.var_bigowanie_row2,
             "Pozycje segmentów: "
             + " | ".join(
                 [
@@ -373,27 +702,29 @@ class CalculatorTab(ttk.Frame):
                     f"{sumy_bigowe['i9']:.2f} mm",
                     f"{sumy_bigowe['j9']:.2f} mm",
                 ]
-            )
+            ),
         )
-        self.var_formatka_dims.set(
+        self._set_text(
+            self.var_formatka_dims,
             f"Długość: {wyniki['formatka_mm']:.2f} mm | "
-            f"Szerokość: {wyniki['wymiar_zewnetrzny_mm']:.2f} mm"
+            f"Szerokość: {wyniki['wymiar_zewnetrzny_mm']:.2f} mm",
         )
 
         minimum = wyniki["minimum_produkcji"]
-        self.var_minimum_aq.set(f": {minimum['aq']:.0f} szt.")
-        self.var_minimum_con.set(f": {minimum['con']:.0f} szt.")
-        self.var_minimum_pg.set(f": {minimum['pg']:.0f} szt.")
+        self._set_text(self.var_minimum_aq, f": {minimum['aq']:.0f} szt.")
+        self._set_text(self.var_minimum_con, f": {minimum['con']:.0f} szt.")
+        self._set_text(self.var_minimum_pg, f": {minimum['pg']:.0f} szt.")
 
         weryf = wyniki["weryfikacja_zewnetrzna"]
-        self.var_wymiar_h12.set(f": {weryf['dl']:.2f} mm")
-        self.var_wymiar_i12.set(f": {weryf['sz']:.2f} mm")
-        self.var_wymiar_j12.set(f": {weryf['wys']:.2f} mm")
+        self._set_text(self.var_wymiar_h12, f": {weryf['dl']:.2f} mm")
+        self._set_text(self.var_wymiar_i12, f": {weryf['sz']:.2f} mm")
+        self._set_text(self.var_wymiar_j12, f": {weryf['wys']:.2f} mm")
 
         paletyzacja = wyniki["paletyzacja"]
-        self.var_paletyzacja_dl.set(f": {paletyzacja['dlugosc']:.2f} mm")
-        self.var_paletyzacja_sz.set(f": {paletyzacja['szerokosc']:.2f} mm")
+        self._set_text(self.var_paletyzacja_dl, f": {paletyzacja['dlugosc']:.2f} mm")
+        self._set_text(self.var_paletyzacja_sz, f": {paletyzacja['szerokosc']:.2f} mm")
 
+    def _show_costs(self, wyniki: Dict[str, Any]) -> None:
         koszt_lines = [
             f"Zużycie m²/szt.: {wyniki['zuzycie_m2_na_szt']:.3f}",
             f"Waga kg/szt.: {wyniki['waga_kg_na_szt']:.3f}",
@@ -403,61 +734,455 @@ class CalculatorTab(ttk.Frame):
             koszt_lines.append(
                 f"Dodatkowe koszty (partia): {wyniki['koszty_dodatkowe']:.2f} zł"
             )
-        self.var_costs.set("\n".join(koszt_lines))
+        self._set_text(self.var_costs, "\n".join(koszt_lines))
 
+    def _show_transport(self, wyniki: Dict[str, Any]) -> None:
         transport = wyniki["transport"]
         powrot_txt = "tak" if transport["powrot"] else "nie"
-        self.var_transport_info.set(
+        self._set_text(
+            self.var_transport_info,
             f"Transport: stawka {transport['stawka_pelna']:.2f} zł/km, "
             f"dystans {transport['dystans']:.2f} km, powrót: {powrot_txt}. "
-            f"Koszt łączny: {transport['koszt_calkowity']:.2f} zł"
+            f"Koszt łączny: {transport['koszt_calkowity']:.2f} zł",
         )
 
-        self.last_results = {
-            "client": {
-                "nazwa": self.var_client_name.get().strip(),
-                "adres": self.var_client_address.get().strip(),
-                "nip": self.var_client_nip.get().strip(),
-                "email": self.var_client_email.get().strip(),
-            },
-            "inputs": {
-                "fala": self.wave_name,
-                "dl": dl,
-                "sz": sz,
-                "wys": wys,
-                "gramatura": gram,
-                "cena_m2": cena_m2,
-                "dodatkowe_koszty": dodatkowe,
-                "stawka_transport": stawka_km,
-                "dystans": dystans,
-                "powrot": powrot,
-            },
-            "wyniki": wyniki,
-            "margin_rules": self.app.config.get_margin_rules(),
-        }
+    def _show_prices(self) -> None:
+        """Odświeża cennik ilościowy na podstawie ``last_results``."""
 
-    def print_summary(self) -> None:
+        self.price_tree.delete(*self.price_tree.get_children())
+        quantities = self.last_results.get("quantities")
+        if not quantities:
+            self._set_text(self.var_pallet_info, "")
+            return
+        wyniki = self.last_results["wyniki"]
         try:
-            summary_pdf = build_summary_pdf(
-                self.last_results,
-                fallback_margin_rules=self.app.config.get_margin_rules(),
+            plans = plan_quantities(
+                wyniki, quantities, self.wave_name, self.last_results.get("pallet")
             )
         except ValueError as exc:
-            messagebox.showinfo("Brak danych", str(exc))
+            plans = []
+            self._set_text(self.var_pallet_info, f"Paletyzacja: {exc}")
+        else:
+            self._show_pallet_plan(plans[0])
+        rows = price_table(
+            wyniki,
+            quantities,
+            self.last_results["margin_rules"],
+            [plan.trips for plan in plans] if plans else None,
+        )
+        for index, quote in enumerate(rows):
+            pallets_text = (
+                f"{plans[index].pallets} ({plans[index].trips})"
+                if plans and plans[index].per_pallet
+                else "–"
+            )
+            if quote.max_quantity is None:
+                tier_text = "brak progów"
+            else:
+                tier_text = f"do {quote.max_quantity} – {quote.margin_percent:.2f} %"
+            self.price_tree.insert(
+                "",
+                "end",
+                values=(
+                    quote.quantity,
+                    f"{quote.material_cost:.4f}",
+                    f"{quote.extra_cost:.4f}",
+                    f"{quote.transport_cost:.4f}",
+                    pallets_text,
+                    tier_text,
+                    f"{quote.unit_price:.4f}",
+                    f"{quote.total_price:.2f}",
+                ),
+            )
+
+    def _show_pallet_plan(self, plan: PalletPlan) -> None:
+        spec = PALLET_TYPES[plan.pallet]
+        pallet_text = f"Paleta {plan.pallet} {spec.length:g} × {spec.width:g} mm"
+        if not plan.per_pallet:
+            self._set_text(self.var_pallet_info, f"{pallet_text}: formatka się nie mieści.")
             return
-        except Exception as exc:  # pragma: no cover - defensywnie
-            messagebox.showerror(
-                "Błąd",
-                f"Nie udało się przygotować danych do wydruku.\n{exc}",
+        self._set_text(
+            self.var_pallet_info,
+            f"{pallet_text}: {plan.per_layer} szt./warstwę "
+            f"({plan.straight} wzdłuż + {plan.rotated} obrócone), {plan.layers} warstw, "
+            f"{plan.per_pallet} szt./paletę, {plan.load_kg:.1f} kg "
+            f"(ogranicza {plan.limited_by}).",
+        )
+
+    def print_summary(self) -> None:
+        if not self.last_results:
+            messagebox.showinfo(
+                "Brak danych", "Brak danych do wydruku. Najpierw wykonaj obliczenia."
             )
             return
 
+        # Kopia: dokument budowany jest w wątku kolejki wydruków.
+        last_results = deepcopy(self.last_results)
+        margin_rules = self.app.config.get_margin_rules()
+        compression_level = self.app.config.get_pdf_compression_level()
+
+        def render() -> bytes:
+            from .printing import build_summary_pdf
+
+            return build_summary_pdf(
+                last_results,
+                fallback_margin_rules=margin_rules,
+                compression_level=compression_level,
+            )
+
+        self.app.print_queue.submit(
+            render,
+            description=f"{self.wave_name} {last_results['inputs']['dl']:g}"
+            f"x{last_results['inputs']['sz']:g}x{last_results['inputs']['wys']:g}",
+            callback=self._on_print_status,
+        )
+        self.var_print_status.set("Wydruk w kolejce…")
+
+    def _on_print_status(self, job: PrintJob, status: str) -> None:
+        if status == DONE:
+            self.var_print_status.set("")
+            messagebox.showinfo("Drukowanie", "Podsumowanie zostało wysłane do drukarki.")
+        elif status == FAILED:
+            self.var_print_status.set("")
+            if messagebox.askretrycancel(
+                "Błąd drukowania",
+                f"Nie udało się wydrukować podsumowania.\n{job.error}",
+            ):
+                self.app.print_queue.retry(job.job_id)
+        elif status == CANCELLED:
+            self.var_print_status.set("Wydruk anulowany.")
+        else:
+            self.var_print_status.set("Trwa wysyłanie do drukarki…")
+
+
+class QuoteHistoryWindow(tk.Toplevel):
+    """Okno wyszukiwania wycen zapisanych w dzienniku."""
+
+    window_title = "Historia wycen"
+    columns = (
+        ("created", "Data", 140),
+        ("company", "Firma", 180),
+        ("nip", "NIP", 110),
+        ("wave", "Fala", 90),
+        ("dims", "Wymiary [mm]", 130),
+        ("cost", "Materiał/szt. [zł]", 120),
+    )
+
+    def __init__(self, tab: CalculatorTab) -> None:
+        super().__init__(tab)
+        self.tab = tab
+        self.title(self.window_title)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+        self.entries: dict[str, JournalEntry] = {}
+        self.var_message = tk.StringVar()
+        self._search_thread: threading.Thread | None = None
+
+        form = ttk.Frame(self, padding=8)
+        form.grid(row=0, column=0, sticky="we")
+        self._build_form(form)
+
+        self.tree = ttk.Treeview(
+            self, columns=[name for name, _, _ in self.columns], show="headings", height=12
+        )
+        for name, heading, width in self.columns:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width)
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=8)
+        self.tree.bind("<Double-1>", self._on_open)
+
+        ttk.Label(self, textvariable=self.var_message, padding=8).grid(
+            row=2, column=0, sticky="w"
+        )
+        self.bind("<Return>", lambda _event: self.search())
+        self.search()
+
+    def _build_form(self, form: ttk.Frame) -> None:
+        self.var_nip = tk.StringVar(value=self.tab.var_client_nip.get().strip())
+        self.var_company = tk.StringVar(
+            value="" if self.var_nip.get() else self.tab.var_client_name.get().strip()
+        )
+        form.columnconfigure(1, weight=1)
+        form.columnconfigure(3, weight=1)
+        ttk.Label(form, text="NIP").grid(row=0, column=0, sticky="w")
+        ttk.Entry(form, textvariable=self.var_nip).grid(
+            row=0, column=1, sticky="we", padx=(4, 8)
+        )
+        ttk.Label(form, text="Firma (początek nazwy)").grid(row=0, column=2, sticky="w")
+        ttk.Entry(form, textvariable=self.var_company).grid(
+            row=0, column=3, sticky="we", padx=(4, 8)
+        )
+        ttk.Button(form, text="Szukaj", command=self.search).grid(row=0, column=4)
+
+    def _query(self) -> Callable[[], list[tuple[tuple[str, ...], JournalEntry]]]:
+        """Odczytuje formularz i zwraca wyszukiwanie do wykonania w tle.
+
+        Wyszukiwanie zwraca wyniki jako (wartości dodatkowych kolumn, wpis).
+        """
+
+        journal = self.tab.app.quote_journal
+        nip = self.var_nip.get().strip() or None
+        company = self.var_company.get().strip() or None
+
+        def find() -> list[tuple[tuple[str, ...], JournalEntry]]:
+            journal.flush()
+            return [((), entry) for entry in journal.search(nip=nip, company=company)]
+
+        return find
+
+    def search(self) -> None:
+        """Uruchamia wyszukiwanie w wątku w tle, by nie blokować okna.
+
+        Oczekiwanie na zapis dziennika i zapytanie do bazy odbywają się poza
+        wątkiem Tk; wynik jest pokazywany po sprawdzeniu w ``after()``.
+        """
+
+        try:
+            find = self._query()
+        except ValueError as exc:
+            self.var_message.set(str(exc))
+            return
+        outcome: list[Any] = []
+
+        def run() -> None:
+            import sqlite3
+
+            try:
+                outcome.append(find())
+            except (ValueError, OSError, sqlite3.Error) as exc:
+                outcome.append(exc)
+
+        thread = threading.Thread(target=run, name="kalkulator-journal-search", daemon=True)
+        self._search_thread = thread
+        self.var_message.set("Wyszukiwanie…")
+        thread.start()
+
+        def wait() -> None:
+            if thread.is_alive():
+                self.tab.after(SEARCH_POLL_INTERVAL_MS, wait)
+            elif thread is self._search_thread and self.winfo_exists():
+                self._show(outcome[0])
+
+        # Okno może zostać zamknięte przed końcem wyszukiwania, więc
+        # sprawdzanie jest zlecane zakładce.
+        self.tab.after(SEARCH_POLL_INTERVAL_MS, wait)
+
+    def _show(self, found: list[tuple[tuple[str, ...], JournalEntry]] | Exception) -> None:
+        if isinstance(found, ValueError):
+            self.var_message.set(str(found))
+            return
+        if isinstance(found, Exception):
+            self.var_message.set(f"Nie udało się odczytać dziennika wycen: {found}")
+            return
+        self.tree.delete(*self.tree.get_children())
+        self.entries.clear()
+        for extra, entry in found:
+            inputs = entry.inputs
+            item = self.tree.insert(
+                "",
+                "end",
+                values=(
+                    *extra,
+                    entry.created,
+                    entry.client.get("nazwa", ""),
+                    entry.client.get("nip", ""),
+                    inputs.get("fala", ""),
+                    f"{inputs.get('dl', 0):g} × {inputs.get('sz', 0):g} × {inputs.get('wys', 0):g}",
+                    f"{entry.wyniki['koszt_mat_na_szt']:.4f}",
+                ),
+            )
+            self.entries[item] = entry
+        self.var_message.set(
+            f"Znaleziono: {len(found)}. Dwuklik wczytuje wycenę do zakładki."
+            if found
+            else "Brak zapisanych wycen."
+        )
+
+    def _on_open(self, _event: tk.Event) -> None:
+        selection = self.tree.selection()
+        if selection:
+            self.tab.app.open_entry(self.entries[selection[0]], fallback=self.tab)
+            self.destroy()
+
+
+class SimilarBoxesWindow(QuoteHistoryWindow):
+    """Okno z wycenami kartonów o wymiarach najbliższych wymiarom z zakładki."""
+
+    window_title = "Podobne kartony"
+    columns = (("distance", "Odległość [mm]", 110),) + QuoteHistoryWindow.columns
+
+    def _build_form(self, form: ttk.Frame) -> None:
+        tab = self.tab
+        dims = (tab.var_dl, tab.var_sz, tab.var_wys)
+        self.var_dims = tk.StringVar(value=" × ".join(var.get().strip() or "?" for var in dims))
+        self.var_all_waves = tk.BooleanVar(value=False)
+        ttk.Label(form, text="Wymiary z zakładki:").grid(row=0, column=0, sticky="w")
+        ttk.Label(form, textvariable=self.var_dims).grid(row=0, column=1, sticky="w", padx=4)
+        ttk.Checkbutton(
+            form, text="Wszystkie fale", variable=self.var_all_waves, command=self.search
+        ).grid(row=0, column=2, sticky="w", padx=8)
+
+    def _query(self) -> Callable[[], list[tuple[tuple[str, ...], JournalEntry]]]:
+        tab = self.tab
+        dims = (
+            tab._parse_float(tab.var_dl, "DŁ"),
+            tab._parse_float(tab.var_sz, "SZ"),
+            tab._parse_float(tab.var_wys, "WYS"),
+        )
+        wave = None if self.var_all_waves.get() else tab.wave_name
+
+        def find() -> list[tuple[tuple[str, ...], JournalEntry]]:
+            return [
+                ((f"{match.distance:.1f}",), entry)
+                for match, entry in tab.app.find_similar(
+                    *dims, wave=wave, k=SIMILAR_BOXES_COUNT
+                )
+            ]
+
+        return find
+
+
+class DimensionSolverWindow(tk.Toplevel):
+    """Okno obliczeń odwrotnych: wymiary spełniające limit ceny, zużycia lub palety."""
+
+    targets = (("dl", "DŁ"), ("sz", "SZ"), ("wys", "WYS"), ("box", "Największy karton"))
+
+    def __init__(self, tab: CalculatorTab) -> None:
+        super().__init__(tab)
+        self.tab = tab
+        self.solution = None
+        self.title(f"Dobór wymiarów – {tab.wave_name}")
+        self.columnconfigure(1, weight=1)
+
         try:
-            print_pdf_document(summary_pdf)
-        except PrinterError as exc:
-            messagebox.showerror("Błąd drukowania", str(exc))
+            first_quantity = str(parse_quantities(tab.var_quantities.get())[0])
+        except (ValueError, IndexError):
+            first_quantity = ""
+        self.var_target = tk.StringVar(value="wys")
+        self.var_max_price = tk.StringVar()
+        self.var_quantity = tk.StringVar(value=first_quantity)
+        self.var_max_zuzycie = tk.StringVar()
+        self.var_max_length = tk.StringVar()
+        self.var_max_width = tk.StringVar()
+        self.var_result = tk.StringVar()
+
+        frame_target = ttk.Frame(self, padding=(8, 8, 8, 0))
+        frame_target.grid(row=0, column=0, columnspan=2, sticky="w")
+        ttk.Label(frame_target, text="Szukany wymiar:").grid(row=0, column=0, sticky="w")
+        for column, (value, label) in enumerate(self.targets, start=1):
+            ttk.Radiobutton(
+                frame_target, text=label, value=value, variable=self.var_target
+            ).grid(row=0, column=column, sticky="w", padx=(8, 0))
+
+        fields = (
+            ("Maks. cena/szt. [zł]", self.var_max_price),
+            ("Ilość do ceny [szt.]", self.var_quantity),
+            ("Maks. zużycie [m²/szt.]", self.var_max_zuzycie),
+            ("Maks. długość paletyzacji [mm]", self.var_max_length),
+            ("Maks. szerokość paletyzacji [mm]", self.var_max_width),
+        )
+        for row, (label, var) in enumerate(fields, start=1):
+            ttk.Label(self, text=label).grid(row=row, column=0, sticky="w", padx=8, pady=2)
+            ttk.Entry(self, textvariable=var, width=14).grid(
+                row=row, column=1, sticky="we", padx=8, pady=2
+            )
+
+        ttk.Label(
+            self,
+            text="Pozostałe wymiary, cena 1 m², koszty dodatkowe i transport\n"
+            "pobierane są z zakładki.",
+            justify="left",
+        ).grid(row=6, column=0, columnspan=2, sticky="w", padx=8, pady=(4, 0))
+        ttk.Label(self, textvariable=self.var_result, justify="left").grid(
+            row=7, column=0, columnspan=2, sticky="w", padx=8, pady=8
+        )
+        frame_buttons = ttk.Frame(self, padding=(8, 0, 8, 8))
+        frame_buttons.grid(row=8, column=0, columnspan=2, sticky="e")
+        ttk.Button(frame_buttons, text="Szukaj", command=self.solve).grid(row=0, column=0)
+        ttk.Button(frame_buttons, text="Wstaw do zakładki", command=self.apply).grid(
+            row=0, column=1, padx=(8, 0)
+        )
+        self.bind("<Return>", lambda _event: self.solve())
+
+    def _limit(self, var: tk.StringVar, name: str) -> float | None:
+        """Wartość pola ograniczenia albo ``None``, gdy pole jest puste."""
+        return self.tab._parse_float(var, name) if var.get().strip() else None
+
+    def _constraints(self) -> Constraints:
+        tab = self.tab
+        limits = []
+        max_price = self._limit(self.var_max_price, "Maks. cena/szt.")
+        if max_price is not None:
+            quantity = self._limit(self.var_quantity, "Ilość do ceny")
+            powrot = 2.0 if tab.var_transport_powrot.get() else 1.0
+            transport = (
+                tab._parse_float_optional(tab.var_transport_stawka, "Stawka transport")
+                * powrot
+                * max(tab._parse_float_optional(tab.var_transport_km, "Dystans km"), 0.0)
+            )
+            limits.append(
+                zuzycie_limit_for_price(
+                    max_price,
+                    tab._parse_float(tab.var_cena_m2, "Cena 1 m²"),
+                    quantity=None if quantity is None else int(quantity),
+                    dodatkowe_koszty=tab._parse_float_optional(tab.var_inne, "Dodatkowe koszty"),
+                    koszt_transportu=transport,
+                    margin_rules=tab.app.config.get_margin_rules(),
+                )
+            )
+        max_zuzycie = self._limit(self.var_max_zuzycie, "Maks. zużycie")
+        if max_zuzycie is not None:
+            limits.append(max_zuzycie)
+        return Constraints(
+            max_zuzycie_m2=min(limits) if limits else None,
+            max_pallet_length=self._limit(self.var_max_length, "Maks. długość paletyzacji"),
+            max_pallet_width=self._limit(self.var_max_width, "Maks. szerokość paletyzacji"),
+        )
+
+    def solve(self) -> None:
+        tab = self.tab
+        target = self.var_target.get()
+        try:
+            constraints = self._constraints()
+            if target == "box":
+                solution = largest_box(tab.wave_name, constraints)
+            else:
+                dims = {
+                    name: tab._parse_float(var, label)
+                    for name, var, label in (
+                        ("dl", tab.var_dl, "DŁ"),
+                        ("sz", tab.var_sz, "SZ"),
+                        ("wys", tab.var_wys, "WYS"),
+                    )
+                    if name != target
+                }
+                solution = max_dimension(tab.wave_name, target, constraints, **dims)
+        except ValueError as exc:
+            self.solution = None
+            self.var_result.set(str(exc))
             return
-        messagebox.showinfo("Drukowanie", "Podsumowanie zostało wysłane do drukarki.")
+        self.solution = solution
+        if solution is None:
+            self.var_result.set("Żaden wymiar nie spełnia podanych ograniczeń.")
+            return
+        self.var_result.set(
+            f"Wymiary: {solution.dl:g} × {solution.sz:g} × {solution.wys:g} mm\n"
+            f"Zużycie: {solution.zuzycie_m2_na_szt:.3f} m²/szt.\n"
+            f"Paletyzacja: {solution.paletyzacja_dlugosc:g} × "
+            f"{solution.paletyzacja_szerokosc:g} mm"
+        )
+
+    def apply(self) -> None:
+        if self.solution is None:
+            return
+        tab = self.tab
+        for var, value in (
+            (tab.var_dl, self.solution.dl),
+            (tab.var_sz, self.solution.sz),
+            (tab.var_wys, self.solution.wys),
+        ):
+            var.set(f"{value:g}")
+        self.destroy()
 
 
 class FalaBApp(ttk.Frame):
@@ -469,12 +1194,25 @@ class FalaBApp(ttk.Frame):
         self.grid(sticky="nsew")
 
         self.config = ConfigManager()
+        self.quote_cache = QuoteCache()
+        # Dziennik wycen (wątek zapisu, plik SQLite) powstaje przy pierwszym
+        # zapisie lub wyszukiwaniu – zob. :attr:`quote_journal`.
+        self._quote_journal: QuoteJournal | None = None
+        self._journal_lock = threading.Lock()
+        # Indeks podobnych kartonów budowany przy pierwszym wyszukiwaniu.
+        self.similar_index: Any = None
+        self._similar_lock = threading.Lock()
+        self.print_queue = PrintQueue()
+        self.print_queue.attach_tk(self)
+        # Moduł wydruku nie jest potrzebny do pierwszego wyświetlenia okna.
+        self.after_idle(self._init_printing)
         self.margin_rules: list[dict[str, float]] = self.config.get_margin_rules()
         self.settings_unlocked = False
         self.calculator_tabs: dict[str, CalculatorTab] = {}
 
         self.create_widgets()
         self.master.bind("<Return>", self._handle_return)
+        self.after(CONFIG_POLL_INTERVAL_MS, self._poll_config)
 
     # ------------------------------------------------------------------
     # Budowanie interfejsu użytkownika
@@ -486,10 +1224,16 @@ class FalaBApp(ttk.Frame):
         self.notebook = ttk.Notebook(self)
         self.notebook.grid(row=0, column=0, sticky="nsew")
 
+        # Zakładki kalkulatora budowane są dopiero przy pierwszym wybraniu;
+        # do tego czasu w notatniku jest tylko pusta ramka.
+        self.tab_placeholders: dict[str, str] = {}
         for wave_name in WAVE_TABS:
-            tab = CalculatorTab(self.notebook, self, wave_name)
-            self.notebook.add(tab, text=wave_name)
-            self.calculator_tabs[str(tab)] = tab
+            placeholder = ttk.Frame(self.notebook)
+            placeholder.columnconfigure(0, weight=1)
+            placeholder.rowconfigure(0, weight=1)
+            self.notebook.add(placeholder, text=wave_name)
+            self.tab_placeholders[str(placeholder)] = wave_name
+        self._ensure_calculator_tab(self.notebook.select())
 
         self.tab_settings = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_settings, text="Ustawienia")
@@ -630,6 +1374,36 @@ class FalaBApp(ttk.Frame):
             row=4, column=0, columnspan=4, sticky="w", pady=(10, 0)
         )
 
+        ttk.Label(
+            self.settings_content_frame,
+            text="Adobe Reader",
+            font=("TkDefaultFont", 11, "bold"),
+        ).grid(row=5, column=0, columnspan=4, sticky="w", pady=(20, 0))
+
+        reader_frame = ttk.Frame(self.settings_content_frame)
+        reader_frame.grid(row=6, column=0, columnspan=4, sticky="ew", pady=(8, 0))
+        reader_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(reader_frame, text="Własna ścieżka").grid(row=0, column=0, sticky="w")
+        self.var_adobe_override = tk.StringVar(
+            value=self.config.get_adobe_reader_override() or ""
+        )
+        ttk.Entry(reader_frame, textvariable=self.var_adobe_override).grid(
+            row=0, column=1, sticky="ew", padx=(4, 8)
+        )
+        ttk.Button(
+            reader_frame, text="Zapisz", command=self._save_adobe_override
+        ).grid(row=0, column=2, sticky="ew", padx=(0, 4))
+        ttk.Button(
+            reader_frame, text="Wyszukaj ponownie", command=self._refresh_adobe_reader
+        ).grid(row=0, column=3, sticky="ew")
+
+        self.adobe_message_var = tk.StringVar()
+        ttk.Label(
+            self.settings_content_frame, textvariable=self.adobe_message_var
+        ).grid(row=7, column=0, columnspan=4, sticky="w", pady=(8, 0))
+        self._update_adobe_message()
+
         self.settings_content_frame.grid_remove()
         self._show_settings_locked()
 
@@ -641,6 +1415,7 @@ class FalaBApp(ttk.Frame):
         if not isinstance(widget, ttk.Notebook):
             return
         current = widget.select()
+        self._ensure_calculator_tab(current)
         if current == str(self.tab_settings):
             if self.settings_unlocked:
                 self._show_settings_content()
@@ -821,9 +1596,165 @@ class FalaBApp(ttk.Frame):
         self.margin_message_var.set(text)
         self.margin_message_label.configure(foreground="red" if error else "")
 
+    def _poll_config(self) -> None:
+        """Sprawdza, czy plik konfiguracji zmienił się na innym stanowisku."""
+
+        if self.config.reload_if_changed():
+            self.margin_rules = self.config.get_margin_rules()
+            self._refresh_margin_tree()
+            for tab in self.calculator_tabs.values():
+                tab.refresh_margin_rules(self.margin_rules)
+            if self.settings_unlocked:
+                self._set_margin_message("Wczytano progi marży zmienione na innym stanowisku.")
+        self.after(CONFIG_POLL_INTERVAL_MS, self._poll_config)
+
+    def _init_printing(self) -> None:
+        from .printing import adobe_reader_locator
+
+        adobe_reader_locator.attach(self.config)
+        if sys.platform.startswith("win") and not self.config.get_adobe_reader_override():
+            adobe_reader_locator.refresh_in_background()
+
+    def _save_adobe_override(self) -> None:
+        self.config.set_adobe_reader_override(self.var_adobe_override.get())
+        self._update_adobe_message()
+
+    def _refresh_adobe_reader(self) -> None:
+        from .printing import adobe_reader_locator
+
+        self.adobe_message_var.set("Wyszukiwanie Adobe Reader…")
+        thread = adobe_reader_locator.refresh_in_background()
+
+        def wait() -> None:
+            if thread.is_alive():
+                self.after(200, wait)
+            else:
+                self._update_adobe_message()
+
+        self.after(200, wait)
+
+    def _update_adobe_message(self) -> None:
+        override = self.config.get_adobe_reader_override()
+        detected = self.config.get_adobe_reader_path()
+        if override:
+            self.adobe_message_var.set(f"Używana ścieżka użytkownika: {override}")
+        elif detected:
+            self.adobe_message_var.set(f"Znaleziono: {detected}")
+        else:
+            self.adobe_message_var.set("Nie znaleziono Adobe Reader.")
+
     # ------------------------------------------------------------------
     # Integracja z zakładkami kalkulatora
     # ------------------------------------------------------------------
+    def print_all_summaries(self) -> None:
+        """Drukuje wyniki wszystkich zakładek jako jeden dokument i jedno zadanie."""
+
+        tabs = [
+            self.calculator_tabs[placeholder]
+            for placeholder in self.tab_placeholders
+            if placeholder in self.calculator_tabs
+            and self.calculator_tabs[placeholder].last_results
+        ]
+        if not tabs:
+            messagebox.showinfo(
+                "Brak danych", "Brak danych do wydruku. Najpierw wykonaj obliczenia."
+            )
+            return
+
+        # Kopie: dokument budowany jest w wątku kolejki wydruków.
+        records = [deepcopy(tab.last_results) for tab in tabs]
+        margin_rules = self.config.get_margin_rules()
+        compression_level = self.config.get_pdf_compression_level()
+
+        def on_status(job: PrintJob, status: str) -> None:
+            if status == DONE:
+                lines = [
+                    f"{tabs[entry.index].wave_name}: strony {entry.first_page}–{entry.last_page}"
+                    if entry.error is None
+                    else f"{tabs[entry.index].wave_name}: pominięto ({entry.error})"
+                    for entry in job.result or []
+                ]
+                messagebox.showinfo(
+                    "Drukowanie",
+                    "Zbiorcze podsumowanie zostało wysłane do drukarki.\n" + "\n".join(lines),
+                )
+            elif status == FAILED and messagebox.askretrycancel(
+                "Błąd drukowania",
+                f"Nie udało się wydrukować zbiorczego podsumowania.\n{job.error}",
+            ):
+                self.print_queue.retry(job.job_id)
+
+        def render(target: Any) -> Any:
+            from .printing import write_quote_pages
+
+            return write_quote_pages(
+                records,
+                target,
+                margin_rules,
+                compression_level=compression_level,
+            )
+
+        self.print_queue.submit(
+            render,
+            stream=True,
+            description=f"Zbiorczy wydruk ({len(records)} kalkulacji)",
+            callback=on_status,
+        )
+
+    @property
+    def quote_journal(self) -> QuoteJournal:
+        """Dziennik wycen tworzony przy pierwszym użyciu (także z wątku w tle)."""
+
+        with self._journal_lock:
+            if self._quote_journal is None:
+                self._quote_journal = QuoteJournal()
+            return self._quote_journal
+
+    def find_similar(
+        self, dl: float, sz: float, wys: float, wave: str | None, k: int
+    ) -> list[tuple[Any, JournalEntry]]:
+        """Zwraca ``k`` wycen o najbliższych wymiarach jako pary (trafienie, wpis).
+
+        Czeka na zapis dziennika, dlatego wywoływane jest z wątku w tle.
+        """
+
+        from .similar import SimilarBoxIndex, find_similar
+
+        journal = self.quote_journal
+        journal.flush()
+        with self._similar_lock:
+            if self.similar_index is None:
+                self.similar_index = SimilarBoxIndex.from_journal(journal)
+            return find_similar(
+                journal, dl, sz, wys, wave=wave, k=k, index=self.similar_index
+            )
+
+    def open_entry(self, entry: JournalEntry, fallback: CalculatorTab) -> None:
+        """Wczytuje wycenę z dziennika do zakładki jej fali (lub ``fallback``)."""
+
+        wave_name = entry.inputs.get("fala")
+        tab = fallback
+        for placeholder, name in self.tab_placeholders.items():
+            if name == wave_name:
+                self.notebook.select(placeholder)
+                tab = self._ensure_calculator_tab(placeholder) or fallback
+                break
+        tab.load_entry(entry)
+
+    def _ensure_calculator_tab(self, placeholder: str) -> CalculatorTab | None:
+        """Buduje zakładkę kalkulatora w ramce zastępczej przy pierwszym wyborze."""
+
+        tab = self.calculator_tabs.get(placeholder)
+        if tab is not None:
+            return tab
+        wave_name = self.tab_placeholders.get(placeholder)
+        if wave_name is None:
+            return None
+        tab = CalculatorTab(self.nametowidget(placeholder), self, wave_name)
+        tab.grid(row=0, column=0, sticky="nsew")
+        self.calculator_tabs[placeholder] = tab
+        return tab
+
     def _get_current_calculator_tab(self) -> CalculatorTab | None:
         current = self.notebook.select()
         return self.calculator_tabs.get(current)
@@ -834,8 +1765,12 @@ class FalaBApp(ttk.Frame):
             tab.policz()
 
 
-def main() -> None:
+def main(startup_report: str | None = None) -> None:
+    """Uruchamia aplikację; ``startup_report`` to plik raportu czasu startu."""
+
+    startup_timer.mark("import")
     root = tk.Tk()
+    startup_timer.mark("tk_init")
     try:
         from ctypes import windll
 
@@ -846,6 +1781,18 @@ def main() -> None:
     root.rowconfigure(0, weight=1)
     root.columnconfigure(0, weight=1)
     FalaBApp(root)
+    startup_timer.mark("widgets")
+
+    def on_first_paint() -> None:
+        startup_timer.mark("first_paint")
+        startup_timer.write_report(startup_report)
+
+    def on_map(event: tk.Event) -> None:
+        if event.widget is root:
+            root.unbind("<Map>", bind_id)
+            root.after_idle(on_first_paint)
+
+    bind_id = root.bind("<Map>", on_map, "+")
     root.mainloop()
 
 
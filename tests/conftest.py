@@ -0,0 +1,8 @@
+"""Wspólna konfiguracja testów: pakiet ``kalkulator`` importowany z katalogu repozytorium."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,111 @@
+"""Zgodność obliczeń wsadowych (NumPy) z :func:`oblicz_fale` wiersz po wierszu."""
+
+from __future__ import annotations
+
+import pytest
+
+from kalkulator.calculations import RESULT_COLUMNS, WAVE_NAMES, flatten_results, oblicz_fale
+
+np = pytest.importorskip("numpy")
+
+from kalkulator.batch import batch_row, oblicz_fala_b_batch, oblicz_fale_batch  # noqa: E402
+from kalkulator.parallel import sample_columns  # noqa: E402
+
+ROWS = 2_000
+
+
+def _scalar_columns(columns: dict, rows: range) -> dict[str, list]:
+    result: dict[str, list] = {name: [] for name in RESULT_COLUMNS}
+    for index in rows:
+        wyniki = oblicz_fale(
+            WAVE_NAMES[int(columns["fala"][index])],
+            float(columns["dl"][index]),
+            float(columns["sz"][index]),
+            float(columns["wys"][index]),
+            float(columns["gramatura"][index]),
+            float(columns["cena_m2"][index]),
+            float(columns["dodatkowe_koszty"][index]),
+            float(columns["stawka_transport"][index]),
+            float(columns["dystans"][index]),
+            bool(columns["powrot"][index]),
+        )
+        for name, value in flatten_results(wyniki):
+            result[name].append(value)
+    return result
+
+
+def _batch(columns: dict) -> dict:
+    return oblicz_fale_batch(
+        columns["fala"],
+        columns["dl"],
+        columns["sz"],
+        columns["wys"],
+        columns["gramatura"],
+        columns["cena_m2"],
+        columns["dodatkowe_koszty"],
+        columns["stawka_transport"],
+        columns["dystans"],
+        columns["powrot"],
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_mixed_waves_match_scalar(seed: int) -> None:
+    columns = sample_columns(ROWS, seed=seed)
+    batch = dict(flatten_results(_batch(columns)))
+    scalar = _scalar_columns(columns, range(ROWS))
+    for name in RESULT_COLUMNS:
+        assert batch[name].tolist() == scalar[name], name
+
+
+@pytest.mark.parametrize("fala", WAVE_NAMES)
+def test_single_wave_name(fala: str) -> None:
+    columns = sample_columns(200, seed=7)
+    columns["fala"] = np.full(200, WAVE_NAMES.index(fala))
+    by_code = dict(flatten_results(_batch(columns)))
+    by_name = dict(flatten_results(_batch({**columns, "fala": fala})))
+    for name in RESULT_COLUMNS:
+        assert by_name[name].tolist() == by_code[name].tolist(), name
+
+
+def test_batch_row_matches_oblicz_fala_b() -> None:
+    wyniki = oblicz_fala_b_batch(
+        [400.0, 1000.5], [300.0, 250.0], [150.0, 80.0], 450.0, 2.4, 100.0, 3.0, [200.0, -5.0]
+    )
+    expected = oblicz_fale("FALA B", 1000.5, 250.0, 80.0, 450.0, 2.4, 100.0, 3.0, -5.0)
+    assert batch_row(wyniki, 1) == expected
+
+
+def test_unknown_wave_raises() -> None:
+    with pytest.raises(ValueError):
+        oblicz_fale_batch(["FALA X"], 400.0, 300.0, 150.0, 450.0, 2.4, 0.0, 0.0, 0.0)
+
+
+def test_scalar_arguments_broadcast() -> None:
+    dl = [400.0, 1000.5, 250.0]
+    batch = oblicz_fale_batch("FALA C+EB", dl, 300.0, 150.0, 450.0, 2.4, 10.0, 3.0, 120.0)
+    wyniki = dict(flatten_results(batch))
+    for index, value in enumerate(dl):
+        expected = oblicz_fale("FALA C+EB", value, 300.0, 150.0, 450.0, 2.4, 10.0, 3.0, 120.0)
+        for name, scalar in flatten_results(expected):
+            assert wyniki[name][index] == scalar, name
+
+
+def test_wave_codes_accept_names_and_codes() -> None:
+    from kalkulator.batch import wave_codes
+
+    names = [WAVE_NAMES[2], WAVE_NAMES[0], WAVE_NAMES[2]]
+    assert wave_codes(names).tolist() == [2, 0, 2]
+    assert wave_codes(np.array([1, 0])).tolist() == [1, 0]
+    with pytest.raises(ValueError):
+        wave_codes([len(WAVE_NAMES)])
+
+
+def test_empty_columns() -> None:
+    empty = np.zeros(0)
+    wyniki = dict(
+        flatten_results(
+            oblicz_fale_batch(empty.astype(int), empty, empty, empty, empty, empty, 0, 0, 0)
+        )
+    )
+    assert all(wyniki[name].size == 0 for name in RESULT_COLUMNS)
@@ -0,0 +1,52 @@
+"""Przetwarzanie wsadowe :func:`kalkulator.cli.run_batch`."""
+
+from __future__ import annotations
+
+import io
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from kalkulator.calculations import RESULT_COLUMNS  # noqa: E402
+from kalkulator.cli import run_batch  # noqa: E402
+
+ROW = "fala;dl;sz;wys;gramatura;cena_m2;ilosc\nFALA B;300;200;150;400;2,5;100\n"
+
+
+def _run(text: str, **options) -> list[str]:
+    target = io.StringIO()
+    run_batch(io.StringIO(text), target, **options)
+    return target.getvalue().splitlines()
+
+
+@pytest.mark.parametrize("text", ["", "fala;dl\n", "sep=,\n"])
+def test_empty_input_writes_requested_header(text: str) -> None:
+    columns = [RESULT_COLUMNS[1], RESULT_COLUMNS[0]]
+    assert _run(text, columns=columns) == [";".join(columns)]
+    if text.startswith("fala"):
+        assert _run(text, columns=["dl", *columns]) == [";".join(["dl", *columns])]
+
+
+def test_empty_input_writes_header_of_full_rows() -> None:
+    fields = ROW.splitlines()[0]
+    (header, _) = _run(ROW)
+    assert _run(fields + "\n") == [header]
+    names = fields.split(";")
+    assert header.split(";") == names + [name for name in RESULT_COLUMNS if name not in names]
+    assert _run("") == []
+    assert _run("fala;dl\n", output_format="jsonl") == []
+
+
+def test_pallets_imported_only_when_requested() -> None:
+    code = (
+        "import io, sys; from kalkulator.cli import run_batch; "
+        f"run_batch(io.StringIO({ROW!r}), io.StringIO()); "
+        "print('kalkulator.pallets' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
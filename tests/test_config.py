@@ -0,0 +1,42 @@
+"""Wczytywanie współdzielonego pliku konfiguracji przez :class:`ConfigManager`."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from kalkulator.config import DEFAULT_MARGIN_RULES, ConfigManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch) -> ConfigManager:
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    manager = ConfigManager(save_delay=0)
+    manager.set_password("tajne")
+    manager.update_margin_rules([{"max_quantity": 50, "margin_percent": 10.0}])
+    return manager
+
+
+def _rewrite(manager: ConfigManager, payload: dict) -> None:
+    manager.config_file.write_text(json.dumps(payload), encoding="utf-8")
+    # Wymuszenie innej sygnatury pliku niezależnie od rozdzielczości mtime.
+    stat = manager.config_file.stat()
+    os.utime(manager.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.mark.parametrize("payload", [{}, {"password": None}, {"password": 123}])
+def test_reload_keeps_password_missing_from_file(manager: ConfigManager, payload: dict) -> None:
+    _rewrite(manager, payload)
+    assert manager.reload_if_changed()
+    assert manager.has_password()
+    assert manager.verify_password("tajne")
+    # Pozostałe klucze wracają do wartości domyślnych.
+    assert manager.get_margin_rules() == DEFAULT_MARGIN_RULES
+
+
+def test_reload_applies_password_from_file(manager: ConfigManager) -> None:
+    _rewrite(manager, {"password": "nowe"})
+    manager.reload_if_changed()
+    assert manager.verify_password("nowe")
@@ -0,0 +1,80 @@
+"""Odczyt dziennika wycen zapisanego przy innym układzie kolumn wyniku."""
+
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+from array import array
+from datetime import datetime
+
+from kalkulator.calculations import RESULT_COLUMNS, oblicz_fale
+from kalkulator.journal import QuoteJournal, _row_for
+from kalkulator.results import QuoteResult
+
+
+def _last_results(nazwa: str) -> dict:
+    return {
+        "client": {"nazwa": nazwa, "nip": "123-456-32-18"},
+        "inputs": {"fala": "FALA B", "dl": 300.0, "sz": 200.0, "wys": 150.0},
+        "wyniki": oblicz_fale("FALA B", 300, 200, 150, 400, 2.5, 0, 0, 0, False),
+        "margin_rules": [],
+        "quantities": [100],
+    }
+
+
+def _insert(path, row: tuple) -> None:
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "INSERT INTO quotes (created, wave, nip, company, company_key, dl, sz, wys,"
+            " client, inputs, margin_rules, quantities, result)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            row,
+        )
+
+
+def test_reads_rows_written_with_other_columns(tmp_path) -> None:
+    path = tmp_path / "quotes.sqlite3"
+    journal = QuoteJournal(path)
+    journal.record(_last_results("Bieżąca"))
+    journal.flush()
+
+    created = datetime(2024, 1, 1)
+    current = QuoteResult(_last_results("x")["wyniki"]).columns()
+    # Starsza/nowsza wersja: jedna kolumna mniej i jedna nieznana.
+    other = dict(current)
+    missing = "koszty_dodatkowe"
+    del other[missing]
+    other["nowa.kolumna"] = 1.0
+    row = list(_row_for(_last_results("Inny układ"), created))
+    row[-1] = json.dumps(other)
+    _insert(path, tuple(row))
+    # Dawny format binarny o innej długości i wiersz uszkodzony.
+    row[3:5] = ["Binarny", "binarny"]
+    row[-1] = array("d", [1.0, 2.0]).tobytes()
+    _insert(path, tuple(row))
+    row[3:5] = ["Uszkodzony", "uszkodzony"]
+    row[-1] = "{nie json"
+    _insert(path, tuple(row))
+
+    entries = journal.search(nip="1234563218")
+    assert journal.count() == 4
+    names = sorted(entry.client["nazwa"] for entry in entries)
+    assert names == ["Bieżąca", "Inny układ"]
+    other_entry = next(entry for entry in entries if entry.client["nazwa"] == "Inny układ")
+    assert other_entry.wyniki.value(RESULT_COLUMNS[0]) == current[RESULT_COLUMNS[0]]
+    assert math.isnan(other_entry.wyniki.value(missing))
+    assert [entry.id for entry in journal.get([entry.id for entry in entries])] == [
+        entry.id for entry in entries
+    ]
+    journal.close()
+
+
+def test_round_trip_by_name(tmp_path) -> None:
+    journal = QuoteJournal(tmp_path / "quotes.sqlite3")
+    results = _last_results("Firma")
+    journal.record(results)
+    journal.flush()
+    (entry,) = journal.search(company="firma")
+    assert entry.wyniki.columns() == QuoteResult(results["wyniki"]).columns()
+    journal.close()
@@ -0,0 +1,96 @@
+"""Zgodność wektorowego planu palet z :func:`plan_pallets` wiersz po wierszu."""
+
+from __future__ import annotations
+
+import pytest
+
+from kalkulator.calculations import WAVE_NAMES
+from kalkulator.pallets import (
+    PALLET_COLUMNS,
+    PalletSettings,
+    apply_overrides,
+    plan_pallets,
+    plan_pallets_batch,
+)
+
+np = pytest.importorskip("numpy")
+
+ROWS = 1_000
+
+SETTINGS = [
+    PalletSettings(),
+    PalletSettings(pallet="przemysłowa", max_height_mm=1200.0, max_weight_kg=300.0),
+    # Iloraz 1,0 / 0,1 zaokrągla się w górę do 10 – ``//`` daje 9.
+    PalletSettings(max_height_mm=145.0, thickness_mm=0.1, deck_height_mm=144.0, plies=1),
+    apply_overrides(
+        PalletSettings(),
+        {"deck_height_mm": 150.0, "per_truck": {"EUR": 20}, "thickness_mm": {"FALA B": 3.3}},
+    ),
+]
+
+
+def _columns(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "fala": rng.integers(0, len(WAVE_NAMES), ROWS),
+        "dlugosc": rng.uniform(50.0, 1400.0, ROWS).round(1),
+        "szerokosc": rng.uniform(50.0, 1100.0, ROWS).round(1),
+        "waga_kg": rng.uniform(0.01, 2.0, ROWS),
+        "quantity": rng.integers(0, 50_000, ROWS).astype(float),
+        "koszt_transportu": rng.uniform(0.0, 900.0, ROWS),
+    }
+
+
+@pytest.mark.parametrize("settings", SETTINGS, ids=range(len(SETTINGS)))
+def test_batch_matches_scalar(settings: PalletSettings) -> None:
+    columns = _columns(seed=7)
+    batch = plan_pallets_batch(settings=settings, **columns)
+    assert set(batch) == set(PALLET_COLUMNS)
+    for index in range(ROWS):
+        wyniki = {
+            "paletyzacja": {
+                "dlugosc": float(columns["dlugosc"][index]),
+                "szerokosc": float(columns["szerokosc"][index]),
+            },
+            "waga_kg_na_szt": float(columns["waga_kg"][index]),
+        }
+        plan = plan_pallets(
+            wyniki,
+            int(columns["quantity"][index]),
+            WAVE_NAMES[int(columns["fala"][index])],
+            settings,
+        )
+        assert batch["palety.na_warstwe"][index] == plan.per_layer
+        assert batch["palety.warstwy"][index] == plan.layers
+        assert batch["palety.na_palete"][index] == plan.per_pallet
+        assert batch["palety.liczba"][index] == plan.pallets
+        assert batch["palety.kursy"][index] == plan.trips
+
+
+def test_known_stack() -> None:
+    # Formatka 600 × 400 mm na palecie EUR 1200 × 800: 4 szt. w warstwie.
+    # Fala B 3 mm, złożony karton = 2 warstwy tektury = 6 mm na sztukę:
+    # (1800 - 144) // 6 = 276 sztuk w stosie, 4 × 276 = 1104 szt. na paletę.
+    wyniki = {"paletyzacja": {"dlugosc": 600.0, "szerokosc": 400.0}, "waga_kg_na_szt": 0.1}
+    plan = plan_pallets(wyniki, 100_000, "FALA B")
+    assert (plan.per_layer, plan.layers, plan.per_pallet) == (4, 276, 1104)
+    # 100 000 / 1104 = 90,6 -> 91 palet, 91 / 33 -> 3 kursy.
+    assert (plan.pallets, plan.trips) == (91, 3)
+    assert plan.limited_by == "wysokość"
+
+    batch = plan_pallets_batch("FALA B", [600.0], [400.0], [0.1], [100_000], [100.0])
+    assert batch["palety.warstwy"].tolist() == [276.0]
+    assert batch["palety.liczba"].tolist() == [91.0]
+    assert batch["palety.koszt_transportu"].tolist() == [300.0]
+
+    single_ply = plan_pallets(wyniki, 100_000, "FALA B", PalletSettings(plies=1))
+    assert single_ply.layers == 552
+
+
+def test_overrides_keep_explicit_settings() -> None:
+    overrides = {"deck_height_mm": 150.0, "per_truck": {"EUR": 20}, "thickness_mm": {"FALA B": 3.3}}
+    settings = apply_overrides(PalletSettings(deck_height_mm=120.0, per_truck=30), overrides)
+    assert settings.deck_height_mm == 120.0
+    assert settings.per_truck == 30
+    assert settings.thicknesses == {"FALA B": 3.3}
+    assert apply_overrides(PalletSettings(pallet="przemysłowa"), overrides).per_truck is None
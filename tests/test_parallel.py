@@ -0,0 +1,82 @@
+"""Zgodność przeliczania na wielu procesach z obliczeniem w jednym procesie."""
+
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from kalkulator.calculations import RESULT_COLUMNS  # noqa: E402
+from kalkulator.parallel import (  # noqa: E402
+    INPUT_COLUMNS,
+    compute_columns,
+    oblicz_fale_parallel,
+    pack_columns,
+    sample_columns,
+    unpack_columns,
+)
+
+ROWS = 5_000
+
+
+@pytest.fixture(scope="module")
+def columns() -> dict:
+    return sample_columns(ROWS, seed=11)
+
+
+@pytest.fixture(scope="module")
+def expected(columns: dict) -> dict:
+    return compute_columns(columns)
+
+
+@pytest.mark.parametrize(("workers", "chunk_size"), [(1, 777), (2, 1_000), (2, ROWS * 2)])
+def test_parallel_matches_single_process(
+    columns: dict, expected: dict, workers: int, chunk_size: int
+) -> None:
+    result = oblicz_fale_parallel(columns, workers=workers, chunk_size=chunk_size)
+    assert list(result) == list(RESULT_COLUMNS)
+    for name in RESULT_COLUMNS:
+        assert result[name].tolist() == expected[name].tolist(), name
+
+
+def test_pack_roundtrip(columns: dict) -> None:
+    unpacked = unpack_columns(pack_columns(columns, INPUT_COLUMNS), INPUT_COLUMNS)
+    for name in INPUT_COLUMNS:
+        dtype = bool if name == "powrot" else float
+        assert unpacked[name].tolist() == np.asarray(columns[name], dtype=dtype).tolist(), name
+
+
+def test_rejects_non_positive_chunk_size(columns: dict) -> None:
+    with pytest.raises(ValueError):
+        oblicz_fale_parallel(columns, chunk_size=0)
+
+
+def test_iter_parallel_keeps_order_and_bounds_read_ahead(columns: dict) -> None:
+    from kalkulator.parallel import iter_parallel
+
+    size = 250
+    consumed = []
+
+    def chunks():
+        for start in range(0, ROWS, size):
+            consumed.append(start)
+            yield {name: values[start : start + size] for name, values in columns.items()}
+
+    workers = 2
+    results = []
+    for part in iter_parallel(chunks(), workers=workers):
+        # Najwyżej 2 * workers porcji w locie ponad już odebrane.
+        assert len(consumed) - len(results) <= 2 * workers
+        results.append(part)
+    single = compute_columns(columns)
+    for name in RESULT_COLUMNS:
+        merged = np.concatenate([part[name] for part in results])
+        assert merged.tolist() == single[name].tolist(), name
+
+
+def test_missing_wave_defaults_to_fala_b(columns: dict) -> None:
+    without_wave = {name: values for name, values in columns.items() if name != "fala"}
+    result = oblicz_fale_parallel(without_wave, workers=1, chunk_size=1_000)
+    expected = compute_columns({**without_wave, "fala": np.zeros(ROWS, dtype=int)})
+    for name in RESULT_COLUMNS:
+        assert result[name].tolist() == expected[name].tolist(), name
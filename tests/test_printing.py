@@ -0,0 +1,53 @@
+"""Wysyłanie wydruku do spoolera i awaryjnie przez plik tymczasowy."""
+
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from kalkulator import printing
+
+CONTENT = b"%PDF-1.4\n" + bytes(range(256)) * 64
+
+
+class Writer:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, target) -> int:
+        self.calls += 1
+        target.write(CONTENT)
+        return len(CONTENT)
+
+
+def _copy_stdin(path) -> list[str]:
+    code = "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[1], 'wb'))"
+    return [sys.executable, "-c", code, str(path)]
+
+
+def test_pipe_renders_once(tmp_path) -> None:
+    write = Writer()
+    received = tmp_path / "spooler.bin"
+    result = printing._spool(
+        write, ".pdf", command=_copy_stdin(received), sender=pytest.fail
+    )
+    assert (result, write.calls) == (len(CONTENT), 1)
+    assert received.read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize("limit", [printing.SPOOL_MEMORY_LIMIT, 1024])
+def test_fallback_reuses_rendered_document(monkeypatch, limit: int) -> None:
+    monkeypatch.setattr(printing, "SPOOL_MEMORY_LIMIT", limit)
+    write = Writer()
+    sent: list[bytes] = []
+
+    def sender(path, **options) -> None:
+        sent.append(path.read_bytes())
+
+    rejecting = [sys.executable, "-c", "import sys; sys.stdin.buffer.read(); sys.exit(1)"]
+    result = printing._spool(
+        write, ".pdf", command=rejecting, sender=sender, cleanup_delay=0.0
+    )
+    assert (result, write.calls) == (len(CONTENT), 1)
+    assert sent == [CONTENT]
@@ -0,0 +1,180 @@
+"""Równoważność :func:`excel_fixed` i :func:`excel_fixed_array` z zaokrąglaniem ``Decimal``.
+
+Liczbę losowych wartości na każdą liczbę cyfr ustala zmienna
+``KALKULATOR_ROUNDING_SAMPLES`` (domyślnie 20 000), a ziarno –
+``KALKULATOR_ROUNDING_SEED``. Pełny przebieg na milionach wartości::
+
+    KALKULATOR_ROUNDING_SAMPLES=2000000 python -m pytest -q tests/test_rounding.py
+
+Wartości są sprawdzane porcjami, więc pamięć nie rośnie z liczbą próbek.
+Jeśli zainstalowany jest ``hypothesis``, dochodzą testy właściwości
+(liczba przykładów: ``KALKULATOR_ROUNDING_EXAMPLES``).
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import random
+import sys
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Callable, Iterator
+
+import pytest
+
+from kalkulator.calculations import _excel_fixed_exact, excel_fixed
+
+try:
+    from hypothesis import given, settings
+    from hypothesis import strategies as st
+except ImportError:  # pragma: no cover - hypothesis jest opcjonalny
+    given = None
+
+DIGITS = range(7)
+RANDOM_SAMPLES = int(os.environ.get("KALKULATOR_ROUNDING_SAMPLES", "20000"))
+SEED = int(os.environ.get("KALKULATOR_ROUNDING_SEED", "0"))
+HYPOTHESIS_EXAMPLES = int(os.environ.get("KALKULATOR_ROUNDING_EXAMPLES", "2000"))
+CHUNK = 100_000
+
+
+def excel_fixed_decimal(value: float, digits: int) -> float | None:
+    """Referencyjna (pierwotna) implementacja FIXED oparta na ``Decimal``.
+
+    Zwraca ``None``, gdy wynik nie mieści się w 28 cyfrach ``Decimal``.
+    """
+    quant = Decimal("1").scaleb(-digits)
+    try:
+        return float(Decimal(str(float(value))).quantize(quant, rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        return None
+
+
+def _random_values(rng: random.Random, digits: int) -> Iterator[float]:
+    """Nieskończony strumień losowych wartości z kilku rozkładów."""
+    scale = 10**digits
+    generators: list[Callable[[], float]] = [
+        # Wartości o skończonym rozwinięciu dziesiętnym – częste remisy.
+        lambda: rng.randint(-10**9, 10**9) / (scale * 10),
+        lambda: rng.randint(-10**6, 10**6) / (scale * 100),
+        # Iloczyny wymiarów w mm przeliczane na m² jak w oblicz_fala_b.
+        lambda: (rng.randint(0, 8000) / 2.0) * (rng.randint(0, 8000) / 2.0) / 1_000_000.0,
+        lambda: rng.uniform(-1e6, 1e6),
+        lambda: rng.uniform(-1.0, 1.0),
+        lambda: math.ldexp(rng.random(), rng.randint(-1074, 60)) * rng.choice((1, -1)),
+        lambda: rng.uniform(-1e15, 1e15),
+    ]
+    while True:
+        yield rng.choice(generators)()
+
+
+def _adversarial_values(digits: int) -> Iterator[float]:
+    """Remisy, ich sąsiedzi w ULP oraz wartości graniczne."""
+    scale = 10**digits
+    for numerator in range(0, 20_000):
+        tie = (2 * numerator + 1) / (2 * scale)
+        for value in (tie, math.nextafter(tie, 0.0), math.nextafter(tie, math.inf)):
+            yield value
+            yield -value
+    for exponent in range(-20, 16):
+        base = 10.0**exponent
+        for value in (base, base * 5, base * 0.5, base * 1.5, base * 4.99999999):
+            yield value
+            yield math.nextafter(value, 0.0)
+            yield math.nextafter(value, math.inf)
+            yield -value
+    limit = 2.0**52 / scale
+    for offset in range(-64, 64):
+        yield limit + offset * 0.25
+    yield from (0.0, -0.0, 5e-324, -5e-324, sys.float_info.max, -sys.float_info.max)
+
+
+def _chunks(digits: int) -> Iterator[list[float]]:
+    """Wartości graniczne, a po nich ``RANDOM_SAMPLES`` losowych – porcjami."""
+    yield list(_adversarial_values(digits))
+    stream = _random_values(random.Random(SEED * 100 + digits), digits)
+    remaining = RANDOM_SAMPLES
+    while remaining > 0:
+        size = min(CHUNK, remaining)
+        yield list(itertools.islice(stream, size))
+        remaining -= size
+
+
+def _mismatches(values: list[float], digits: int, rounded: list[float]) -> list[float]:
+    return [
+        value
+        for value, result in zip(values, rounded)
+        if (reference := excel_fixed_decimal(value, digits)) is not None
+        and repr(result) != repr(reference)
+    ]
+
+
+@pytest.mark.parametrize("digits", DIGITS)
+def test_excel_fixed_matches_decimal(digits: int) -> None:
+    for values in _chunks(digits):
+        rounded = [excel_fixed(value, digits) for value in values]
+        assert _mismatches(values, digits, rounded)[:10] == []
+
+
+@pytest.mark.parametrize("digits", DIGITS)
+def test_excel_fixed_array_matches_decimal(digits: int) -> None:
+    np = pytest.importorskip("numpy")
+    from kalkulator.batch import excel_fixed_array
+
+    for values in _chunks(digits):
+        rounded = excel_fixed_array(np.array(values), digits).tolist()
+        assert _mismatches(values, digits, rounded)[:10] == []
+
+
+if given is not None:
+    # Dowolne skończone liczby oraz remisy k / (2·10^d) i ich sąsiedzi w ULP.
+    _floats = st.floats(allow_nan=False, allow_infinity=False)
+
+    def _tie(numerator: int, digits: int, step: int) -> float:
+        tie = (2 * numerator + 1) / (2 * 10**digits)
+        return math.nextafter(tie, step * math.inf) if step else tie
+
+    _ties = st.builds(
+        _tie, st.integers(-(10**12), 10**12), st.sampled_from(DIGITS), st.integers(-1, 1)
+    )
+
+    @settings(max_examples=HYPOTHESIS_EXAMPLES, deadline=None)
+    @given(st.one_of(_floats, _ties), st.sampled_from(DIGITS))
+    def test_excel_fixed_property(value: float, digits: int) -> None:
+        reference = excel_fixed_decimal(value, digits)
+        if reference is not None:
+            assert repr(excel_fixed(value, digits)) == repr(reference)
+
+    @settings(max_examples=HYPOTHESIS_EXAMPLES // 10, deadline=None)
+    @given(st.lists(st.one_of(_floats, _ties), max_size=200), st.sampled_from(DIGITS))
+    def test_excel_fixed_array_property(values: list[float], digits: int) -> None:
+        np = pytest.importorskip("numpy")
+        from kalkulator.batch import excel_fixed_array
+
+        rounded = excel_fixed_array(np.array(values, dtype=np.float64), digits).tolist()
+        assert _mismatches(values, digits, rounded) == []
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+@pytest.mark.parametrize(
+    ("value", "digits", "expected"),
+    [
+        (0.125, 2, 0.13),
+        (-0.125, 2, -0.13),
+        (2.5, 0, 3.0),
+        (0.5, 0, 1.0),
+        (1.0625, 3, 1.063),
+        (0.0005, 3, 0.001),
+    ],
+)
+def test_numpy_scalar_ties(dtype: str, value: float, digits: int, expected: float) -> None:
+    np = pytest.importorskip("numpy")
+
+    scalar = np.dtype(dtype).type(value)
+    assert excel_fixed(scalar, digits) == expected == excel_fixed_decimal(scalar, digits)
+    assert _excel_fixed_exact(scalar, digits) == expected
+
+
+def test_rejects_negative_digits() -> None:
+    with pytest.raises(ValueError):
+        excel_fixed(1.0, -1)
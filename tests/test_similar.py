@@ -0,0 +1,51 @@
+"""Zgodność :class:`SimilarBoxIndex` z przeszukaniem wszystkich wycen."""
+
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from kalkulator.calculations import WAVE_NAMES  # noqa: E402
+from kalkulator.similar import SimilarBoxIndex  # noqa: E402
+
+ROWS = 20_000
+
+
+@pytest.fixture(scope="module")
+def data() -> tuple:
+    rng = np.random.default_rng(3)
+    dims = np.column_stack(
+        [rng.integers(100, 800, ROWS), rng.integers(100, 600, ROWS), rng.integers(50, 400, ROWS)]
+    ).astype(np.float64)
+    return np.arange(1, ROWS + 1), rng.integers(0, len(WAVE_NAMES), ROWS), dims
+
+
+def _brute_force(data: tuple, point: np.ndarray, wave: str | None, k: int) -> list[int]:
+    ids, waves, dims = data
+    mask = np.ones(len(ids), dtype=bool) if wave is None else waves == WAVE_NAMES.index(wave)
+    distances = np.sqrt(((dims[mask] - point) ** 2).sum(axis=1))
+    order = np.lexsort((ids[mask], distances))[:k]
+    return ids[mask][order].tolist()
+
+
+@pytest.mark.parametrize("wave", [None, "FALA B", WAVE_NAMES[-1]])
+def test_query_matches_brute_force(data: tuple, wave: str | None) -> None:
+    index = SimilarBoxIndex(*data)
+    # Bufor nowych wycen też bierze udział w wyszukiwaniu.
+    index.add(ROWS + 1, "FALA B", 401.0, 299.0, 151.0)
+    extended = tuple(
+        np.concatenate([column, extra])
+        for column, extra in zip(data, ([ROWS + 1], [0], [[401.0, 299.0, 151.0]]))
+    )
+    rng = np.random.default_rng(5)
+    points = np.column_stack(
+        [rng.uniform(0, 1000, 200), rng.uniform(0, 800, 200), rng.uniform(0, 500, 200)]
+    )
+    for point in [np.array([402.0, 298.0, 150.0]), *points]:
+        found = [match.id for match in index.query(*point, wave=wave, k=10)]
+        assert found == _brute_force(extended, point, wave, 10)
+
+
+def test_empty_index() -> None:
+    assert SimilarBoxIndex().query(100.0, 100.0, 100.0) == []